@@ -0,0 +1,136 @@
+import os
+import argparse
+
+import json
+
+from benchmarks.harness import ENGINES, run_benchmark, write_results, environment
+from benchmarks.synthetic import FAMILIES
+from utils.reorder import ORDERINGS
+from efficient_closeness.cost_model import FAMILIES as FAMILIES_COST
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Banc d'essai unifié : jeux de données × moteurs × k × répétitions."
+    )
+    parser.add_argument("--datasets", nargs="+", default=["graphml:Dijon", "graphml:Reims"],
+                        help="ex: graphml:Dijon osm:Reims:directed wiki-vote csr:data/csr/Paris_France")
+    parser.add_argument("--engines", nargs="+", default=["classic", "efficient"], choices=sorted(ENGINES))
+    parser.add_argument("--k", nargs="+", type=int, default=[5])
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--reference", default="classic",
+                        help="moteur exact servant de référence pour l'overlap ('' pour désactiver)")
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "resultat_comparaison", "benchmark"),
+                        help="préfixe des fichiers .json / .csv produits")
+    parser.add_argument("--reorder", choices=ORDERINGS,
+                        help="renumérote les sommets avant les moteurs (utils/reorder.py) : rcm / bfs "
+                             "(Cuthill–McKee), hilbert (coordonnées), degree ; résultats en identifiants d'origine")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="exécution supplémentaire sous tracemalloc : pic mémoire par phase et "
+                             "attribution des allocations (<output>_memory.json / .txt)")
+
+    regression = parser.add_argument_group("références et contrôle de régression (results/baselines/)")
+    regression.add_argument("--save-baseline", metavar="NOM",
+                            help="enregistre les mesures comme référence results/baselines/NOM.json")
+    regression.add_argument("--check-baseline", metavar="NOM",
+                            help="compare les mesures à la référence NOM ; code de sortie 1 en cas de régression")
+    regression.add_argument("--from-results", metavar="JSON",
+                            help="utilise un fichier de résultats existant (<output>.json) au lieu de relancer les mesures")
+    regression.add_argument("--tolerance", type=float, default=0.10,
+                            help="ralentissement toléré sur la médiane (0.10 = +10 %%)")
+    regression.add_argument("--alpha", type=float, default=0.05, help="seuil du test de Mann–Whitney")
+    regression.add_argument("--mem-tolerance", type=float, default=0.10,
+                            help="hausse tolérée du pic mémoire (mesuré avec --profile-memory)")
+
+    planner = parser.add_argument_group("modèle de coût du planificateur (efficient_closeness/cost_model.py)")
+    planner.add_argument("--calibrate", metavar="FAMILLE", choices=FAMILIES_COST,
+                         help="mesure PFS / Δ-PFS sur un échantillon de sommets des --datasets, ajuste le modèle "
+                              "de coût de schedule() et l'enregistre dans results/cost_models/FAMILLE.json")
+    planner.add_argument("--samples", type=int, default=200, help="couples (sommet, parent) mesurés par graphe")
+    planner.add_argument("--cost-model", default=None, choices=("default",) + FAMILIES_COST,
+                         help="modèle utilisé par le moteur efficient : 'default' (constantes d'origine, "
+                              "par défaut) ou une famille calibrée (road, social)")
+
+    imports = parser.add_argument_group("temps de démarrage (imports à froid)")
+    imports.add_argument("--imports", action="store_true",
+                         help="mesure le temps d'import des moteurs et des scripts (benchmarks/import_time.py) ; "
+                              "code de sortie 1 si un budget est dépassé ou si osmnx / matplotlib / pandas sont chargés")
+    imports.add_argument("--import-scale", type=float, default=1.0,
+                         help="facteur appliqué aux budgets (machine plus lente que la référence)")
+
+    scaling = parser.add_argument_group("passage à l'échelle (graphes synthétiques)")
+    scaling.add_argument("--scaling", action="store_true",
+                         help="mesure temps et pic mémoire en fonction de |V| au lieu de la matrice --datasets")
+    scaling.add_argument("--families", nargs="+", default=sorted(FAMILIES), choices=sorted(FAMILIES))
+    scaling.add_argument("--sizes", nargs="+", type=lambda s: int(float(s)),
+                         default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    scaling.add_argument("--directions", nargs="+", default=["undirected", "directed"],
+                         choices=["undirected", "directed"])
+    scaling.add_argument("--seed", type=int, default=0)
+    scaling.add_argument("--timeout", type=float, default=600,
+                         help="délai (s) par mesure ; un moteur qui le dépasse n'est plus lancé sur les tailles supérieures")
+    scaling.add_argument("--plot", action="store_true", help="trace les courbes (matplotlib)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.imports:
+        from benchmarks.import_time import check_import_budgets
+        ok = check_import_budgets(repetitions=args.repetitions, scale=args.import_scale,
+                                  output=args.output + "_imports.json")
+        raise SystemExit(0 if ok else 1)
+
+    if args.calibrate:
+        from benchmarks.datasets import load_dataset
+        from efficient_closeness.cost_model import calibrate
+        calibrate([load_dataset(spec) for spec in args.datasets], family=args.calibrate, sample=args.samples)
+        raise SystemExit(0)
+
+    if args.cost_model:
+        ENGINES["efficient"].cost_model = args.cost_model  # hérité par efficient_parallel
+
+    if args.scaling:
+        from benchmarks.scaling import run_scaling, write_scaling, plot_scaling
+        records = run_scaling(args.families, args.sizes, args.engines, k=args.k[0],
+                              directions=args.directions, seed=args.seed, timeout=args.timeout)
+        print(f"\n📄 Courbes : {write_scaling(records, args.output)}")
+        if args.plot:
+            for path in plot_scaling(records, args.output):
+                print(f"📈 {path}")
+        raise SystemExit(0)
+
+    if args.from_results:
+        with open(args.from_results, encoding="utf-8") as f:
+            records = json.load(f)["records"]
+    else:
+        profiles = [] if args.profile_memory else None
+        records = run_benchmark(args.datasets, args.engines, args.k,
+                                repetitions=args.repetitions, warmup=args.warmup,
+                                reference=args.reference or None, memory_profiles=profiles,
+                                reorder=args.reorder)
+        json_path, csv_path = write_results(records, args.output)
+        print(f"\n📄 Résultats : {json_path}\n📄 Résumé   : {csv_path}")
+        if profiles:
+            from utils.memory_profile import write_memory_report
+            mem_json, mem_txt = write_memory_report(profiles, args.output)
+            print(f"🧠 Mémoire  : {mem_json}\n🧠 Rapport  : {mem_txt}")
+
+    if args.check_baseline:
+        from benchmarks.regression import load_baseline, compare, report
+        baseline = load_baseline(args.check_baseline)
+        env = baseline.get("environment") or {}
+        if env.get("platform") and env["platform"] != environment()["platform"]:
+            print(f"⚠️ Référence mesurée sur une autre machine ({env['platform']})")
+        print(f"\n🔎 Comparaison à la référence '{args.check_baseline}' :")
+        rows = compare(baseline, records, tolerance=args.tolerance, alpha=args.alpha,
+                       mem_tolerance=args.mem_tolerance)
+        if report(rows):
+            raise SystemExit(1)
+
+    if args.save_baseline:
+        from benchmarks.regression import save_baseline
+        print(f"📌 Référence : {save_baseline(records, args.save_baseline, environment())}")
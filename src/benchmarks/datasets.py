@@ -0,0 +1,130 @@
+import os
+import sys
+import random
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DATA_DIR = os.path.join(os.path.dirname(SRC_DIR), "data")
+TEMPORAL_DIR = os.path.join(SRC_DIR, "temporal_closeness")
+
+
+def import_temporal():
+    """
+    Les modules temporels s'importent entre eux « à plat » (ils sont lancés depuis leur dossier) :
+    on ajoute donc src/temporal_closeness au chemin avant de les importer.
+    """
+    if TEMPORAL_DIR not in sys.path:
+        sys.path.append(TEMPORAL_DIR)
+    from temporal_graph import TemporalGraph
+    from topk_temporal_closeness import topk_temporal_closeness
+    return TemporalGraph, topk_temporal_closeness
+
+
+def _city_file(city):
+    """'Dijon' ou 'Dijon, France' -> data/Dijon_France.graphml"""
+    name = city if "," in city else f"{city}, France"
+    return os.path.join(DATA_DIR, name.replace(", ", "_").replace(" ", "_") + ".graphml")
+
+
+def load_dataset(spec):
+    """
+    Charge un jeu de données à partir de sa description textuelle :
+
+    - wiki-vote                       : data/Wiki-Vote.txt (orienté, CSR)
+    - snap:<fichier>[:undirected]     : liste d'arêtes SNAP quelconque (CSR)
+    - csr:<dossier>                   : graphe CSR sauvegardé (np.memmap)
+    - graphml:<Ville>                 : data/<Ville>_France.graphml (non orienté, networkx)
+    - osm:<Ville>[:directed|:undirected] : reconstruction hors ligne depuis le cache Overpass,
+                                         téléchargement osmnx en dernier recours
+    - synthetic:<famille>:<n>[:directed][:seed=<s>] : graphe synthétique déterministe
+                                         (grid, geometric, ba, smallworld), mis en cache en CSR
+
+    Retourne le graphe (networkx ou CSRGraph).
+    """
+    kind, _, rest = spec.partition(":")
+
+    if kind == "wiki-vote":
+        from utils.edgelist import read_snap_edgelist
+        return read_snap_edgelist(os.path.join(DATA_DIR, "Wiki-Vote.txt"), directed=True)
+
+    if kind == "snap":
+        from utils.edgelist import read_snap_edgelist
+        path, _, mode = rest.partition(":")
+        return read_snap_edgelist(path, directed=(mode != "undirected"))
+
+    if kind == "csr":
+        from utils.csr_graph import load_csr
+        return load_csr(rest)
+
+    if kind == "graphml":
+        import networkx as nx
+        return nx.read_graphml(_city_file(rest), node_type=int)
+
+    if kind == "osm":
+        city, _, mode = rest.partition(":")
+        city = city if "," in city else f"{city}, France"
+        oriented = mode != "undirected"
+        from utils.overpass_cache import build_city_graph_from_cache
+        try:
+            return build_city_graph_from_cache(city, oriented=oriented)
+        except FileNotFoundError:
+            from utils.graph_utils import get_city_graph, get_oriented_city_graph
+            loader = get_oriented_city_graph if oriented else get_city_graph
+            return loader(city, save_local=False)
+
+    if kind == "synthetic":
+        from benchmarks.synthetic import parse_spec, load_synthetic
+        family, n, directed, seed = parse_spec(rest)
+        return load_synthetic(family, n, directed=directed, seed=seed)
+
+    raise ValueError(f"Jeu de données inconnu : {spec}")
+
+
+def graph_size(G):
+    """(|V|, |E|) pour networkx ou CSRGraph."""
+    return G.number_of_nodes(), G.number_of_edges()
+
+
+def _static_edges(G):
+    """
+    Arêtes (u, v, data) d'un graphe statique. Pour un CSRGraph, les sommets sont rendus par
+    identifiant d'origine et les arêtes dans l'ordre d'avant renumérotation (G.order, voir
+    utils/reorder.py) : le graphe temporel tiré ne dépend pas de la numérotation.
+    """
+    if not hasattr(G, "offsets"):
+        yield from G.edges(data=True)
+        return
+    import numpy as np
+    n = G.number_of_nodes()
+    order = getattr(G, "order", None)
+    old = np.arange(n) if order is None else np.asarray(order)   # ancien indice de chaque sommet
+    ids = G.original_ids(range(n))
+    for u in np.argsort(old, kind="stable").tolist():
+        lo, hi = int(G.offsets[u]), int(G.offsets[u + 1])
+        targets = np.asarray(G.targets[lo:hi])
+        weights = np.asarray(G.weights[lo:hi])
+        for j in np.argsort(old[targets], kind="stable").tolist():
+            v = int(targets[j])
+            if not G.is_directed() and old[v] < old[u]:
+                continue
+            yield ids[u], ids[v], {"weight": float(weights[j])}
+
+
+def to_temporal_graph(G, T_max=100, lambda_max=5, seed=42):
+    """
+    Convertit un graphe statique en graphe temporel (u, v, t, λ), comme
+    osmnx_to_temporal_graph du benchmark temporel : λ proportionnelle à la longueur
+    (attribut 'length', ou poids pour un CSRGraph), t tiré uniformément.
+    Les sommets sont les identifiants d'origine, y compris pour un CSRGraph.
+    """
+    TemporalGraph, _ = import_temporal()
+
+    rng = random.Random(seed)
+    G_temp = TemporalGraph()
+    for u, v, data in _static_edges(G):
+        if u == v:
+            continue
+        length = data.get("length", data.get("weight", 50))
+        l = min(lambda_max, max(1, int(float(length) / 100)))
+        t = rng.randint(0, T_max - l)
+        G_temp.add_edge(u, v, t, l)
+    return G_temp
@@ -0,0 +1,265 @@
+import os
+import csv
+import sys
+import json
+import time
+import platform
+import statistics
+
+from benchmarks.datasets import load_dataset, graph_size, to_temporal_graph, import_temporal
+
+
+# ------------------------------------------------------------
+# Moteurs : prepare(G) hors chronométrage, run(prepared, k) -> {sommet: score}
+# stats : objet utils.instrumentation.Stats (ou MemoryProfiler) transmis aux moteurs qui le gèrent
+# ------------------------------------------------------------
+class Engine:
+    name = None
+    static = True  # même définition de closeness que la référence classique
+    k_independent = False  # calcule toutes les centralités : une seule mesure pour tous les k
+
+    def prepare(self, G):
+        return G
+
+    def run(self, prepared, k, stats=None):
+        raise NotImplementedError
+
+
+class ClassicEngine(Engine):
+    name = "classic"
+    k_independent = True
+
+    def run(self, G, k, stats=None):
+        from classic_closeness.classic_closeness import closeness_centrality_all_nodes
+        return closeness_centrality_all_nodes(G, use_cache=False, stats=stats)
+
+
+class EfficientEngine(Engine):
+    name = "efficient"
+    workers = None  # processus pour la phase de recherche (None : séquentiel)
+    cost_model = None  # modèle de coût de schedule() (None : constantes d'origine, "road" / "social" : modèle calibré)
+
+    def run(self, G, k, stats=None):
+        from efficient_closeness.top_k_closeness import top_k_closeness
+        # les caches de voisinage posés sur G font partie du coût de l'algorithme
+        for attr in ("_neighbors_cache", "_weights_cache"):
+            if attr in G.__dict__:
+                delattr(G, attr)
+        return top_k_closeness(G, k, use_cache=False, stats=stats, workers=self.workers, cost_model=self.cost_model)
+
+
+class ParallelEfficientEngine(EfficientEngine):
+    """Même moteur, recherche répartie sur tous les cœurs (efficient_closeness/parallel.py)."""
+    name = "efficient_parallel"
+    workers = os.cpu_count() or 1
+
+
+class TemporalEngine(Engine):
+    name = "temporal"
+    static = False
+
+    def __init__(self, interval=(0, 100)):
+        self.interval = interval
+
+    def prepare(self, G):
+        return to_temporal_graph(G, T_max=self.interval[1])
+
+    def run(self, G_temp, k, stats=None):
+        _, topk_temporal_closeness = import_temporal()
+        res = topk_temporal_closeness(G_temp, k=k, interval=self.interval, use_cache=False, stats=stats)
+        return {node: c for c, node in res}
+
+
+ENGINES = {e.name: e for e in (ClassicEngine, EfficientEngine, ParallelEfficientEngine, TemporalEngine)}
+
+
+# ------------------------------------------------------------
+# Statistiques
+# ------------------------------------------------------------
+def ranking(scores, k):
+    """Top-k trié par score décroissant (départage stable sur l'identifiant)."""
+    return [n for n, _ in sorted(scores.items(), key=lambda x: (-x[1], str(x[0])))[:k]]
+
+
+def kendall_tau(xs, ys):
+    """Tau-b de Kendall entre deux séquences de même longueur (sans dépendance scipy)."""
+    n = len(xs)
+    concordant = discordant = ties_x = ties_y = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            dx = (xs[i] > xs[j]) - (xs[i] < xs[j])
+            dy = (ys[i] > ys[j]) - (ys[i] < ys[j])
+            if dx == 0 and dy == 0:
+                continue
+            if dx == 0:
+                ties_x += 1
+            elif dy == 0:
+                ties_y += 1
+            elif dx == dy:
+                concordant += 1
+            else:
+                discordant += 1
+    denom = ((concordant + discordant + ties_x) * (concordant + discordant + ties_y)) ** 0.5
+    return (concordant - discordant) / denom if denom else 1.0
+
+
+def agreement(top, reference_scores, k):
+    """
+    Accord d'un top-k avec la référence exacte :
+    - overlap : proportion du top-k de référence retrouvée
+    - kendall_tau : corrélation entre l'ordre rendu et les valeurs exactes de ces mêmes sommets
+    """
+    ref_top = ranking(reference_scores, k)
+    overlap = len(set(top) & set(ref_top)) / k if k else 0.0
+    positions = [-i for i in range(len(top))]
+    exact = [reference_scores.get(n, 0.0) for n in top]
+    return overlap, kendall_tau(positions, exact)
+
+
+def summarize(times):
+    """Médiane et dispersion d'une série de mesures (secondes)."""
+    out = {
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "min_s": min(times),
+        "max_s": max(times),
+        "stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+    if len(times) > 1:
+        q1, _, q3 = statistics.quantiles(times, n=4, method="inclusive")
+        out["iqr_s"] = q3 - q1
+    else:
+        out["iqr_s"] = 0.0
+    return out
+
+
+def reordered(G, method):
+    """
+    (CSRGraph renuméroté, durée) : un graphe networkx est d'abord converti en CSR, pondéré par
+    'length' s'il porte des longueurs (le graphe temporel dérivé garde les mêmes λ).
+    """
+    from utils.csr_graph import CSRGraph, from_networkx
+    from utils.reorder import reorder
+    t0 = time.perf_counter()
+    if not isinstance(G, CSRGraph):
+        has_length = any("length" in data for _, _, data in G.edges(data=True))
+        G = from_networkx(G, weight="length" if has_length else "weight")
+    return reorder(G, method), time.perf_counter() - t0
+
+
+# ------------------------------------------------------------
+# Banc d'essai
+# ------------------------------------------------------------
+def run_benchmark(datasets, engines, ks, repetitions=5, warmup=1, reference="classic", log=print,
+                  memory_profiles=None, reorder=None):
+    """
+    Exécute la matrice jeux de données × moteurs × k × répétitions.
+
+    - chargement du jeu de données et préparation propre au moteur chronométrés à part
+    - `warmup` exécutions non mesurées, puis `repetitions` mesures du calcul seul
+    - accord avec la référence exacte (closeness classique) pour les moteurs statiques
+    - si `memory_profiles` est une liste, une exécution supplémentaire sous MemoryProfiler
+      (pic mémoire par phase et attribution des allocations) ; les profils y sont ajoutés
+      sous la forme (étiquette, profileur)
+    - si `reorder` est une numérotation de utils/reorder.py ("rcm", "hilbert", "degree"...),
+      le graphe est converti en CSR et renuméroté avant les moteurs (durée dans reorder_s) ;
+      les résultats restent exprimés en identifiants d'origine
+
+    Retourne la liste des enregistrements (un par (dataset, moteur, k)).
+    """
+    records = []
+    for spec in datasets:
+        t0 = time.perf_counter()
+        G = load_dataset(spec)
+        load_s = time.perf_counter() - t0
+        n, m = graph_size(G)
+        log(f"📂 {spec} : {n} sommets, {m} arêtes (chargement {load_s:.3f}s)")
+        reorder_s = None
+        if reorder:
+            G, reorder_s = reordered(G, reorder)
+            log(f"   🔀 renumérotation {reorder} en {reorder_s:.3f}s")
+
+        reference_scores = None
+        for engine_name in engines:
+            engine = ENGINES[engine_name]()
+            t0 = time.perf_counter()
+            prepared = engine.prepare(G)
+            prepare_s = time.perf_counter() - t0
+
+            measured = None
+            for k in ks:
+                if measured is None or not engine.k_independent:
+                    for _ in range(warmup):
+                        engine.run(prepared, k)
+                    times = []
+                    scores = None
+                    for _ in range(repetitions):
+                        t0 = time.perf_counter()
+                        scores = engine.run(prepared, k)
+                        times.append(time.perf_counter() - t0)
+                    measured = (times, scores)
+                times, scores = measured
+
+                top = ranking(scores, k)
+                rec = {
+                    "dataset": spec, "engine": engine_name, "k": k,
+                    "nodes": n, "edges": m,
+                    "load_s": load_s, "prepare_s": prepare_s,
+                    "reorder": reorder, "reorder_s": reorder_s,
+                    "repetitions": repetitions, "warmup": warmup,
+                    "times_s": times,
+                    **summarize(times),
+                    "topk": [str(v) for v in top],
+                    "overlap": None, "kendall_tau": None,
+                    "mem_peak_mb": None, "max_rss_mb": None,
+                }
+
+                if memory_profiles is not None:
+                    from utils.memory_profile import MemoryProfiler
+                    profiler = MemoryProfiler()
+                    with profiler.phase(engine_name):
+                        engine.run(prepared, k, stats=profiler)
+                    rec["mem_peak_mb"] = profiler.memory[engine_name]["traced_peak_mb"]
+                    rec["max_rss_mb"] = profiler.memory[engine_name]["max_rss_mb"]
+                    rec["memory"] = profiler.memory
+                    memory_profiles.append((f"{spec} / {engine_name} / k={k}", profiler))
+
+                if engine.static and reference:
+                    if engine_name == reference and len(scores) == n:
+                        reference_scores = scores
+                    if reference_scores is None:
+                        reference_scores = ENGINES[reference]().run(ENGINES[reference]().prepare(G), k)
+                    rec["overlap"], rec["kendall_tau"] = agreement(top, reference_scores, k)
+
+                records.append(rec)
+                log(f"   {engine_name:<10} k={k:<3} médiane={rec['median_s']:.4f}s "
+                    f"(iqr {rec['iqr_s']:.4f}s, n={repetitions})"
+                    + (f" overlap={rec['overlap']:.0%} tau={rec['kendall_tau']:.2f}" if rec["overlap"] is not None else "")
+                    + (f" pic mémoire={rec['mem_peak_mb']:.1f} Mo" if rec["mem_peak_mb"] is not None else ""))
+    return records
+
+
+CSV_FIELDS = ["dataset", "engine", "k", "nodes", "edges", "load_s", "reorder", "reorder_s", "prepare_s", "repetitions",
+              "median_s", "mean_s", "stdev_s", "iqr_s", "min_s", "max_s", "overlap", "kendall_tau",
+              "mem_peak_mb", "max_rss_mb"]
+
+
+def environment():
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_results(records, output_prefix):
+    """Écrit <prefix>.json (mesures brutes + environnement) et <prefix>.csv (résumé)."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_prefix)), exist_ok=True)
+    with open(output_prefix + ".json", "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "records": records}, f, indent=2)
+    with open(output_prefix + ".csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+    return output_prefix + ".json", output_prefix + ".csv"
@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+import statistics
+import subprocess
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Bibliothèques lourdes surveillées (une seule d'entre elles coûte déjà des centaines de ms)
+HEAVY = ("osmnx", "matplotlib", "pandas", "networkx", "scipy")
+PLOTTING = ("osmnx", "matplotlib", "pandas")
+
+# module -> (budget d'import en secondes, bibliothèques qui ne doivent pas être chargées)
+# Chemin de calcul « mince » : moteurs et chargement des graphes sans networkx ni tracé ;
+# points d'entrée : networkx autorisé, mais tracé et téléchargement chargés à l'usage.
+IMPORT_BUDGETS = {
+    "utils.csr_graph": (0.25, HEAVY),
+    "benchmarks.datasets": (0.05, HEAVY),
+    "classic_closeness.classic_closeness": (0.30, HEAVY),
+    "efficient_closeness.top_k_closeness": (0.30, HEAVY),
+    "efficient_closeness.anytime": (0.30, HEAVY),
+    "efficient_closeness.region": (0.30, HEAVY),
+    "topk_temporal_closeness": (0.10, HEAVY),
+    "closeness_server": (0.40, HEAVY),
+    "closeness_cluster": (0.40, HEAVY),
+    "utils.graph_utils": (0.05, PLOTTING),
+    "main_classic_closeness_no_oriented_graph": (0.40, PLOTTING),
+    "main_efficient_closeness_no_oriented_graph": (0.40, PLOTTING),
+    "compare_algorithms_no_oriented_graph": (0.40, PLOTTING),
+    "compare_algorithms_oriented_graph": (0.40, PLOTTING),
+    "benchmark_osmnx": (0.10, PLOTTING),
+}
+
+_CHILD = """
+import sys, time, json, importlib
+sys.path[:0] = {paths!r}
+t0 = time.perf_counter()
+importlib.import_module({module!r})
+seconds = time.perf_counter() - t0
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module, repetitions=5):
+    """
+    Temps d'import à froid d'un module : un nouvel interpréteur par mesure (aucun module
+    déjà chargé), temps de l'import seul et durée totale du processus.
+    Retourne {"module", "import_s" (médiane), "process_s" (médiane), "loaded"}.
+    """
+    paths = [SRC_DIR, os.path.join(SRC_DIR, "temporal_closeness")]
+    code = _CHILD.format(paths=paths, module=module, heavy=HEAVY)
+    imports, processes, loaded = [], [], []
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True)
+        processes.append(time.perf_counter() - t0)
+        if out.returncode != 0:
+            raise RuntimeError(f"Import de {module} impossible :\n{out.stderr.strip()}")
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(result["seconds"])
+        loaded = result["loaded"]
+    return {"module": module, "import_s": statistics.median(imports),
+            "process_s": statistics.median(processes), "loaded": loaded}
+
+
+def interpreter_startup(repetitions=5):
+    """Durée médiane d'un interpréteur vide (python -c pass), pour situer les mesures."""
+    times = []
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def check_import_budgets(budgets=None, repetitions=5, scale=1.0, output=None):
+    """
+    Mesure chaque module de budgets ({module: (secondes, interdits)}, IMPORT_BUDGETS par
+    défaut) et affiche le tableau. Un module est en échec s'il dépasse budget × scale ou
+    s'il charge une bibliothèque interdite. Retourne True si tout est dans le budget.
+    """
+    budgets = IMPORT_BUDGETS if budgets is None else budgets
+    startup = interpreter_startup(repetitions)
+    print(f"⏱️ Démarrage de l'interpréteur : {startup * 1000:.0f} ms")
+    rows, ok = [], True
+    for module, (budget, forbidden) in budgets.items():
+        rec = measure_import(module, repetitions)
+        bad = [m for m in rec["loaded"] if m in forbidden]
+        over = rec["import_s"] > budget * scale
+        rec.update(budget_s=budget * scale, forbidden_loaded=bad, ok=not (over or bad))
+        ok &= rec["ok"]
+        rows.append(rec)
+        status = "✅" if rec["ok"] else "❌"
+        extra = f"  chargés interdits : {', '.join(bad)}" if bad else ""
+        print(f"{status} {module:<45} {rec['import_s'] * 1000:7.0f} ms / {budget * scale * 1000:5.0f} ms"
+              f"  (processus {rec['process_s'] * 1000:.0f} ms){extra}")
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"interpreter_s": startup, "records": rows}, f, indent=2)
+        print(f"📄 Temps d'import : {output}")
+    return ok
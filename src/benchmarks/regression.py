@@ -0,0 +1,174 @@
+import os
+import json
+import math
+import random
+import statistics
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASELINE_DIR = os.path.join(os.path.dirname(SRC_DIR), "results", "baselines")
+
+
+def baseline_path(name):
+    """Nom court ('paris') -> results/baselines/paris.json ; un chemin est utilisé tel quel."""
+    if os.sep in name or name.endswith(".json"):
+        return name
+    return os.path.join(BASELINE_DIR, name + ".json")
+
+
+def record_key(rec):
+    # une mesure sur graphe renuméroté (--reorder) est une configuration distincte
+    suffix = f"|{rec['reorder']}" if rec.get("reorder") else ""
+    return f"{rec['dataset']}|{rec['engine']}|k={rec['k']}{suffix}"
+
+
+# ------------------------------------------------------------
+# Enregistrement / lecture des références
+# ------------------------------------------------------------
+def save_baseline(records, name, environment=None):
+    """
+    Conserve, pour chaque (jeu de données, moteur, k), les temps bruts et la mémoire
+    mesurés par run_benchmark. Une référence existante est complétée, pas écrasée :
+    on peut construire la référence de Paris et celle de Wiki-Vote séparément.
+    """
+    path = baseline_path(name)
+    baseline = load_baseline(name) if os.path.exists(path) else {"environment": environment, "entries": {}}
+    baseline["environment"] = environment or baseline.get("environment")
+    for rec in records:
+        baseline["entries"][record_key(rec)] = {
+            "dataset": rec["dataset"], "engine": rec["engine"], "k": rec["k"], "reorder": rec.get("reorder"),
+            "nodes": rec.get("nodes"), "edges": rec.get("edges"),
+            "times_s": rec["times_s"], "median_s": rec["median_s"],
+            "mem_peak_mb": rec.get("mem_peak_mb"), "max_rss_mb": rec.get("max_rss_mb"),
+        }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+    return path
+
+
+def load_baseline(name):
+    with open(baseline_path(name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ------------------------------------------------------------
+# Tests statistiques (sans dépendance scipy)
+# ------------------------------------------------------------
+def mann_whitney_greater(xs, ys):
+    """
+    p-valeur unilatérale du test de Mann–Whitney pour H1 : « xs est stochastiquement plus
+    grand que ys » (approximation normale avec correction des ex æquo et de continuité).
+    """
+    n1, n2 = len(xs), len(ys)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    pooled = sorted([(v, 0) for v in xs] + [(v, 1) for v in ys])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for t in range(i, j + 1):
+            ranks[t] = rank
+        size = j - i + 1
+        ties += size ** 3 - size
+        i = j + 1
+    r1 = sum(r for r, (_, group) in zip(ranks, pooled) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return 0.5
+    z = (u - mean - 0.5) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_ratio(xs, ys, iterations=2000, confidence=0.95, seed=0):
+    """Intervalle de confiance bootstrap du rapport des médianes median(xs) / median(ys)."""
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(iterations):
+        mx = statistics.median(rng.choices(xs, k=len(xs)))
+        my = statistics.median(rng.choices(ys, k=len(ys)))
+        if my > 0:
+            ratios.append(mx / my)
+    if not ratios:
+        return float("nan"), float("nan")
+    ratios.sort()
+    lo = ratios[int((1 - confidence) / 2 * (len(ratios) - 1))]
+    hi = ratios[int((1 + confidence) / 2 * (len(ratios) - 1))]
+    return lo, hi
+
+
+# ------------------------------------------------------------
+# Comparaison
+# ------------------------------------------------------------
+def compare(baseline, records, tolerance=0.10, alpha=0.05, mem_tolerance=0.10):
+    """
+    Compare des mesures à une référence.
+
+    Un ralentissement est une régression si le rapport des médianes dépasse 1 + tolerance
+    ET si le test de Mann–Whitney le juge significatif au seuil alpha (le bruit d'une
+    machine partagée ne suffit donc pas à faire échouer le contrôle). La mémoire, quasi
+    déterministe, est une régression dès que le pic dépasse la référence de mem_tolerance.
+
+    Retourne une ligne par (jeu de données, moteur, k) avec un statut parmi
+    'regression', 'improvement', 'ok', 'new' (absent de la référence).
+    """
+    entries = baseline["entries"]
+    rows = []
+    for rec in records:
+        key = record_key(rec)
+        row = {"key": key, "dataset": rec["dataset"], "engine": rec["engine"], "k": rec["k"],
+               "median_s": rec["median_s"], "status": "new"}
+        base = entries.get(key)
+        if base is None:
+            rows.append(row)
+            continue
+
+        new_t, old_t = rec["times_s"], base["times_s"]
+        ratio = statistics.median(new_t) / statistics.median(old_t) if statistics.median(old_t) > 0 else float("inf")
+        p_slower = mann_whitney_greater(new_t, old_t)
+        p_faster = mann_whitney_greater(old_t, new_t)
+        ci_lo, ci_hi = bootstrap_ratio(new_t, old_t)
+        row.update({"baseline_median_s": base["median_s"], "ratio": ratio,
+                    "p_value": p_slower, "ci_low": ci_lo, "ci_high": ci_hi, "status": "ok", "reasons": []})
+
+        if ratio > 1 + tolerance and p_slower < alpha:
+            row["status"] = "regression"
+            row["reasons"].append(f"temps x{ratio:.2f} (p={p_slower:.3f}, IC95% [{ci_lo:.2f}, {ci_hi:.2f}])")
+        elif ratio < 1 - tolerance and p_faster < alpha:
+            row["status"] = "improvement"
+
+        new_mem, old_mem = rec.get("mem_peak_mb"), base.get("mem_peak_mb")
+        if new_mem is not None and old_mem:
+            row["mem_ratio"] = new_mem / old_mem
+            if new_mem > old_mem * (1 + mem_tolerance):
+                row["status"] = "regression"
+                row["reasons"].append(f"mémoire {old_mem:.1f} -> {new_mem:.1f} Mo")
+        rows.append(row)
+    return rows
+
+
+def report(rows, log=print):
+    """Affiche le résultat de compare() ; retourne True si au moins une régression."""
+    icons = {"regression": "❌", "improvement": "🚀", "ok": "✅", "new": "🆕"}
+    for row in rows:
+        line = f"{icons[row['status']]} {row['key']:<45} {row['median_s']:.4f}s"
+        if "ratio" in row:
+            line += f"  (réf. {row['baseline_median_s']:.4f}s, x{row['ratio']:.2f}, p={row['p_value']:.3f})"
+        if row.get("reasons"):
+            line += "  " + "; ".join(row["reasons"])
+        log(line)
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        log(f"\n❌ {len(regressions)} régression(s) par rapport à la référence")
+    else:
+        log("\n✅ Aucune régression significative")
+    return bool(regressions)
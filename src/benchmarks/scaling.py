@@ -0,0 +1,150 @@
+import os
+import csv
+import time
+import resource
+import multiprocessing as mp
+
+from benchmarks.datasets import load_dataset, graph_size
+
+# Taille maximale (|V|) au-delà de laquelle un moteur n'est plus lancé : la closeness classique
+# est en O(|V|·|E|) et le graphe temporel est une structure Python pure.
+DEFAULT_CAPS = {"classic": 200_000, "efficient": 10_000_000, "temporal": 200_000}
+
+SCALING_FIELDS = ["family", "directed", "size", "engine", "k", "nodes", "edges",
+                  "status", "load_s", "prepare_s", "run_s", "base_rss_mb", "peak_rss_mb"]
+
+
+def _rss_mb():
+    """Pic de mémoire résidente du processus courant (ru_maxrss est en Ko sous Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(spec, engine_name, k, conn):
+    """
+    Exécuté dans un processus neuf : le pic de mémoire (ru_maxrss) ne concerne alors
+    que ce jeu de données et ce moteur.
+    """
+    from benchmarks.harness import ENGINES
+    try:
+        t0 = time.perf_counter()
+        G = load_dataset(spec)
+        load_s = time.perf_counter() - t0
+        n, m = graph_size(G)
+
+        engine = ENGINES[engine_name]()
+        t0 = time.perf_counter()
+        prepared = engine.prepare(G)
+        prepare_s = time.perf_counter() - t0
+        base = _rss_mb()
+
+        t0 = time.perf_counter()
+        engine.run(prepared, k)
+        run_s = time.perf_counter() - t0
+        conn.send({"status": "ok", "nodes": n, "edges": m, "load_s": load_s, "prepare_s": prepare_s,
+                   "run_s": run_s, "base_rss_mb": base, "peak_rss_mb": _rss_mb()})
+    except MemoryError:
+        conn.send({"status": "oom"})
+    except Exception as e:
+        conn.send({"status": f"error: {e!r}"})
+    finally:
+        conn.close()
+
+
+def measure_isolated(spec, engine_name, k, timeout=None):
+    """Lance _measure dans un processus « spawn » ; status='timeout' si le délai est dépassé."""
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    p = ctx.Process(target=_measure, args=(spec, engine_name, k, child))
+    p.start()
+    child.close()
+    result = {"status": "timeout"}
+    if parent.poll(timeout):
+        try:
+            result = parent.recv()
+        except EOFError:
+            result = {"status": "crashed"}
+    p.join(1 if result["status"] == "timeout" else None)
+    if p.is_alive():
+        p.terminate()
+        p.join()
+    elif p.exitcode and result["status"] == "timeout":
+        result = {"status": f"crashed (code {p.exitcode})"}
+    return result
+
+
+def run_scaling(families, sizes, engines, k=5, directions=("undirected",), seed=0,
+                timeout=600, caps=None, log=print):
+    """
+    Courbes de passage à l'échelle : pour chaque famille synthétique, taille et orientation,
+    mesure le temps et le pic mémoire de chaque moteur dans un processus isolé.
+
+    Un moteur est abandonné pour les tailles supérieures dès qu'il dépasse `timeout`
+    secondes ou échoue : la suite ne ferait que confirmer la rupture.
+    """
+    caps = {**DEFAULT_CAPS, **(caps or {})}
+    records = []
+    for family in families:
+        for direction in directions:
+            broken = set()
+            for size in sorted(sizes):
+                spec = f"synthetic:{family}:{size}:{direction}:seed={seed}"
+                # génère (et met en cache) le graphe une fois avant les mesures isolées
+                load_dataset(spec)
+                for engine_name in engines:
+                    rec = {"family": family, "directed": direction == "directed", "size": size,
+                           "engine": engine_name, "k": k}
+                    if engine_name in broken or size > caps.get(engine_name, float("inf")):
+                        rec["status"] = "skipped"
+                    else:
+                        rec.update(measure_isolated(spec, engine_name, k, timeout))
+                        if rec["status"] != "ok":
+                            broken.add(engine_name)
+                    records.append(rec)
+                    if rec["status"] == "ok":
+                        log(f"   {family:<10} {direction:<10} n={rec['nodes']:<9} m={rec['edges']:<9} "
+                            f"{engine_name:<10} {rec['run_s']:.3f}s  pic {rec['peak_rss_mb']:.0f} Mo")
+                    else:
+                        log(f"   {family:<10} {direction:<10} n={size:<9} {engine_name:<10} {rec['status']}")
+    return records
+
+
+def write_scaling(records, output_prefix):
+    """Écrit <prefix>_scaling.csv (une ligne par famille × orientation × taille × moteur)."""
+    path = output_prefix + "_scaling.csv"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SCALING_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+    return path
+
+
+def plot_scaling(records, output_prefix):
+    """Courbes temps / pic mémoire en fonction de |V| (échelles log), une figure par famille."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    paths = []
+    for family in sorted({r["family"] for r in records}):
+        fig, (ax_t, ax_m) = plt.subplots(1, 2, figsize=(12, 5))
+        for (engine, directed) in sorted({(r["engine"], r["directed"]) for r in records if r["family"] == family}):
+            pts = sorted((r["nodes"], r["run_s"], r["peak_rss_mb"]) for r in records
+                         if r["family"] == family and r["engine"] == engine
+                         and r["directed"] == directed and r["status"] == "ok")
+            if not pts:
+                continue
+            label = f"{engine} ({'orienté' if directed else 'non orienté'})"
+            ax_t.loglog([p[0] for p in pts], [p[1] for p in pts], marker="o", label=label)
+            ax_m.loglog([p[0] for p in pts], [p[2] for p in pts], marker="o", label=label)
+        ax_t.set(xlabel="|V|", ylabel="temps (s)", title=f"{family} : temps de calcul")
+        ax_m.set(xlabel="|V|", ylabel="pic RSS (Mo)", title=f"{family} : mémoire")
+        ax_t.legend()
+        ax_t.grid(True, which="both", alpha=0.3)
+        ax_m.grid(True, which="both", alpha=0.3)
+        path = f"{output_prefix}_scaling_{family}.png"
+        fig.tight_layout()
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        paths.append(path)
+    return paths
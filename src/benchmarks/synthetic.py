@@ -0,0 +1,184 @@
+import os
+import math
+import numpy as np
+
+from utils.csr_graph import from_edge_arrays, save_csr, load_csr
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SYNTHETIC_DIR = os.path.join(os.path.dirname(SRC_DIR), "data", "synthetic")
+
+# Proportion d'arêtes à sens unique dans les variantes orientées "routières"
+ONEWAY_FRACTION = 0.3
+
+
+def _orient(src, dst, rng, directed, oneway_fraction=ONEWAY_FRACTION):
+    """
+    Variante orientée d'une liste d'arêtes non orientées : une fraction des arêtes devient
+    à sens unique (sens tiré au hasard), les autres sont conservées dans les deux sens.
+    """
+    if not directed:
+        return src, dst
+    oneway = rng.random(len(src)) < oneway_fraction
+    flip = oneway & (rng.random(len(src)) < 0.5)
+    a = np.where(flip, dst, src)
+    b = np.where(flip, src, dst)
+    two_way = ~oneway
+    return np.concatenate([a, b[two_way]]), np.concatenate([b, a[two_way]])
+
+
+def grid(n, directed=False, seed=0):
+    """Grille carrée 4-voisins d'environ n sommets (coordonnées = position dans la grille)."""
+    rng = np.random.default_rng(seed)
+    side = max(2, int(round(math.sqrt(n))))
+    idx = np.arange(side * side, dtype=np.int64).reshape(side, side)
+    src = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+    dst = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+    src, dst = _orient(src, dst, rng, directed)
+    x = (idx % side).ravel().astype(np.float64)
+    y = (idx // side).ravel().astype(np.float64)
+    return from_edge_arrays(src, dst, None, np.arange(side * side), directed=directed, x=x, y=y)
+
+
+def random_geometric(n, directed=False, seed=0, mean_degree=3.0, chunk=1 << 20):
+    """
+    Graphe géométrique aléatoire (proche d'un réseau routier) : n points uniformes dans
+    le carré unité, arête entre deux points à distance < r, r choisi pour un degré moyen
+    `mean_degree`. Recherche des voisins par seaux de côté r (9 cellules voisines).
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random(n)
+    y = rng.random(n)
+    r = math.sqrt(mean_degree / (math.pi * n))
+    cells = max(1, int(1 / r))
+    cx = np.minimum((x * cells).astype(np.int64), cells - 1)
+    cy = np.minimum((y * cells).astype(np.int64), cells - 1)
+    cell = cx * cells + cy
+
+    order = np.argsort(cell, kind="stable")
+    sorted_cells = cell[order]
+    starts = np.searchsorted(sorted_cells, np.arange(cells * cells), side="left")
+    ends = np.searchsorted(sorted_cells, np.arange(cells * cells), side="right")
+
+    src_parts, dst_parts = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for lo in range(0, n, chunk):
+                pts = np.arange(lo, min(n, lo + chunk), dtype=np.int64)
+                nx_, ny_ = cx[pts] + dx, cy[pts] + dy
+                ok = (nx_ >= 0) & (nx_ < cells) & (ny_ >= 0) & (ny_ < cells)
+                pts = pts[ok]
+                nc = nx_[ok] * cells + ny_[ok]
+                s, e = starts[nc], ends[nc]
+                counts = e - s
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                a = np.repeat(pts, counts)
+                shift = np.repeat(s - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+                b = order[np.arange(total, dtype=np.int64) + shift]
+                keep = (a < b) & ((x[a] - x[b]) ** 2 + (y[a] - y[b]) ** 2 < r * r)
+                src_parts.append(a[keep])
+                dst_parts.append(b[keep])
+
+    src = np.concatenate(src_parts) if src_parts else np.empty(0, dtype=np.int64)
+    dst = np.concatenate(dst_parts) if dst_parts else np.empty(0, dtype=np.int64)
+    src, dst = _orient(src, dst, rng, directed)
+    return from_edge_arrays(src, dst, None, np.arange(n), directed=directed, x=x, y=y)
+
+
+def barabasi_albert(n, directed=False, seed=0, m=3):
+    """
+    Graphe de Barabási–Albert (attachement préférentiel, m arêtes par nouveau sommet),
+    méthode de Batagelj & Brandes vectorisée. Variante orientée : nouveau sommet -> ancien.
+
+    L'arête e (e >= m) relie le sommet m + 1 + (e - m) // m à l'extrémité située à la
+    position idx[e] = ⌊r·2e⌋ de la liste des extrémités M : une position paire est une source
+    (connue), une position impaire renvoie au tirage d'une arête antérieure, que l'on résout
+    par sauts de pointeurs successifs au lieu d'une boucle Python sur les 10^7 sommets.
+    """
+    rng = np.random.default_rng(seed)
+    m = max(1, min(m, n - 1))
+    n_edges = m + (n - m - 1) * m
+    e = np.arange(n_edges, dtype=np.int64)
+    src = np.where(e < m, m, m + 1 + (e - m) // m)
+    idx = np.floor(rng.random(n_edges) * 2 * e).astype(np.int64)
+
+    dst = np.where(e < m, e, -1)  # les m premières arêtes forment une étoile autour de m
+    ptr = idx.copy()
+    todo = np.nonzero(dst < 0)[0]
+    while len(todo):
+        p = ptr[todo]
+        edge = p // 2
+        even = (p % 2) == 0
+        star = ~even & (edge < m)
+        dst[todo[even]] = src[edge[even]]
+        dst[todo[star]] = edge[star]
+        rest = ~even & ~star
+        ptr[todo[rest]] = idx[edge[rest]]
+        todo = todo[rest]
+
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    if directed:
+        # quelques arêtes réciproques pour que les sommets récents soient atteignables
+        back = rng.random(len(src)) < ONEWAY_FRACTION
+        src, dst = np.concatenate([src, dst[back]]), np.concatenate([dst, src[back]])
+    return from_edge_arrays(src, dst, None, np.arange(n), directed=directed)
+
+
+def small_world(n, directed=False, seed=0, k=4, p=0.1):
+    """Graphe de Watts–Strogatz : anneau de degré k, chaque arête recâblée avec probabilité p."""
+    rng = np.random.default_rng(seed)
+    half = max(1, k // 2)
+    base = np.arange(n, dtype=np.int64)
+    src = np.concatenate([base] * half)
+    dst = np.concatenate([(base + j) % n for j in range(1, half + 1)])
+    rewire = rng.random(len(src)) < p
+    dst = dst.copy()
+    dst[rewire] = rng.integers(0, n, int(rewire.sum()))
+    keep = src != dst
+    src, dst = _orient(src[keep], dst[keep], rng, directed)
+    return from_edge_arrays(src, dst, None, np.arange(n), directed=directed)
+
+
+FAMILIES = {
+    "grid": grid,
+    "geometric": random_geometric,
+    "ba": barabasi_albert,
+    "smallworld": small_world,
+}
+
+
+def generate(family, n, directed=False, seed=0):
+    """Génère un graphe synthétique (CSRGraph) de la famille donnée, de manière déterministe."""
+    if family not in FAMILIES:
+        raise ValueError(f"Famille inconnue : {family} (choix : {', '.join(FAMILIES)})")
+    return FAMILIES[family](n, directed=directed, seed=seed)
+
+
+def load_synthetic(family, n, directed=False, seed=0, cache=True):
+    """
+    Comme generate(), mais conserve le résultat au format CSR dans data/synthetic/ :
+    les gros graphes (10^6–10^7 sommets) ne sont générés qu'une fois puis projetés en mémoire.
+    """
+    name = f"{family}_{n}_{'directed' if directed else 'undirected'}_{seed}"
+    path = os.path.join(SYNTHETIC_DIR, name)
+    if cache and os.path.exists(os.path.join(path, "meta.json")):
+        return load_csr(path)
+    G = generate(family, n, directed=directed, seed=seed)
+    if cache:
+        save_csr(G, path)
+    return G
+
+
+def parse_spec(rest):
+    """'grid:10000:directed:seed=3' -> (famille, n, orienté, graine)"""
+    parts = rest.split(":")
+    family, n = parts[0], int(float(parts[1]))
+    directed, seed = False, 0
+    for p in parts[2:]:
+        if p in ("directed", "undirected"):
+            directed = p == "directed"
+        elif p.startswith("seed="):
+            seed = int(p[5:])
+    return family, n, directed, seed
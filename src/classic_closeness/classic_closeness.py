@@ -1,11 +1,27 @@
-import networkx as nx
 from collections import deque
 import time
-def closeness_centrality_all_nodes(G):
+import numpy as np
+from utils.csr_graph import CSRGraph, working_array, bfs_levels
+from utils.result_cache import cached
+from utils.instrumentation import phase
+
+
+@cached("classic_closeness")
+def closeness_centrality_all_nodes(G, work_dir=None, stats=None):
     """
     Compute closeness centrality for all nodes in an unweighted, undirected graph.
     Based on Algorithm 1 from the course.
+    Si G est un CSRGraph, le BFS travaille directement sur les tableaux (éventuellement
+    np.memmap) et le tableau des distances peut être projeté sur disque via work_dir.
+    stats : utils.instrumentation.Stats (ou MemoryProfiler), phase "bfs" (distances par source).
     """
+    if isinstance(G, CSRGraph):
+        return _closeness_centrality_csr(G, work_dir=work_dir, stats=stats)
+    with phase(stats, "bfs"):
+        return _closeness_centrality_nx(G)
+
+
+def _closeness_centrality_nx(G):
     closeness = {}
     n = len(G)  # nombre total de sommets du graphe
 
@@ -37,3 +53,25 @@ def closeness_centrality_all_nodes(G):
             closeness[v] = 0.0  # sommet isolé ou sans voisins atteignables
         #print(f"nombre de sommets atteignables depuis {v}: {r_v} et somme des distances: {S}")
     return closeness
+
+
+def _closeness_centrality_csr(G, work_dir=None, stats=None):
+    """
+    Même calcul que closeness_centrality_all_nodes sur un CSRGraph :
+    un seul tableau de distances (int32) réutilisé pour toutes les sources.
+    Le résultat est indexé par les identifiants d'origine des sommets.
+    """
+    n = G.number_of_nodes()
+    with phase(stats, "init"):
+        dist = working_array(n, np.int32, -1, work_dir)
+        ids = G.original_ids(range(n))
+    closeness = {}
+
+    with phase(stats, "bfs"):
+        for v in range(n):
+            r_v, S = bfs_levels(G, v, dist)
+            if S > 0 and r_v > 1:
+                closeness[ids[v]] = ((r_v - 1) ** 2) / ((n - 1) * S)
+            else:
+                closeness[ids[v]] = 0.0
+    return closeness
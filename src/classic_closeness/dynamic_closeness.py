@@ -0,0 +1,164 @@
+import heapq
+import numpy as np
+from utils.csr_graph import CSRGraph, from_networkx, from_edge_arrays, working_array, bfs_levels
+
+
+class DynamicCloseness:
+    """
+    Closeness de tous les sommets (même définition que closeness_centrality_all_nodes),
+    maintenue sous insertions et suppressions d'arêtes (fermetures, sens uniques, rues
+    ajoutées) sans tout recalculer.
+
+    Pour chaque source s on garde r_s (sommets atteints) et S_s (somme des distances).
+    Une modification de l'arc (a, b) ne touche que les sources dont l'arbre de BFS le
+    traverse ; avec d(s, a) et d(s, b) pour toutes les sources (un BFS inverse depuis a et
+    depuis b, sur le graphe avant modification) :
+    - insertion : s est touchée si d(s, a) + 1 < d(s, b) (l'arc raccourcit un chemin) ;
+    - suppression : s est touchée si d(s, b) = d(s, a) + 1 (l'arc est sur un plus court chemin)
+      et si b n'a pas d'autre prédécesseur p (arc conservé) avec d(s, p) = d(s, a).
+    Une source qui n'est touchée par aucune modification d'un lot garde ses distances (chaque
+    sommet conserve un parent dans son DAG de plus courts chemins) ;
+    seules les autres sont recalculées (BFS) sur le nouveau graphe.
+
+    Les sommets sont ceux du graphe initial (une arête vers un sommet inconnu est refusée) ;
+    les distances sont en nombre d'arêtes, comme pour le calcul classique.
+
+        dyn = DynamicCloseness(G)
+        dyn.apply(delete=[(u, v)], insert=[(a, b)])
+        dyn.top_k(10)
+    """
+
+    def __init__(self, G, work_dir=None):
+        if not isinstance(G, CSRGraph):
+            G = from_networkx(G)
+        self.directed = G.is_directed()
+        self.node_ids = G.node_ids
+        self.x, self.y = G.x, G.y
+        self.n = n = G.number_of_nodes()
+        self.index = {u: i for i, u in enumerate(G.original_ids(range(n)))}
+
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(G.offsets)))
+        self.keys = np.unique(self._keys(src, np.asarray(G.targets, dtype=np.int64)))
+        self.G = G
+        self.dist = working_array(n, np.int32, -1, work_dir)
+        self.r = np.ones(n, dtype=np.int64)
+        self.S = np.zeros(n, dtype=np.int64)
+        self._recompute(range(n))
+
+    # ---------------- arêtes ----------------
+    def _keys(self, src, dst):
+        """Clé entière unique par arête (u*n + v ; paire triée si le graphe est non orienté)."""
+        if not self.directed:
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+        keep = src != dst
+        return src[keep] * self.n + dst[keep]
+
+    def _indices(self, edges):
+        try:
+            pairs = [(self.index[u], self.index[v]) for u, v in edges]
+        except KeyError as e:
+            raise KeyError(f"Sommet inconnu du graphe initial : {e.args[0]!r}") from None
+        arr = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        return arr[:, 0], arr[:, 1]
+
+    def _rebuild(self):
+        src, dst = self.keys // self.n, self.keys % self.n
+        self.G = from_edge_arrays(src, dst, None, self.node_ids, directed=self.directed, x=self.x, y=self.y)
+
+    # ---------------- distances ----------------
+    def _distances_to(self, v):
+        """d(s, v) pour toutes les sources s (-1 si v n'est pas atteignable depuis s)."""
+        G = self.G
+        if self.directed:
+            G = CSRGraph(G.in_offsets, G.in_sources, G.in_weights, G.node_ids, directed=True)
+        d = np.empty(self.n, dtype=np.int32)
+        bfs_levels(G, v, d)
+        return d.astype(np.int64)
+
+    def _recompute(self, sources):
+        for s in sources:
+            self.r[s], self.S[s] = bfs_levels(self.G, s, self.dist)
+
+    def affected(self, insert=(), delete=()):
+        """Sources dont les distances peuvent changer avec ce lot (graphe courant)."""
+        return self._affected(self._indices(insert), self._indices(delete))
+
+    def _affected(self, inserted, deleted):
+        touched = np.zeros(self.n, dtype=bool)
+        cache = {}
+
+        def to(v):
+            if v not in cache:
+                cache[v] = self._distances_to(v)
+            return cache[v]
+
+        removed = set(zip(deleted[0].tolist(), deleted[1].tolist()))
+        if not self.directed:
+            removed |= {(b, a) for a, b in removed}
+
+        def check(a, b, insertion):
+            da, db = to(a), to(b)
+            if insertion:
+                touched[(da >= 0) & ((db < 0) | (da + 1 < db))] = True
+                return
+            tight = (da >= 0) & (db == da + 1)
+            # b garde sa distance s'il a un autre parent p (arc p -> b conservé) au niveau d(s, a)
+            for p in self.G.predecessors(b):
+                if p != a and (p, b) not in removed and tight.any():
+                    tight &= to(p) != da
+            touched[tight] = True
+
+        for (src, dst), insertion in ((inserted, True), (deleted, False)):
+            for a, b in zip(src.tolist(), dst.tolist()):
+                if a == b:
+                    continue
+                check(a, b, insertion)
+                if not self.directed:
+                    check(b, a, insertion)
+        return np.flatnonzero(touched)
+
+    # ---------------- mises à jour ----------------
+    def apply(self, insert=(), delete=()):
+        """
+        Applique un lot de modifications (listes de paires d'identifiants d'origine) et
+        recalcule les seules sources touchées. Retourne le nombre de sources recalculées.
+        """
+        ins_src, ins_dst = self._indices(insert)
+        del_src, del_dst = self._indices(delete)
+        ins_keys = np.setdiff1d(self._keys(ins_src, ins_dst), self.keys)
+        del_keys = np.intersect1d(self._keys(del_src, del_dst), self.keys)
+        if not len(ins_keys) and not len(del_keys):
+            return 0
+
+        # seules les modifications effectives (arête réellement ajoutée / retirée) comptent
+        sources = self._affected((ins_keys // self.n, ins_keys % self.n),
+                                 (del_keys // self.n, del_keys % self.n))
+
+        self.keys = np.union1d(np.setdiff1d(self.keys, del_keys), ins_keys)
+        self._rebuild()
+        self._recompute(sources)
+        return len(sources)
+
+    def add_edge(self, u, v):
+        return self.apply(insert=[(u, v)])
+
+    def remove_edge(self, u, v):
+        return self.apply(delete=[(u, v)])
+
+    # ---------------- résultats ----------------
+    def values(self):
+        """Tableau des centralités, indexé comme les sommets du graphe."""
+        c = np.zeros(self.n, dtype=np.float64)
+        ok = (self.S > 0) & (self.r > 1)
+        c[ok] = (self.r[ok] - 1) ** 2 / ((self.n - 1) * self.S[ok])
+        return c
+
+    def closeness(self):
+        """{identifiant d'origine: centralité} pour tous les sommets."""
+        return dict(zip(self.G.original_ids(range(self.n)), self.values().tolist()))
+
+    def top_k(self, k):
+        """[(identifiant, centralité)] des k plus fortes centralités, par ordre décroissant."""
+        c = self.values()
+        best = heapq.nlargest(k, range(self.n), key=c.__getitem__)
+        return list(zip(self.G.original_ids(best), c[best].tolist()))
@@ -0,0 +1,700 @@
+import os
+import time
+import heapq
+import socket
+import secrets
+import argparse
+import tempfile
+import ipaddress
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import Listener, Client, wait
+
+import numpy as np
+
+from benchmarks.datasets import to_temporal_graph, import_temporal
+from closeness_server import load_graphs, _graph, _GRAPHS
+from utils.csr_graph import working_array, bfs_levels, dijkstra_array
+from utils.reorder import ORDERINGS
+from utils.result_cache import graph_fingerprint
+
+DEFAULT_PORT = 8790
+# Clé partagée des connexions (authentification HMAC de multiprocessing.connection : les
+# messages sont des pickles, seuls les pairs qui connaissent la clé sont acceptés). Hors de
+# la boucle locale : --key ou $AAGA_CLUSTER_KEY obligatoire. En boucle locale, à défaut, clé
+# aléatoire propre à l'utilisateur, lue dans KEY_FILE (créé en 0600 au premier usage).
+ENV_KEY = "AAGA_CLUSTER_KEY"
+KEY_FILE = os.path.join(os.path.expanduser("~"), ".aaga_cluster_key")
+MODES = ("classic", "efficient", "temporal")
+
+
+def is_loopback(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def local_key(path=KEY_FILE):
+    """
+    Clé de la boucle locale : contenu de `path`, fichier créé avec une clé aléatoire s'il
+    n'existe pas. Refusé s'il n'appartient pas à l'utilisateur ou si d'autres peuvent le lire.
+    """
+    if not os.path.exists(path):
+        # écrit à part puis lié : un autre processus ne voit jamais un fichier vide
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".")   # créé en 0600
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass    # créé entre-temps par un autre processus : c'est sa clé qui vaut
+        finally:
+            os.unlink(tmp)
+    st = os.stat(path)
+    if st.st_mode & 0o077 or (hasattr(os, "getuid") and st.st_uid != os.getuid()):
+        raise ValueError(f"{path} doit appartenir à l'utilisateur et n'être lisible que par lui (chmod 600)")
+    with open(path, encoding="utf-8") as f:
+        key = f.read().strip()
+    if not key:
+        raise ValueError(f"{path} est vide")
+    return key
+
+
+def authkey(key=None, host="127.0.0.1"):
+    """
+    Clé des connexions avec `host` (écoute ou pair) : key, $AAGA_CLUSTER_KEY, ou en boucle
+    locale seulement la clé de KEY_FILE (voir local_key). Jamais de clé constante.
+    """
+    key = key or os.environ.get(ENV_KEY)
+    if key:
+        return key.encode()
+    if is_loopback(host):
+        return local_key().encode()
+    raise ValueError(f"Clé requise pour {host or '0.0.0.0'} (hors boucle locale) : --key ou ${ENV_KEY}")
+
+
+def parse_address(text):
+    """'hôte:port' ou 'port' -> (hôte, port)."""
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+# ------------------------------------------------------------
+# Processus de travail : graphes préchargés (lecture seule), calcul des lots
+# ------------------------------------------------------------
+class RemoteThreshold:
+    """
+    Seuil θ commun aux processus de travail, relayé par le coordinateur (même interface
+    exchange() que parallel.SharedThreshold). Chaque seuil local est un minorant du seuil
+    final : le maximum connu reste un seuil de pruning valide. Les améliorations locales
+    sont envoyées au plus toutes les `every` secondes, les messages reçus lus au passage.
+    """
+
+    def __init__(self, worker, job, value=0.0, every=0.05):
+        self.worker = worker
+        self.job = job
+        self.value = value
+        self.sent = value
+        self.every = every
+        self.last = 0.0
+
+    def exchange(self, theta):
+        if theta > self.value:
+            self.value = theta
+        now = time.perf_counter()
+        if now - self.last >= self.every:
+            self.last = now
+            self.worker.poll()
+            if self.value > self.sent:
+                self.sent = self.value
+                self.worker.conn.send(("theta", self.job, self.value))
+        return self.value
+
+
+class ClusterWorker:
+    """
+    Une connexion du coordinateur. Messages reçus :
+        ("hello",)                                   -> ("hello", infos sur les graphes)
+        ("plan", graph, mode, params)                -> ("plan", unités de travail du calcul)
+        ("job", job, graph, mode, params, context)   (contexte partagé par les lots d'un calcul)
+        ("shard", job, shard, units, theta)          -> ("theta", job, θ)* puis ("result", job, shard, partiel)
+        ("theta", job, θ)                            (seuil amélioré par un autre processus)
+        ("bye",) / ("shutdown",)
+    """
+
+    def __init__(self, conn, log=print):
+        self.conn = conn
+        self.log = log
+        self.backlog = deque()
+        self.job = None          # (identifiant, graphe, mode, paramètres, contexte)
+        self.threshold = None
+
+    def poll(self):
+        """Lit les messages en attente sans bloquer : seuils appliqués, le reste mis de côté."""
+        while self.conn.poll():
+            msg = self.conn.recv()
+            if msg[0] == "theta":
+                if self.threshold is not None and msg[1] == self.threshold.job:
+                    self.threshold.value = max(self.threshold.value, msg[2])
+                    self.threshold.sent = max(self.threshold.sent, msg[2])
+            else:
+                self.backlog.append(msg)
+
+    def serve(self):
+        """Traite les messages jusqu'à la déconnexion ; rend True si l'arrêt du processus est demandé."""
+        while True:
+            try:
+                msg = self.backlog.popleft() if self.backlog else self.conn.recv()
+            except (EOFError, OSError):
+                return False
+            kind = msg[0]
+            if kind == "bye":
+                return False
+            if kind == "shutdown":
+                return True
+            if kind == "theta":
+                continue  # seuil d'un lot déjà terminé
+            try:
+                if kind == "hello":
+                    self.conn.send(("hello", worker_info()))
+                elif kind == "plan":
+                    self.conn.send(("plan", plan(*msg[1:])))
+                elif kind == "job":
+                    self.job = msg[1:]
+                elif kind == "shard":
+                    _, job, shard, units, theta = msg
+                    partial = self.run_shard(job, units, theta)
+                    self.conn.send(("result", job, shard, partial))
+                else:
+                    raise ValueError(f"message inconnu : {kind}")
+            except (EOFError, OSError):
+                return False
+            except Exception as e:
+                self.conn.send(("error", repr(e)))
+
+    def run_shard(self, job, units, theta):
+        if self.job is None or self.job[0] != job:
+            raise RuntimeError(f"lot reçu pour un calcul inconnu : {job}")
+        _, graph, mode, params, context = self.job
+        self.threshold = RemoteThreshold(self, job, theta)
+        try:
+            if mode == "classic":
+                return shard_classic(graph, units, params)
+            if mode == "efficient":
+                return shard_efficient(graph, units, params, context, self.threshold)
+            return shard_temporal(graph, units, params, self.threshold)
+        finally:
+            self.threshold = None
+
+
+def worker_info():
+    return {"pid": os.getpid(),
+            "graphs": {name: {"nodes": e["hop"].number_of_nodes(), "edges": e["hop"].number_of_edges(),
+                              "fingerprint": graph_fingerprint(e["hop"]),
+                              "weights": ["length"] if e["length"] is not None else []}
+                       for name, e in _GRAPHS.items()}}
+
+
+def serve_worker(specs, address=("127.0.0.1", DEFAULT_PORT), key=None, reorder=None, log=print, ready=None):
+    """
+    Processus de travail : charge les graphes {nom: spécification} (comme closeness_server,
+    renumérotés si reorder) puis sert les coordinateurs, un à la fois, jusqu'à ("shutdown",).
+    ready : extrémité de Pipe qui reçoit l'adresse d'écoute (port 0 : port libre choisi par le système).
+    Hors boucle locale, une clé explicite est exigée (voir authkey).
+    """
+    key = authkey(key, address[0])
+    load_graphs(specs, log=log, reorder=reorder)
+    with Listener(address, authkey=key) as listener:
+        log(f"🛠️ Processus de travail {os.getpid()} prêt sur {listener.address[0]}:{listener.address[1]}")
+        if ready is not None:
+            ready.send(listener.address)
+            ready.close()
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError) as e:
+                log(f"⚠️ Connexion refusée : {e!r}")
+                continue
+            with conn:
+                if ClusterWorker(conn, log=log).serve():
+                    return
+
+
+# ---------------- calculs exécutés par les processus de travail ----------------
+_TEMPORAL = {}   # (nom, T_max) -> TemporalGraph
+_WEIGHTED = {}   # nom -> (adjacence pondérée, majorants des sommets atteignables) : weighted_inputs
+
+
+def _temporal_graph(graph, interval):
+    key = (graph, interval[1])
+    if key not in _TEMPORAL:
+        entry = _GRAPHS[graph]
+        _TEMPORAL[key] = to_temporal_graph(entry["length"] or entry["hop"], T_max=interval[1])
+    return _TEMPORAL[key]
+
+
+def plan(graph, mode, params):
+    """
+    Unités de travail d'un calcul, préparées par un seul processus de travail :
+    - classic : nombre de sommets (sources découpées en intervalles par le coordinateur) ;
+    - efficient : prep + schedule de top_k_closeness, racines du schedule et coût estimé de leur sous-arbre ;
+    - temporal : sources triées par borne supérieure décroissante (source_upper_bound).
+    """
+    if mode == "classic":
+        return {"nodes": _graph(graph, params.get("weight")).number_of_nodes()}
+
+    if mode == "efficient":
+        from efficient_closeness.top_k_closeness import prep_csr, schedule, Start, weighted_order, _adjacency_caches
+        from efficient_closeness.parallel import subtree_costs
+        G = _graph(graph, params.get("weight"))
+        _adjacency_caches(G)
+        if params.get("weight"):
+            # mode pondéré exact : pas de Δ-PFS, racines par farness estimée croissante
+            V_hat, S, roots = None, {}, weighted_order(G)
+        else:
+            V_hat, S_hat = prep_csr(G)
+            S = schedule(G, V_hat, S_hat)
+            roots = Start(S)
+        return {"schedule": S, "roots": roots, "costs": subtree_costs(S, roots, V_hat)}
+
+    if mode == "temporal":
+        import_temporal()   # modules temporels importés « à plat »
+        from topk_temporal_closeness import source_upper_bound
+        G = _temporal_graph(graph, params["interval"])
+        lambda_min = min((e.l for edges in G.adj.values() for e in edges), default=1.0)
+        bounds = {u: source_upper_bound(G, u, params["interval"], lambda_min) for u in G.V}
+        return {"sources": sorted(bounds.items(), key=lambda x: -x[1])}
+
+    raise ValueError(f"mode inconnu : {mode}")
+
+
+def shard_classic(graph, units, params):
+    """Sources [lo, hi) : nombre de sommets atteints et farness (somme des distances) de chacune."""
+    weight = params.get("weight")
+    G = _graph(graph, weight)
+    lo, hi = units
+    dist = working_array(G.number_of_nodes(), np.int32 if weight is None else np.float64, -1)
+    search = bfs_levels if weight is None else dijkstra_array
+    reach = np.empty(hi - lo, dtype=np.int64)
+    farness = np.empty(hi - lo, dtype=np.float64)
+    for i, v in enumerate(range(lo, hi)):
+        reach[i], farness[i] = search(G, v, dist)
+    return {"ids": G.original_ids(range(lo, hi)), "reach": reach, "farness": farness}
+
+
+def shard_efficient(graph, roots, params, S, threshold):
+    """
+    Sous-arbres du schedule (PFS de la racine puis Δ-PFS des dépendants) : top-k local.
+    En mode pondéré, chaque racine est évaluée par un Dijkstra borné (weighted_root).
+    """
+    from efficient_closeness.top_k_closeness import PFS, process, weighted_inputs, weighted_root, _adjacency_caches
+    G = _graph(graph, params.get("weight"))
+    _adjacency_caches(G)
+    k, V = params["k"], G.number_of_nodes()
+    A = {}
+    for v in roots:
+        if params.get("weight"):
+            if graph not in _WEIGHTED:
+                _WEIGHTED[graph] = weighted_inputs(G)
+            adj, reach = _WEIGHTED[graph]
+            weighted_root(adj, v, A, k, V, reach[v], shared=threshold, directed=G.is_directed())
+            continue
+        L, s, delta_p = PFS(G, v, G._neighbors_cache)
+        process(G, v, L, s, A, S, k, V, delta_p, set(), neighbors_cache=G._neighbors_cache,
+                weights_cache=G._weights_cache, shared=threshold)
+    return {"topk": list(zip(G.original_ids(A.keys()), A.values())), "theta": threshold.value}
+
+
+def shard_temporal(graph, sources, params, threshold):
+    """
+    Sources (u, borne) par borne décroissante : closeness temporelle avec pruning au seuil
+    max(top-k local, seuil commun). Le lot s'arrête dès que ce seuil atteint la borne suivante.
+    """
+    import_temporal()
+    from topk_temporal_closeness import _source_closeness
+    interval, k = params["interval"], params["k"]
+    G = _temporal_graph(graph, interval)
+    lambda_min = min((e.l for edges in G.adj.values() for e in edges), default=1.0)
+    topk, skipped = [], 0
+    for i, (u, bound) in enumerate(sources):
+        B_k = threshold.exchange(topk[0][0] if len(topk) == k else 0.0)
+        if B_k > 0 and B_k >= bound:
+            skipped = len(sources) - i
+            break
+        c_u = _source_closeness(G, u, interval, B_k, 0.0, lambda_min)
+        heapq.heappush(topk, (c_u, u))
+        if len(topk) > k:
+            heapq.heappop(topk)
+    threshold.exchange(topk[0][0] if len(topk) == k else 0.0)
+    return {"topk": [(u, c) for c, u in topk], "skipped": skipped, "theta": threshold.value}
+
+
+# ------------------------------------------------------------
+# Coordinateur
+# ------------------------------------------------------------
+class Coordinator:
+    """
+    Répartit un calcul de closeness entre des processus de travail distants (TCP,
+    multiprocessing.connection) qui détiennent chacun une copie du graphe :
+
+    - classic : sources découpées en intervalles ; les lots rendent reach / farness ;
+    - efficient : racines du schedule (calculé par un processus de travail) réparties en lots
+      équilibrés par coût estimé, comme efficient_closeness/parallel.py ; top-k locaux fusionnés ;
+    - temporal : sources par borne décroissante, en lots contigus ; top-k locaux fusionnés, et
+      les lots restants sont abandonnés dès que le seuil dépasse leur meilleure borne.
+
+    Le seuil θ (k-ième meilleure valeur connue) est relayé : toute amélioration envoyée par un
+    processus est retransmise aux autres, qui élaguent aussitôt avec. Un processus qui se
+    déconnecte (ou dépasse shard_timeout) est écarté et ses lots sont redistribués.
+
+        with Coordinator(["node1:8790", "node2:8790"]) as cluster:
+            top = cluster.run("france", "efficient", k=10)["topk"]
+    """
+
+    def __init__(self, addresses, key=None, shard_timeout=None, connect_timeout=30, log=print):
+        self.addresses = [parse_address(a) if isinstance(a, str) else tuple(a) for a in addresses]
+        self.keys = {address: authkey(key, address[0]) for address in self.addresses}
+        self.shard_timeout = shard_timeout
+        self.connect_timeout = connect_timeout
+        self.log = log
+        self.workers = {}   # connexion -> {"address", "info"}
+        self.jobs = 0
+
+    # ---------------- connexions ----------------
+    def connect(self):
+        deadline = time.perf_counter() + self.connect_timeout
+        for address in self.addresses:
+            while True:
+                try:
+                    conn = Client(address, authkey=self.keys[address])
+                    break
+                except multiprocessing.AuthenticationError:
+                    self.log(f"⚠️ Clé refusée par {address[0]}:{address[1]}")
+                    conn = None
+                    break
+                except (ConnectionRefusedError, FileNotFoundError):
+                    if time.perf_counter() > deadline:
+                        self.log(f"⚠️ Processus de travail injoignable : {address[0]}:{address[1]}")
+                        conn = None
+                        break
+                    time.sleep(0.2)
+            if conn is None:
+                continue
+            conn.send(("hello",))
+            self.workers[conn] = {"address": address, "info": conn.recv()[1]}
+        if not self.workers:
+            raise RuntimeError("Aucun processus de travail joignable")
+        return self
+
+    def close(self, shutdown=False):
+        for conn in list(self.workers):
+            try:
+                conn.send(("shutdown",) if shutdown else ("bye",))
+                conn.close()
+            except OSError:
+                pass
+        self.workers.clear()
+
+    def __enter__(self):
+        return self.connect() if not self.workers else self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _check_graph(self, graph):
+        prints = {w["info"]["graphs"].get(graph, {}).get("fingerprint") for w in self.workers.values()}
+        if None in prints:
+            raise KeyError(f"graphe inconnu d'au moins un processus de travail : {graph}")
+        if len(prints) > 1:
+            raise ValueError(f"copies différentes du graphe {graph} selon les processus de travail")
+        return next(iter(self.workers.values()))["info"]["graphs"][graph]
+
+    def _lost(self, conn, reason):
+        info = self.workers.pop(conn, None)
+        try:
+            conn.close()
+        except OSError:
+            pass
+        if info is not None:
+            self.log(f"💀 Processus de travail perdu ({info['address'][0]}:{info['address'][1]}) : {reason}")
+
+    def _request(self, msg):
+        """Envoie msg au premier processus disponible et rend sa réponse (essaie les suivants en cas de panne)."""
+        for conn in list(self.workers):
+            try:
+                conn.send(msg)
+                reply = conn.recv()
+            except (EOFError, OSError) as e:
+                self._lost(conn, repr(e))
+                continue
+            if reply[0] == "error":
+                raise RuntimeError(f"erreur d'un processus de travail : {reply[1]}")
+            return reply[1]
+        raise RuntimeError("Aucun processus de travail disponible")
+
+    # ---------------- calcul ----------------
+    def run(self, graph, mode, k=10, interval=(0, 100), weight=None, shards_per_worker=4):
+        """
+        Exécute un calcul réparti et rend un dictionnaire :
+        {"mode", "graph", "topk" [(sommet, valeur)] (+ "closeness" {sommet: valeur} en mode classic),
+         "shards", "reassigned", "threshold_updates", "skipped_shards", "workers", "seconds"}.
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode inconnu : {mode} (choix : {', '.join(MODES)})")
+        t0 = time.perf_counter()
+        info = self._check_graph(graph)
+        self.jobs += 1
+        job = f"{os.getpid()}-{self.jobs}"
+        params = {"k": k, "interval": tuple(interval), "weight": weight}
+        planned = self._request(("plan", graph, mode, params))
+        bins = max(1, len(self.workers) * shards_per_worker)
+
+        context, bounds = None, None
+        if mode == "classic":
+            n = planned["nodes"]
+            cuts = np.linspace(0, n, min(n, bins * 4) + 1).astype(int)
+            shards = [(int(a), int(b)) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+        elif mode == "efficient":
+            from efficient_closeness.parallel import balance
+            context = planned["schedule"]
+            shards = balance(planned["roots"], planned["costs"], bins)
+        else:
+            sources = planned["sources"]
+            size = max(1, -(-len(sources) // (bins * 4)))
+            shards = [sources[i:i + size] for i in range(0, len(sources), size)]
+            bounds = [shard[0][1] for shard in shards]
+
+        state = _JobState(mode, k, info["nodes"])
+        self._dispatch(job, graph, mode, params, context, shards, bounds, state)
+        result = state.result()
+        result.update(mode=mode, graph=graph, workers=len(self.workers), seconds=time.perf_counter() - t0)
+        return result
+
+    def _dispatch(self, job, graph, mode, params, context, shards, bounds, state):
+        pending = deque(range(len(shards)))
+        inflight = {}        # connexion -> (lot, début)
+        ready = set()        # processus qui ont reçu le contexte du calcul
+        state.shards = len(shards)
+        while pending or inflight:
+            # lots temporels : inutile de lancer ceux dont la meilleure borne est sous le seuil
+            if bounds is not None and state.full():
+                while pending and state.theta >= bounds[pending[0]]:
+                    pending.popleft()
+                    state.skipped_shards += 1
+            for conn in [c for c in self.workers if c not in inflight]:
+                if not pending:
+                    break
+                shard = pending.popleft()
+                try:
+                    if conn not in ready:
+                        conn.send(("job", job, graph, mode, params, context))
+                        ready.add(conn)
+                    conn.send(("shard", job, shard, shards[shard], state.theta))
+                    inflight[conn] = (shard, time.perf_counter())
+                except OSError as e:
+                    pending.appendleft(shard)
+                    self._lost(conn, repr(e))
+            if not inflight:
+                if pending and not self.workers:
+                    raise RuntimeError("Tous les processus de travail sont perdus")
+                continue
+
+            for conn in wait(list(inflight), timeout=0.5):
+                try:
+                    msg = conn.recv()
+                except (EOFError, OSError) as e:
+                    msg = ("lost", repr(e))
+                if msg[0] == "theta":
+                    if msg[1] == job and msg[2] > state.theta:
+                        state.theta = msg[2]
+                        state.threshold_updates += 1
+                        self._broadcast(("theta", job, msg[2]), exclude=conn)
+                elif msg[0] == "result" and msg[1] == job:
+                    shard, _ = inflight.pop(conn)
+                    if msg[2] == shard:
+                        state.merge(msg[3])
+                elif msg[0] == "error":
+                    raise RuntimeError(f"erreur d'un processus de travail : {msg[1]}")
+                elif msg[0] == "lost":
+                    shard, _ = inflight.pop(conn)
+                    pending.appendleft(shard)
+                    state.reassigned += 1
+                    self._lost(conn, msg[1])
+
+            if self.shard_timeout is not None:
+                now = time.perf_counter()
+                for conn, (shard, started) in list(inflight.items()):
+                    if now - started > self.shard_timeout:
+                        del inflight[conn]
+                        pending.appendleft(shard)
+                        state.reassigned += 1
+                        self._lost(conn, f"lot {shard} sans réponse après {self.shard_timeout:.0f}s")
+            if (pending or inflight) and not self.workers:
+                raise RuntimeError("Tous les processus de travail sont perdus")
+
+    def _broadcast(self, msg, exclude=None):
+        for conn in list(self.workers):
+            if conn is exclude:
+                continue
+            try:
+                conn.send(msg)
+            except OSError as e:
+                self._lost(conn, repr(e))
+
+
+class _JobState:
+    """Résultats partiels d'un calcul réparti (fusion au fil des lots)."""
+
+    def __init__(self, mode, k, nodes):
+        self.mode = mode
+        self.k = k
+        self.nodes = nodes
+        self.theta = 0.0
+        self.closeness = {}
+        self.candidates = {}   # sommet -> meilleure valeur rendue
+        self.shards = self.reassigned = self.threshold_updates = self.skipped_shards = 0
+
+    def merge(self, partial):
+        if self.mode == "classic":
+            n = self.nodes
+            for v, r, S in zip(partial["ids"], partial["reach"].tolist(), partial["farness"].tolist()):
+                self.closeness[v] = ((r - 1) ** 2) / ((n - 1) * S) if S > 0 and r > 1 else 0.0
+            return
+        for v, c in partial["topk"]:
+            if c > self.candidates.get(v, -1.0):
+                self.candidates[v] = c
+        self.theta = max(self.theta, partial.get("theta", 0.0))
+
+    def full(self):
+        return len(self.candidates) >= self.k
+
+    def result(self):
+        scores = self.closeness if self.mode == "classic" else self.candidates
+        top = heapq.nlargest(self.k, scores.items(), key=lambda x: (x[1], str(x[0])))
+        out = {"topk": top, "shards": self.shards, "reassigned": self.reassigned,
+               "threshold_updates": self.threshold_updates, "skipped_shards": self.skipped_shards}
+        if self.mode == "classic":
+            out["closeness"] = self.closeness
+        return out
+
+
+# ------------------------------------------------------------
+# Grappe locale (plusieurs processus de travail sur la même machine)
+# ------------------------------------------------------------
+def _local_worker(specs, key, reorder, ready):
+    serve_worker(specs, ("127.0.0.1", 0), key=key, reorder=reorder, log=lambda *_: None, ready=ready)
+
+
+def start_local_workers(specs, count, key=None, reorder=None):
+    """
+    Lance `count` processus de travail sur 127.0.0.1 (ports libres). Chacun charge ses graphes
+    (ceux déjà chargés dans le processus courant sont hérités par fork, en lecture seule).
+    Retourne (processus, adresses) ; à arrêter avec stop_local_workers.
+    Le coordinateur utilise la même clé (sans clé : celle de KEY_FILE, voir authkey).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    processes, pipes = [], []
+    for _ in range(count):
+        parent, child = ctx.Pipe(duplex=False)
+        p = ctx.Process(target=_local_worker, args=(specs, key, reorder, child), daemon=True)
+        p.start()
+        child.close()
+        processes.append(p)
+        pipes.append(parent)
+    return processes, [pipe.recv() for pipe in pipes]
+
+
+def stop_local_workers(processes):
+    for p in processes:
+        if p.is_alive():
+            p.terminate()
+        p.join()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Closeness répartie : coordinateur et processus de travail (TCP).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("--key", help=f"clé partagée des connexions (défaut : ${ENV_KEY}, obligatoire hors "
+                                     f"boucle locale ; en boucle locale, à défaut, clé aléatoire de {KEY_FILE})")
+
+    def graphs(p):
+        p.add_argument("--graph", action="append", default=[], metavar="NOM=SPEC",
+                       help="graphe à précharger, ex: lyon=graphml:Lyon (répétable)")
+        p.add_argument("--reorder", choices=ORDERINGS, help="renumérote les sommets au chargement")
+
+    def job(p):
+        p.add_argument("--mode", choices=MODES, default="efficient")
+        p.add_argument("--k", type=int, default=10)
+        p.add_argument("--start", type=int, default=0, help="début de l'intervalle (mode temporal)")
+        p.add_argument("--end", type=int, default=100, help="fin de l'intervalle (mode temporal)")
+        p.add_argument("--weight", choices=["length"], help="closeness en distance (classic / efficient)")
+        p.add_argument("--shard-timeout", type=float, help="délai (s) au-delà duquel un lot est redistribué")
+
+    worker = sub.add_parser("worker", help="processus de travail (un par machine ou par cœur)")
+    common(worker)
+    graphs(worker)
+    worker.add_argument("--host", default="127.0.0.1",
+                        help="adresse d'écoute (0.0.0.0 pour les autres machines : clé obligatoire)")
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    coordinator = sub.add_parser("coordinator", help="répartit un calcul entre des processus de travail lancés")
+    common(coordinator)
+    coordinator.add_argument("--connect", nargs="+", required=True, metavar="HÔTE:PORT")
+    coordinator.add_argument("--name", required=True, help="nom du graphe chez les processus de travail")
+    job(coordinator)
+
+    local = sub.add_parser("local", help="grappe de test : processus de travail locaux + coordinateur")
+    common(local)
+    graphs(local)
+    local.add_argument("--workers", type=int, default=2)
+    job(local)
+    return parser.parse_args(argv)
+
+
+def _report(result):
+    print(f"✅ {result['mode']} sur {result['graph']} : {result['shards']} lots, {result['workers']} processus, "
+          f"{result['reassigned']} redistribués, {result['threshold_updates']} seuils relayés, "
+          f"{result['skipped_shards']} lots évités, {result['seconds']:.2f}s")
+    for rank, (v, c) in enumerate(result["topk"], 1):
+        print(f"   {rank:>2}. {v}  {c:.6f}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "worker":
+        specs = dict(item.split("=", 1) for item in args.graph)
+        if not specs:
+            raise SystemExit("Aucun graphe : utiliser --graph NOM=SPEC")
+        try:
+            serve_worker(specs, (args.host, args.port), key=args.key, reorder=args.reorder)
+        except KeyboardInterrupt:
+            pass
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+        raise SystemExit(0)
+
+    run_args = dict(mode=args.mode, k=args.k, interval=(args.start, args.end), weight=args.weight)
+    if args.command == "coordinator":
+        try:
+            cluster = Coordinator(args.connect, key=args.key, shard_timeout=args.shard_timeout)
+        except ValueError as e:
+            raise SystemExit(f"❌ {e}")
+        with cluster:
+            _report(cluster.run(args.name, **run_args))
+        raise SystemExit(0)
+
+    specs = dict(item.split("=", 1) for item in args.graph)
+    if len(specs) != 1:
+        raise SystemExit("Mode local : un seul graphe, --graph NOM=SPEC")
+    # grappe locale : clé tirée au hasard si aucune n'est fournie
+    key = args.key or os.environ.get(ENV_KEY) or secrets.token_hex(16)
+    processes, addresses = start_local_workers(specs, args.workers, key=key, reorder=args.reorder)
+    try:
+        with Coordinator(addresses, key=key, shard_timeout=args.shard_timeout) as cluster:
+            _report(cluster.run(next(iter(specs)), **run_args))
+    finally:
+        stop_local_workers(processes)
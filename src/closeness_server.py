@@ -0,0 +1,375 @@
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import http.client
+import multiprocessing
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.datasets import load_dataset, to_temporal_graph, import_temporal
+from utils.csr_graph import CSRGraph, from_networkx, working_array, bfs_levels, dijkstra_array
+from utils.reorder import ORDERINGS, reorder as renumber
+
+DEFAULT_PORT = 8765
+
+# ------------------------------------------------------------
+# Graphes chargés (processus serveur et processus de travail)
+# ------------------------------------------------------------
+# nom -> {"spec", "hop": CSRGraph (arêtes de poids 1), "length": CSRGraph pondéré par "length" ou None}
+_GRAPHS = {}
+_TEMPORAL = {}   # (nom, T_max) -> TemporalGraph
+_INDEX = {}      # nom -> {str(identifiant d'origine): indice}
+
+
+def load_graphs(specs, log=print, reorder=None):
+    """
+    Charge les graphes {nom: spécification de load_dataset} sous forme CSR, renumérotés
+    pour la localité mémoire si reorder est donné (utils/reorder.py ; les réponses restent
+    en identifiants d'origine).
+    """
+    for name, spec in specs.items():
+        if name in _GRAPHS:
+            continue
+        t0 = time.perf_counter()
+        G = load_dataset(spec)
+        entry = {"spec": spec, "length": None}
+        if isinstance(G, CSRGraph):
+            entry["hop"] = G
+        else:
+            entry["hop"] = from_networkx(G, weight=None)
+            if any("length" in data for _, _, data in G.edges(data=True)):
+                entry["length"] = from_networkx(G, weight="length")
+        if reorder:
+            entry["hop"] = renumber(entry["hop"], reorder)
+            if entry["length"] is not None:
+                entry["length"] = renumber(entry["length"], reorder)
+        _GRAPHS[name] = entry
+        log(f"📦 {name} ({spec}) : {entry['hop']} en {time.perf_counter() - t0:.1f}s")
+
+
+def _graph(name, weight=None):
+    try:
+        entry = _GRAPHS[name]
+    except KeyError:
+        raise KeyError(f"graphe inconnu : {name}") from None
+    if weight is None:
+        return entry["hop"]
+    if weight != "length" or entry["length"] is None:
+        raise ValueError(f"poids indisponible pour {name} : {weight}")
+    return entry["length"]
+
+
+def _ids(name, G, indices):
+    return [str(v) for v in G.original_ids(indices)]
+
+
+# ------------------------------------------------------------
+# Requêtes (exécutées dans les processus de travail)
+# ------------------------------------------------------------
+def run_topk(name, k, engine="efficient", weight=None):
+    """Top-k statique : moteur efficient (éventuellement pondéré), classique ou exact certifié."""
+    G = _graph(name, weight)
+    if engine == "efficient":
+        from efficient_closeness.top_k_closeness import top_k_closeness
+        scores = top_k_closeness(G, k, weight=weight)
+    elif engine == "classic":
+        if weight is not None:
+            raise ValueError("le moteur classique ne calcule que la closeness en nombre d'arêtes")
+        from classic_closeness.classic_closeness import closeness_centrality_all_nodes
+        scores = closeness_centrality_all_nodes(G)
+    elif engine == "exact":
+        if weight is not None:
+            raise ValueError("le moteur exact ne calcule que la closeness en nombre d'arêtes")
+        from efficient_closeness.anytime import closeness_query
+        scores = dict(closeness_query(G).top_k(k)["topk"])
+    else:
+        raise ValueError(f"moteur inconnu : {engine}")
+    best = sorted(scores.items(), key=lambda x: (-x[1], str(x[0])))[:k]
+    return [[str(v), c] for v, c in best]
+
+
+def run_closeness(name, nodes, weight=None):
+    """Closeness de quelques sommets (un BFS ou un Dijkstra par sommet demandé)."""
+    G = _graph(name, weight)
+    key = (name, weight)
+    if key not in _INDEX:
+        _INDEX[key] = {v: i for i, v in enumerate(_ids(name, G, range(G.number_of_nodes())))}
+    index = _INDEX[key]
+    n = G.number_of_nodes()
+    dist = working_array(n, np.int32 if weight is None else np.float64, -1)
+    out = {}
+    for node in nodes:
+        if node not in index:
+            raise KeyError(f"sommet inconnu dans {name} : {node}")
+        r, S = (bfs_levels if weight is None else dijkstra_array)(G, index[node], dist)
+        out[node] = ((r - 1) ** 2) / ((n - 1) * S) if S > 0 and r > 1 else 0.0
+    return out
+
+
+def run_region(name, k, bbox):
+    """Top-k des sommets d'un rectangle (x/y des sommets), distances sur la ville entière."""
+    G = _graph(name)
+    from efficient_closeness.region import top_k_closeness_in_region
+    snap = top_k_closeness_in_region(G, k, bbox=bbox)
+    return [[str(v), c] for v, c in snap["topk"]]
+
+
+def run_temporal(name, k, interval):
+    """Top-k temporel sur le graphe temporel dérivé du graphe (datasets.to_temporal_graph)."""
+    G = _graph(name)
+    key = (name, interval[1])
+    if key not in _TEMPORAL:
+        entry = _GRAPHS[name]
+        _TEMPORAL[key] = to_temporal_graph(entry["length"] or G, T_max=interval[1])
+    _, topk_temporal_closeness = import_temporal()
+    res = topk_temporal_closeness(_TEMPORAL[key], k=k, interval=interval)
+    return [[str(u), c] for c, u in res]
+
+
+def _init_worker(specs, reorder=None):
+    # fork : les graphes du serveur sont déjà là ; sinon (spawn) chaque processus les recharge
+    load_graphs(specs, log=lambda *_: None, reorder=reorder)
+
+
+def _ping(_=None):
+    return os.getpid()
+
+
+# ------------------------------------------------------------
+# Serveur
+# ------------------------------------------------------------
+class ClosenessServer:
+    """
+    Service local de requêtes de closeness (HTTP sur TCP ou socket Unix, réponses JSON).
+
+    - les graphes sont chargés une fois, en CSR, puis partagés par fork avec les processus
+      de travail ; les calculs tournent dans le pool sans bloquer la boucle asyncio
+    - les requêtes identiques simultanées sont fusionnées (un seul calcul, même réponse)
+    - les résultats récents sont gardés en mémoire (les graphes ne changent pas)
+
+    Routes :
+        GET /graphs
+        GET /topk?graph=dijon&k=10[&engine=efficient|classic|exact][&weight=length]
+        GET /closeness?graph=dijon&node=123&node=456[&weight=length]
+        GET /region?graph=dijon&k=10&bbox=xmin,ymin,xmax,ymax
+        GET /temporal?graph=dijon&k=5[&start=0&end=100]
+    """
+
+    def __init__(self, specs, workers=None, memo_size=256, log=print, reorder=None):
+        self.specs = dict(specs)
+        self.reorder = reorder
+        self.workers = workers or os.cpu_count() or 1
+        self.memo_size = memo_size
+        self.log = log
+        self.inflight = {}
+        self.memo = OrderedDict()
+        self.pool = None
+        self.server = None
+        self.counters = {"requests": 0, "computed": 0, "coalesced": 0, "memo": 0}
+
+    def start_pool(self):
+        load_graphs(self.specs, log=self.log, reorder=self.reorder)
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=ctx,
+                                        initializer=_init_worker, initargs=(self.specs, self.reorder))
+        # démarre les processus avant la boucle asyncio (fork sans thread en cours)
+        list(self.pool.map(_ping, range(self.workers)))
+
+    async def call(self, key, func, *args):
+        """Exécute func(*args) dans le pool ; les appels de même clé en cours partagent le résultat."""
+        if key in self.memo:
+            self.memo.move_to_end(key)
+            self.counters["memo"] += 1
+            return self.memo[key]
+        future = self.inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, func, *args)
+        self.inflight[key] = future
+        self.counters["computed"] += 1
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            self.inflight.pop(key, None)
+        self.memo[key] = result
+        while len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+        return result
+
+    # ---------------- routes ----------------
+    async def route(self, path, params):
+        def one(name, default=None, cast=str):
+            values = params.get(name)
+            if not values:
+                if default is None:
+                    raise ValueError(f"paramètre manquant : {name}")
+                return default
+            try:
+                return cast(values[0])
+            except ValueError:
+                raise ValueError(f"paramètre invalide : {name}={values[0]}") from None
+
+        def top_count():
+            k = one("k", cast=int)
+            if k < 1:
+                raise ValueError(f"k doit être un entier ≥ 1 (reçu : {k})")
+            return k
+
+        if path == "/graphs":
+            return {name: {"spec": e["spec"], "nodes": e["hop"].number_of_nodes(),
+                           "edges": e["hop"].number_of_edges(), "directed": e["hop"].is_directed(),
+                           "weights": ["length"] if e["length"] is not None else []}
+                    for name, e in _GRAPHS.items()}
+        if path == "/stats":
+            return dict(self.counters, inflight=len(self.inflight), memo_size=len(self.memo))
+
+        graph = one("graph")
+        _graph(graph)
+        weight = params.get("weight", [None])[0]
+        if path == "/topk":
+            k, engine = top_count(), one("engine", "efficient")
+            topk = await self.call(("topk", graph, k, engine, weight), run_topk, graph, k, engine, weight)
+            return {"graph": graph, "k": k, "engine": engine, "weight": weight, "topk": topk}
+        if path == "/closeness":
+            nodes = [v for value in params.get("node", []) for v in value.split(",") if v]
+            if not nodes:
+                raise ValueError("paramètre manquant : node")
+            values = await self.call(("closeness", graph, tuple(nodes), weight), run_closeness, graph, nodes, weight)
+            return {"graph": graph, "weight": weight, "closeness": values}
+        if path == "/region":
+            k = top_count()
+            bbox = tuple(float(v) for v in one("bbox").split(","))
+            if len(bbox) != 4:
+                raise ValueError("bbox attendu : xmin,ymin,xmax,ymax")
+            topk = await self.call(("region", graph, k, bbox), run_region, graph, k, bbox)
+            return {"graph": graph, "k": k, "bbox": list(bbox), "topk": topk}
+        if path == "/temporal":
+            k = top_count()
+            interval = (one("start", 0, int), one("end", 100, int))
+            topk = await self.call(("temporal", graph, k, interval), run_temporal, graph, k, interval)
+            return {"graph": graph, "k": k, "interval": list(interval), "topk": topk}
+        raise LookupError(path)
+
+    async def handle(self, reader, writer):
+        status, payload = 200, None
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # en-têtes ignorés (requêtes GET sans corps)
+            method, target = request_line.split(" ")[:2]
+            self.counters["requests"] += 1
+            if method != "GET":
+                status, payload = 405, {"error": f"méthode non gérée : {method}"}
+            else:
+                url = urlsplit(target)
+                t0 = time.perf_counter()
+                payload = await self.route(url.path, parse_qs(url.query))
+                payload["seconds"] = time.perf_counter() - t0
+        except LookupError as e:
+            status, payload = 404, {"error": str(e.args[0]) if e.args else "introuvable"}
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": repr(e)}
+
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}.get(status, "Error")
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, unix=None, ready=None):
+        if unix:
+            self.server = await asyncio.start_unix_server(self.handle, path=unix)
+            where = unix
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+            where = "http://%s:%d" % self.server.sockets[0].getsockname()[:2]
+        self.log(f"🚀 Serveur de closeness prêt sur {where} ({self.workers} processus)")
+        if ready is not None:
+            ready(self.server)
+        # arrêt propre sur SIGTERM (service lancé en arrière-plan ou par un gestionnaire)
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.server.close)
+        except (NotImplementedError, RuntimeError):
+            pass
+        async with self.server:
+            try:
+                await self.server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+
+# ------------------------------------------------------------
+# Client minimal (tests locaux, scripts)
+# ------------------------------------------------------------
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def query(path, host="127.0.0.1", port=DEFAULT_PORT, unix=None, timeout=None):
+    """Envoie GET <path> au serveur et rend (statut, réponse JSON)."""
+    conn = _UnixHTTPConnection(unix, timeout) if unix else http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Service local de requêtes de closeness (graphes préchargés).")
+    parser.add_argument("--graph", action="append", default=[], metavar="NOM=SPEC",
+                        help="graphe à précharger, ex: dijon=graphml:Dijon, wiki=wiki-vote, "
+                             "grille=synthetic:grid:10000 (répétable)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="CHEMIN", help="écoute sur un socket Unix au lieu de TCP")
+    parser.add_argument("--workers", type=int, default=None, help="processus de calcul (défaut : nombre de cœurs)")
+    parser.add_argument("--reorder", choices=ORDERINGS,
+                        help="renumérote les sommets au chargement (localité mémoire des parcours)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    specs = dict(item.split("=", 1) for item in args.graph)
+    if not specs:
+        raise SystemExit("Aucun graphe : utiliser --graph NOM=SPEC")
+    server = ClosenessServer(specs, workers=args.workers, reorder=args.reorder)
+    server.start_pool()
+    try:
+        asyncio.run(server.serve(args.host, args.port, unix=args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+        print("\n👋 Arrêt du serveur")
@@ -1,6 +1,5 @@
 import time
-import networkx as nx
-import matplotlib.pyplot as plt
+from utils.edgelist import read_snap_edgelist
 from classic_closeness.classic_closeness import closeness_centrality_all_nodes
 from efficient_closeness import top_k_closeness
 import os
@@ -10,8 +9,9 @@ def compare_top5():
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     path = os.path.join(BASE_DIR, "..", "data", "Wiki-Vote.txt")
     print(f"📂 Chargement du graphe : {path}")
-    G = nx.read_edgelist(path, create_using=nx.DiGraph(), nodetype=int)
-    print(f"✅ Graphe chargé : {len(G.nodes())} sommets, {len(G.edges())} arêtes")
+    # Lecture directe en CSR (pas de graphe networkx intermédiaire)
+    G = read_snap_edgelist(path, directed=True)
+    print(f"✅ Graphe chargé : {G.number_of_nodes()} sommets, {G.number_of_edges()} arêtes")
 
     # --- Classic closeness ---
     start_classic = time.perf_counter()
@@ -43,7 +43,9 @@ def compare_top5():
 # --- Exécution principale ---
 overlap, classic_time, opt_time = compare_top5()
 
-# --- Génération du graphique ---
+# --- Génération du graphique (matplotlib chargé seulement ici) ---
+import matplotlib.pyplot as plt
+
 plt.figure(figsize=(6,5))
 plt.bar(["Classic", "Optimized"], [classic_time, opt_time], color=['skyblue', 'orange'])
 plt.ylabel("Temps d'exécution (secondes)")
@@ -7,12 +7,14 @@ class Sketch:
         self.m = m
         self.registers = [0] * m
 
-    def _hash(self, value):
+    @staticmethod
+    def _hash(value):
         """Retourne un hash 128 bits sous forme d'entier."""
         h = hashlib.md5(str(value).encode()).hexdigest()
         return int(h, 16)
     
-    def _rho(self, x):
+    @staticmethod
+    def _rho(x):
         """Nombre de zéros consécutifs à droite (avant le premier 1)."""
         r = 1
         while x & 1 == 0 and r < 128:
@@ -42,3 +44,46 @@ class Sketch:
         copy = Sketch()
         copy.registers = self.registers.copy()
         return copy
+
+
+class SketchArray:
+    """
+    Ensemble de n sketches stockés dans une matrice (n, m) de registres uint8.
+    Même hachage et même estimateur que Sketch, mais les registres peuvent être
+    projetés sur disque (np.memmap via work_dir) pour les graphes hors mémoire.
+    """
+
+    def __init__(self, n, m=64, work_dir=None):
+        import numpy as np
+        from utils.csr_graph import working_array
+
+        self.m = m
+        self.registers = working_array((n, m), np.uint8, 0, work_dir)
+        self._shift = int(math.log2(m))
+        self._alpha = 0.7213 / (1 + 1.079 / m)
+
+    def add(self, row, value):
+        h = Sketch._hash(value)
+        i = h % self.m
+        r = Sketch._rho(h >> self._shift)
+        if r > self.registers[row, i]:
+            self.registers[row, i] = r
+
+    def count_registers(self, regs):
+        """Estimation de cardinalité pour un vecteur de registres quelconque."""
+        import numpy as np
+        Z = float(np.exp2(-regs.astype(np.float64)).sum())
+        return self._alpha * self.m * self.m / Z
+
+    def counts(self, chunk=65536):
+        """Estimations de toutes les lignes (calcul par blocs pour rester borné en mémoire)."""
+        import numpy as np
+        n = self.registers.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for lo in range(0, n, chunk):
+            Z = np.exp2(-self.registers[lo:lo + chunk].astype(np.float64)).sum(axis=1)
+            out[lo:lo + chunk] = self._alpha * self.m * self.m / Z
+        return out
+
+    def __len__(self):
+        return self.registers.shape[0]
@@ -0,0 +1,242 @@
+import heapq
+import time
+from collections import OrderedDict
+import numpy as np
+from utils.csr_graph import CSRGraph, from_networkx, working_array, bfs_levels
+from utils.anytime import snapshot, run_anytime
+from utils.result_cache import graph_fingerprint
+
+
+def _components(G):
+    """
+    Taille de la composante (faiblement) connexe de chaque sommet : propagation du plus
+    petit label le long des arcs dans les deux sens, accélérée par sauts de pointeurs.
+    """
+    n = G.number_of_nodes()
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(G.offsets)))
+    dst = np.asarray(G.targets, dtype=np.int64)
+    labels = np.arange(n, dtype=np.int64)
+    while True:
+        new = labels.copy()
+        np.minimum.at(new, src, labels[dst])
+        np.minimum.at(new, dst, labels[src])
+        new = new[new]
+        if np.array_equal(new, labels):
+            break
+        labels = new
+    return np.bincount(labels, minlength=n)[labels]
+
+
+def _degree_bounds(G, R):
+    """
+    Borne inférieure de la somme des distances S_v par le degré sortant d (hors boucles) :
+    d sommets à distance 1, tous les autres à distance >= 2 (S_v >= d + 2(r_v - 1 - d)).
+    """
+    n = G.number_of_nodes()
+    counts = np.diff(np.asarray(G.offsets)).astype(np.int64)
+    src = np.repeat(np.arange(n, dtype=np.int64), counts)
+    loops = np.bincount(src[src == np.asarray(G.targets)], minlength=n)
+    d = np.minimum(counts - loops, R - 1)
+    x = R - 1
+    return (d + 2 * (x - d)).astype(np.float64), d
+
+
+def _triangle_bounds(dist, members):
+    """
+    Après un BFS depuis s (graphe non orienté), pour v de la composante à distance x de s :
+    d(v, u) >= |d_s(u) - x| et d(v, u) >= 1 pour u != v, d'où
+        S_v >= Σ_l cnt[l]·|l - x| + cnt[x] - 1
+    calculé pour tous les niveaux x à la fois par sommes cumulées.
+    """
+    levels = dist[members].astype(np.int64)
+    cnt = np.bincount(levels).astype(np.float64)
+    lv = np.arange(len(cnt), dtype=np.float64)
+    C = np.cumsum(cnt)
+    W = np.cumsum(cnt * lv)
+    below = lv * C - W
+    above = (W[-1] - W) - lv * (C[-1] - C)
+    g = below + above + cnt - 1
+    return g[levels]
+
+
+class ClosenessQuery:
+    """
+    Requêtes top-k répétées sur un même graphe : les centralités exactes déjà calculées,
+    les bornes et la file des sommets restants sont conservées d'une requête à l'autre.
+    Une requête pour k' <= K (K : plus grand k déjà servi) est certifiée sans nouveau BFS ;
+    un k plus grand reprend la recherche là où elle s'était arrêtée.
+
+        q = closeness_query(G)
+        q.top_k(5)["topk"]; q.top_k(10)["topk"]; q.top_k(50)["topk"]
+
+    Les sommets sont traités par borne supérieure décroissante, avec un BFS exact (même
+    centralité que classic_closeness). Bornes utilisées :
+    - degré sortant et taille de la composante (tous les graphes) ;
+    - inégalité triangulaire à partir de chaque BFS effectué (graphes non orientés
+      uniquement : dans un graphe orienté les sommets atteignables depuis v ne sont pas
+      connus sans le parcourir).
+
+    Le Δ-PFS de top_k_closeness ne convient pas ici : ses valeurs intermédiaires ne sont
+    pas des centralités exactes et ne peuvent donc pas être certifiées.
+
+    candidates : indices des seuls sommets classés (ex. ceux d'un quartier, voir
+    efficient_closeness/region.py) ; les distances restent celles du graphe entier.
+    Une fois le top-k rempli, un BFS est interrompu dès que la centralité du sommet ne peut
+    plus atteindre le seuil ; le sommet est remis en file si un k plus grand est demandé.
+    """
+
+    def __init__(self, G, work_dir=None, candidates=None):
+        if not isinstance(G, CSRGraph):
+            G = from_networkx(G)
+        self.G = G
+        n = self.n = G.number_of_nodes()
+        self.norm = float(max(n - 1, 1))
+        self.R = _components(G) if n else np.zeros(0, dtype=np.int64)
+        self.S_low, self.out_deg = _degree_bounds(G, self.R)
+        sources = range(n) if candidates is None else np.unique(np.asarray(candidates, dtype=np.int64)).tolist()
+        self.total = len(sources)
+        self.queue = [(-self._upper(v), v) for v in sources]
+        heapq.heapify(self.queue)
+        self.done = np.zeros(n, dtype=bool)
+        self.dist = working_array(n, np.int32, -1, work_dir)
+        self.values = {}    # centralités exactes déjà calculées {indice: centralité}
+        self.top = []       # tas min [(centralité, indice)] des K meilleures valeurs connues
+        self.K = 0
+        self.pruned = []    # sommets écartés par un BFS interrompu (sous le seuil du K courant)
+
+    def _upper(self, v):
+        x = self.R[v] - 1
+        if x == 0 or self.out_deg[v] == 0:
+            return 0.0
+        return x * x / (self.norm * self.S_low[v])
+
+    def _peek(self):
+        """Plus grande borne restante (les entrées périmées du tas sont remises à jour)."""
+        queue = self.queue
+        while queue:
+            neg, v = queue[0]
+            if self.done[v]:
+                heapq.heappop(queue)
+                continue
+            ub = self._upper(v)
+            if ub < -neg:
+                heapq.heapreplace(queue, (-ub, v))
+                continue
+            return ub, v
+        return 0.0, None
+
+    def _reserve(self, k):
+        """Agrandit le tas des meilleures valeurs connues à k entrées."""
+        if k > self.K:
+            self.K = k
+            self.top = heapq.nlargest(k, ((c, v) for v, c in self.values.items()))
+            heapq.heapify(self.top)
+            # le seuil baisse : les sommets écartés redeviennent candidats (bornes resserrées)
+            for v in self.pruned:
+                self.done[v] = False
+                heapq.heappush(self.queue, (-self._upper(v), v))
+            self.pruned = []
+
+    def _step(self, v):
+        """
+        BFS exact depuis v, puis resserrement des bornes de sa composante. Si le top-k est
+        rempli, le BFS s'arrête dès que S_v >= somme partielle + (niveau + 1)·(sommets restants
+        de la composante, en non orienté) dépasse ce que permet le seuil.
+        """
+        G, dist = self.G, self.dist
+        heapq.heappop(self.queue)
+        self.done[v] = True
+        stop = None
+        if len(self.top) == self.K and self.top[0][0] > 0:
+            x = self.R[v] - 1
+            S_max = x * x / (self.norm * self.top[0][0])
+            rest = 0 if G.is_directed() else self.R[v]
+            cut = []
+
+            def stop(level, reached, total):
+                low = total + (level + 1) * max(rest - reached, 0)
+                if low > S_max:
+                    cut.append(low)
+                    return True
+                return False
+
+        r_v, S = bfs_levels(G, v, dist, stop=stop)
+        if stop is not None and cut:
+            self.S_low[v] = max(self.S_low[v], cut[0])
+            self.pruned.append(v)
+            return
+        c = ((r_v - 1) ** 2) / (self.norm * S) if S > 0 and r_v > 1 else 0.0
+        self.values[v] = c
+        if len(self.top) < self.K:
+            heapq.heappush(self.top, (c, v))
+        elif c > self.top[0][0]:
+            heapq.heapreplace(self.top, (c, v))
+
+        if not G.is_directed() and r_v > 1:
+            members = np.flatnonzero(np.asarray(dist) >= 0)
+            self.S_low[members] = np.maximum(self.S_low[members], _triangle_bounds(dist, members))
+
+    def snapshots(self, k):
+        """Générateur de snapshots (voir utils/anytime.py) jusqu'à certification du top-k."""
+        t0 = time.perf_counter()
+        self._reserve(k)
+        while True:
+            bound, v = self._peek()
+            ranked = heapq.nlargest(k, self.top)
+            complete = v is None or (len(ranked) == k and ranked[-1][0] >= bound)
+            ids = self.G.original_ids([u for _, u in ranked])
+            yield snapshot(list(zip(ids, [c for c, _ in ranked])), bound, len(self.values) + len(self.pruned),
+                           self.total, t0, complete)
+            if complete:
+                return
+            self._step(v)
+
+    def top_k(self, k, time_budget=None, work_budget=None, callback=None):
+        """
+        Top-k sous budget éventuel (work_budget : nombre de BFS de cette requête).
+        Retourne le dernier snapshot ; complete=True si le top-k est entièrement certifié.
+        """
+        # _reserve remet en file les sommets écartés : le décompte de départ se lit après
+        self._reserve(k)
+        if work_budget is not None:
+            work_budget += len(self.values) + len(self.pruned)
+        return run_anytime(self.snapshots(k), time_budget=time_budget,
+                           work_budget=work_budget, callback=callback)
+
+
+# Requêtes conservées par graphe (empreinte de la structure), les plus récentes en dernier
+_QUERIES = OrderedDict()
+MAX_QUERIES = 4
+
+
+def closeness_query(G, work_dir=None):
+    """ClosenessQuery persistante associée à G (réutilisée tant que le graphe ne change pas)."""
+    key = graph_fingerprint(G)
+    query = _QUERIES.pop(key, None)
+    if query is None:
+        query = ClosenessQuery(G, work_dir=work_dir)
+    _QUERIES[key] = query
+    while len(_QUERIES) > MAX_QUERIES:
+        _QUERIES.popitem(last=False)
+    return query
+
+
+def iter_top_k_closeness(G, k, work_dir=None):
+    """
+    Top-k closeness « anytime » : générateur de snapshots (voir utils/anytime.py) qui
+    s'améliorent à chaque source traitée, jusqu'à ce que le top-k soit certifié.
+    """
+    return ClosenessQuery(G, work_dir=work_dir).snapshots(k)
+
+
+def top_k_closeness_anytime(G, k, time_budget=None, work_budget=None, callback=None, work_dir=None):
+    """
+    Top-k closeness sous budget : time_budget (secondes) et/ou work_budget (nombre de BFS).
+    Retourne le dernier snapshot : top-k courant, sommets certifiés, borne restante.
+    callback(snapshot) reçoit chaque amélioration (affichage progressif).
+
+        snap = top_k_closeness_anytime(G, 10, time_budget=5)
+        snap["topk"], snap["certified"], snap["complete"]
+    """
+    return run_anytime(iter_top_k_closeness(G, k, work_dir=work_dir),
+                       time_budget=time_budget, work_budget=work_budget, callback=callback)
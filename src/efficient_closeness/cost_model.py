@@ -0,0 +1,256 @@
+import os
+import json
+import math
+import time
+import random
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+COST_MODEL_DIR = os.path.join(os.path.dirname(SRC_DIR), "results", "cost_models")
+
+# Familles de graphes ayant chacune leur modèle calibré
+FAMILIES = ("road", "social")
+
+# Ajustement accepté : R² minimal des régressions, plage admise pour gamma
+MIN_R2 = 0.5
+GAMMA_RANGE = (0.1, 100.0)
+
+
+class CostModel:
+    """
+    Modèle de coût du planificateur schedule() (Olsen et al.) :
+    - PFS depuis v : c_v · log(1 + c_v), c_v = sommets atteignables estimés (sketches) ;
+    - Δ-PFS de v depuis son parent p : gamma · V · log(1 + V), avec V = (c_v - c_p) + promus et
+      promus = coef · σ^exp_sigma · c_p^exp_cp / (w^exp_w · S_p^exp_sp)
+      (σ : somme des distances estimée de v depuis p, w : poids de l'arc, S_p : somme estimée de p).
+    Les valeurs par défaut sont les constantes d'origine ; calibrate() les ajuste sur un graphe.
+    """
+
+    FIELDS = ("gamma", "coef", "exp_sigma", "exp_cp", "exp_w", "exp_sp")
+
+    def __init__(self, gamma=1.79, coef=0.82, exp_sigma=0.96, exp_cp=0.23, exp_w=0.83, exp_sp=0.16,
+                 family=None, fit=None):
+        self.gamma = gamma
+        self.coef = coef
+        self.exp_sigma = exp_sigma
+        self.exp_cp = exp_cp
+        self.exp_w = exp_w
+        self.exp_sp = exp_sp
+        self.family = family
+        self.fit = fit    # informations de calibration (échantillon, qualité des ajustements...)
+
+    def promoted(self, sigma, c_p, w, s_p):
+        return self.coef * (sigma ** self.exp_sigma) * (c_p ** self.exp_cp) / ((w ** self.exp_w) * (s_p ** self.exp_sp))
+
+    def to_dict(self):
+        return dict({f: getattr(self, f) for f in self.FIELDS}, family=self.family, fit=self.fit)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f: data[f] for f in cls.FIELDS}, family=data.get("family"), fit=data.get("fit"))
+
+    def __repr__(self):
+        # sert aussi de clé (cache des résultats, points de reprise) : coefficients seulement
+        return "CostModel(" + ", ".join(f"{f}={getattr(self, f):.6g}" for f in self.FIELDS) + ")"
+
+
+DEFAULT_MODEL = CostModel()
+
+
+# ------------------------------------------------------------
+# Modèles par famille de graphes (results/cost_models/<famille>.json)
+# ------------------------------------------------------------
+def graph_family(G):
+    """
+    Famille d'un graphe : "road" pour un réseau routier (coordonnées x / y, ou degrés faibles
+    et homogènes), "social" sinon (graphes SNAP, degrés à queue lourde).
+    """
+    if hasattr(G, "offsets"):
+        if G.x is not None:
+            return "road"
+        degrees = [int(d) for d in (G.offsets[1:] - G.offsets[:-1])]
+    else:
+        nodes = list(G.nodes())
+        if nodes and "x" in G.nodes[nodes[0]]:
+            return "road"
+        degrees = [d for _, d in G.degree()]
+    if not degrees:
+        return "road"
+    mean = sum(degrees) / len(degrees)
+    return "road" if mean <= 5 and max(degrees) <= 4 * max(mean, 1) + 8 else "social"
+
+
+def model_path(family, directory=None):
+    return os.path.join(directory or COST_MODEL_DIR, f"{family}.json")
+
+
+def fit_problems(model):
+    """Raisons de rejeter un modèle calibré (liste vide : ajustement acceptable)."""
+    fit = model.fit or {}
+    problems = [f"R² {label} = {fit[name]:.2f} < {MIN_R2}"
+                for name, label in (("r2_promoted", "promus"), ("r2_pfs", "PFS"), ("r2_delta", "Δ-PFS"))
+                if fit.get(name, 1.0) < MIN_R2]
+    low, high = GAMMA_RANGE
+    if not low <= model.gamma <= high:
+        problems.append(f"gamma = {model.gamma:.3g} hors de [{low}, {high}]")
+    if not all(math.isfinite(getattr(model, f)) for f in CostModel.FIELDS) or model.coef <= 0:
+        problems.append("coefficients non finis")
+    return problems
+
+
+def load_cost_model(family, directory=None):
+    """Modèle calibré de la famille, ou None s'il n'y en a pas (ou s'il est rejeté par fit_problems)."""
+    path = model_path(family, directory)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        model = CostModel.from_dict(json.load(f))
+    return None if fit_problems(model) else model
+
+
+def save_cost_model(model, family=None, directory=None):
+    family = family or model.family
+    model.family = family
+    path = model_path(family, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def resolve_cost_model(G, model=None):
+    """
+    CostModel à utiliser pour G : model tel quel, None ou "default" (constantes d'origine), ou un
+    nom de famille pour le modèle calibré sur cette machine (à défaut, constantes d'origine).
+    Le modèle calibré n'est jamais pris implicitement : le fichier local ne change pas les résultats.
+    """
+    if isinstance(model, CostModel):
+        return model
+    if model is None or model == "default":
+        return DEFAULT_MODEL
+    if model not in FAMILIES:
+        raise ValueError(f"Modèle de coût inconnu : {model!r} (default, {', '.join(FAMILIES)} ou CostModel)")
+    return load_cost_model(model) or DEFAULT_MODEL
+
+
+# ------------------------------------------------------------
+# Calibration
+# ------------------------------------------------------------
+def _lstsq(X, y):
+    """Moindres carrés : (coefficients, R²)."""
+    import numpy as np
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    beta = np.linalg.lstsq(X, y, rcond=None)[0]
+    residual = float(((X @ beta - y) ** 2).sum())
+    total = float(((y - y.mean()) ** 2).sum())
+    if total <= 1e-12 * len(y):
+        # cible constante (ex. Δ-PFS ne mettant à jour que v) : ajustement exact ou nul
+        return beta, 1.0 if residual <= 1e-12 * len(y) else 0.0
+    return beta, 1.0 - residual / total
+
+
+def measure_pairs(G, sample=200, seed=0, log=print):
+    """
+    Mesure, pour un échantillon de sommets v ayant un prédécesseur p (tiré au hasard) :
+    le temps du PFS depuis v, le temps du Δ-PFS de v depuis p et le nombre de sommets qu'il
+    a réellement mis à jour, avec les estimations du planificateur (c_v, c_p, σ, w, S_p).
+    Closeness en nombre d'arêtes seulement : top_k_closeness(..., weight=...) n'utilise pas schedule().
+    """
+    from utils.csr_graph import CSRGraph
+    from efficient_closeness.top_k_closeness import (prep, prep_csr, planner_inputs, sigma_hat, PFS,
+                                                      optimized_PFS, rollback, weighted_graph, _adjacency_caches)
+    if not isinstance(G, CSRGraph) and G.is_multigraph():
+        G = weighted_graph(G, "weight")   # comme top_k_closeness sans weight
+    _adjacency_caches(G)
+    V_hat, S_hat = prep_csr(G) if isinstance(G, CSRGraph) else prep(G)
+    count_map, S_hat_map, preds_map, poids_map = planner_inputs(G, V_hat, S_hat)
+    pfs = lambda v: PFS(G, v, G._neighbors_cache)
+
+    rng = random.Random(seed)
+    candidates = [v for v in G.nodes() if preds_map[v]]
+    rows = []
+    for v in rng.sample(candidates, min(sample, len(candidates))):
+        p = rng.choice(preds_map[v])
+        t0 = time.perf_counter()
+        pfs(v)
+        t_pfs = time.perf_counter() - t0
+
+        L, s, delta_p = pfs(p)
+        t0 = time.perf_counter()
+        L, _, _, log_level = optimized_PFS(G, v, p, L, s, delta_p, G._neighbors_cache, G._weights_cache)
+        t_delta = time.perf_counter() - t0
+        updated = len(log_level)
+        rollback(L, log_level)
+
+        w = poids_map.get((p, v), 1.0)
+        rows.append({"c_v": count_map[v], "c_p": count_map[p], "sigma": sigma_hat(count_map, S_hat_map, w, v, p),
+                     "w": w, "s_p": S_hat_map[p], "t_pfs": t_pfs, "t_delta": t_delta, "updated": updated})
+    log(f"⏱️ {len(rows)} couples (v, parent) mesurés sur {G.number_of_nodes()} sommets")
+    return rows
+
+
+def fit_cost_model(rows, family=None):
+    """
+    Ajuste le modèle sur les mesures de measure_pairs :
+    - promus (sommets mis à jour par le Δ-PFS au-delà des c_v - c_p nouveaux) : régression
+      log-linéaire sur log σ, log c_p, log w, log S_p (mêmes bornes à 1 que schedule) ;
+    - gamma : rapport des coûts unitaires Δ-PFS / PFS, chacun ajusté par moindres carrés sur
+      V·log(1 + V) (V : sommets mis à jour, resp. atteignables).
+    """
+    if len(rows) < 10:
+        raise ValueError(f"Échantillon trop petit pour la calibration : {len(rows)} couples")
+
+    X, y = [], []
+    for r in rows:
+        new_nodes = max(r["c_v"] - r["c_p"], 0)
+        promoted = r["updated"] - new_nodes
+        if promoted < 1 or r["c_p"] <= 0:
+            continue
+        X.append([1.0, math.log(max(r["sigma"], 1.0)), math.log(r["c_p"]),
+                  -math.log(max(r["w"], 1.0)), -math.log(max(r["s_p"], 1.0))])
+        y.append(math.log(promoted))
+    if len(X) < 5:
+        raise ValueError("Trop peu de Δ-PFS avec sommets promus pour ajuster le modèle")
+    # une variable constante (ex. w = 1 sans poids) n'est pas identifiable : exposant par défaut
+    defaults = [None, DEFAULT_MODEL.exp_sigma, DEFAULT_MODEL.exp_cp, DEFAULT_MODEL.exp_w, DEFAULT_MODEL.exp_sp]
+    free = [0] + [j for j in range(1, 5) if len({round(x[j], 12) for x in X}) > 1]
+    y = [yi - sum(defaults[j] * x[j] for j in range(1, 5) if j not in free) for x, yi in zip(X, y)]
+    coefs, r2_promoted = _lstsq([[x[j] for j in free] for x in X], y)
+    beta = [dict(zip(free, coefs)).get(j, defaults[j]) for j in range(5)]
+
+    pfs_unit, r2_pfs = _lstsq([[r["c_v"] * math.log1p(r["c_v"])] for r in rows], [r["t_pfs"] for r in rows])
+    delta_unit, r2_delta = _lstsq([[r["updated"] * math.log1p(r["updated"])] for r in rows],
+                                  [r["t_delta"] for r in rows])
+    gamma = float(delta_unit[0] / pfs_unit[0]) if pfs_unit[0] > 0 else DEFAULT_MODEL.gamma
+
+    fit = {"pairs": len(rows), "promoted_pairs": len(X), "r2_promoted": r2_promoted,
+           "r2_pfs": r2_pfs, "r2_delta": r2_delta, "calibrated": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    beta = [round(float(b), 9) + 0.0 for b in beta]  # résidus numériques (1e-17) hors de la clé du modèle
+    return CostModel(gamma=gamma, coef=math.exp(beta[0]), exp_sigma=beta[1], exp_cp=beta[2],
+                     exp_w=beta[3], exp_sp=beta[4], family=family, fit=fit)
+
+
+def calibrate(graphs, family=None, sample=200, seed=0, save=True, log=print):
+    """
+    Calibre le modèle de coût sur un ou plusieurs graphes d'une même famille (mesures
+    réunies), l'enregistre dans results/cost_models/<famille>.json si save, et le rend.
+    Calibrer sur des villes de taille moyenne suffit : le modèle est ensuite utilisé par
+    schedule(G, ..., model=famille) pour tout graphe de la famille.
+    Un ajustement rejeté par fit_problems n'est pas enregistré : DEFAULT_MODEL est rendu.
+    """
+    graphs = graphs if isinstance(graphs, (list, tuple)) else [graphs]
+    family = family or graph_family(graphs[0])
+    rows = []
+    for i, G in enumerate(graphs):
+        rows.extend(measure_pairs(G, sample=sample, seed=seed + i, log=log))
+    model = fit_cost_model(rows, family=family)
+    log(f"📐 Modèle {family} : {model!r} (R² promus {model.fit['r2_promoted']:.2f}, "
+        f"PFS {model.fit['r2_pfs']:.2f}, Δ-PFS {model.fit['r2_delta']:.2f})")
+    problems = fit_problems(model)
+    if problems:
+        log(f"⚠️ Ajustement rejeté ({'; '.join(problems)}) : constantes d'origine conservées")
+        return DEFAULT_MODEL
+    if save:
+        log(f"💾 {save_cost_model(model, family)}")
+    return model
@@ -0,0 +1,123 @@
+import os
+import math
+import heapq
+import multiprocessing
+from collections import defaultdict
+from efficient_closeness.top_k_closeness import PFS, process, weighted_inputs, weighted_root
+from utils.instrumentation import Stats, perf_counter
+
+# État des processus de travail (hérité par fork, ou transmis par l'initialiseur)
+_WORKER = {}
+
+
+class SharedThreshold:
+    """
+    Seuil θ_A commun à tous les processus, en mémoire partagée. Chaque θ local est le
+    k-ième meilleur score d'une partie des sommets traités, donc un minorant du seuil
+    final : en publier le maximum garde le pruning valide et aussi efficace qu'en séquentiel.
+    """
+
+    def __init__(self, ctx):
+        self.value = ctx.RawValue("d", 0.0)
+        self.lock = ctx.Lock()
+
+    def exchange(self, theta):
+        """Publie theta s'il améliore le seuil commun ; retourne le meilleur des deux."""
+        best = self.value.value
+        if theta > best:
+            with self.lock:
+                if theta > self.value.value:
+                    self.value.value = theta
+            return theta
+        return best
+
+
+def subtree_costs(S, roots, V_hat):
+    """
+    Coût estimé de chaque sous-arbre du schedule : Σ c·log(1 + c) sur ses sommets,
+    c étant le nombre de sommets atteignables estimé par les sketches (sans sketches,
+    après une reprise, chaque sommet compte pour 1).
+    """
+    if V_hat is None:
+        counts = defaultdict(lambda: 1)
+    elif hasattr(V_hat, "counts"):
+        counts = V_hat.counts().tolist()
+    else:
+        counts = {v: V_hat[v].count() for v in V_hat}
+
+    costs = []
+    for root in roots:
+        total, stack = 0.0, [root]
+        while stack:
+            v = stack.pop()
+            c = counts[v]
+            total += c * math.log1p(c)
+            stack.extend(S.get(v, ()))
+        costs.append(total)
+    return costs
+
+
+def balance(roots, costs, bins):
+    """Répartit les racines en lots de coûts voisins (plus gros d'abord), lots triés par coût décroissant."""
+    heap = [(0.0, i, []) for i in range(bins)]
+    for cost, root in sorted(zip(costs, roots), key=lambda x: -x[0]):
+        load, i, batch = heapq.heappop(heap)
+        batch.append(root)
+        heapq.heappush(heap, (load + cost, i, batch))
+    return [batch for _, _, batch in sorted(heap, key=lambda x: -x[0]) if batch]
+
+
+def _init(G, S, k, V, shared, with_stats, weighted):
+    _WORKER.update(G=G, S=S, k=k, V=V, shared=shared, with_stats=with_stats, weighted=weighted)
+
+
+def _search_batch(roots):
+    """Traite un lot de racines (PFS puis chaîne process / Δ-PFS), comme la boucle séquentielle."""
+    G, S, k, V, shared = _WORKER["G"], _WORKER["S"], _WORKER["k"], _WORKER["V"], _WORKER["shared"]
+    adj, reach = _WORKER["weighted"] or (None, None)
+    stats = Stats() if _WORKER["with_stats"] else None
+    A = {}
+    for v in roots:
+        if reach is not None:
+            weighted_root(adj, v, A, k, V, reach[v], stats=stats, shared=shared, directed=G.is_directed())
+            continue
+        if stats is not None:
+            t0 = perf_counter()
+            (L, s, delta_p) = PFS(G, v, G._neighbors_cache)
+            stats.record("PFS", t0)
+            stats.add("pfs_settled", len(L))
+        else:
+            (L, s, delta_p) = PFS(G, v, G._neighbors_cache)
+        process(G, v, L, s, A, S, k, V, delta_p, set(), neighbors_cache=G._neighbors_cache,
+                weights_cache=G._weights_cache, stats=stats, shared=shared)
+    return A, stats
+
+
+def parallel_search(G, S, roots, V_hat, k, workers=None, stats=None, weighted=False):
+    """
+    Phase de recherche de top_k_closeness répartie sur plusieurs processus : les sous-arbres
+    du schedule (une racine de Start(S) et ses dépendants) sont indépendants et ne partagent
+    que le top-k, fusionné à la fin, et le seuil θ_A, partagé en cours de calcul.
+    Les lots sont équilibrés par le coût estimé des sous-arbres et distribués dynamiquement.
+    weighted : mode pondéré de top_k_closeness(..., weight=...) : racines sans dépendants,
+    évaluées par des Dijkstra bornés (weighted_root).
+    """
+    workers = workers or os.cpu_count() or 1
+    V = len(G.nodes())
+    batches = balance(roots, subtree_costs(S, roots, V_hat), workers * 4)
+
+    # fork : le graphe, le schedule et les caches d'adjacence sont partagés sans copie
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    shared = SharedThreshold(ctx)
+    weighted = weighted_inputs(G) if weighted else None   # (adj, reach)
+
+    candidates = []
+    with ctx.Pool(workers, initializer=_init, initargs=(G, S, k, V, shared, stats is not None, weighted)) as pool:
+        for A, batch_stats in pool.imap_unordered(_search_batch, batches):
+            candidates.extend((c, v) for v, c in A.items())
+            if stats is not None:
+                stats.merge(batch_stats)
+
+    best = heapq.nlargest(k, candidates, key=lambda x: x[0])
+    return {v: c for c, v in best}
@@ -0,0 +1,38 @@
+from utils.csr_graph import CSRGraph, from_networkx
+from utils.spatial_index import grid_index
+from efficient_closeness.anytime import ClosenessQuery
+
+
+def region_nodes(G, bbox=None, polygon=None):
+    """
+    Indices des sommets d'un CSRGraph situés dans la zone : bbox = (xmin, ymin, xmax, ymax)
+    (longitudes / latitudes pour un graphe OSMnx) ou polygon = [(x, y), ...] (ou objet shapely).
+    """
+    if (bbox is None) == (polygon is None):
+        raise ValueError("Donner exactement une zone : bbox ou polygon")
+    index = grid_index(G)
+    return index.bbox(*bbox) if bbox is not None else index.polygon(polygon)
+
+
+def top_k_closeness_in_region(G, k, bbox=None, polygon=None, time_budget=None, work_budget=None,
+                              callback=None, work_dir=None):
+    """
+    Top-k closeness parmi les sommets d'une zone (rectangle ou polygone), les distances
+    étant celles de la ville entière (même centralité que classic_closeness).
+
+    Les sommets de la zone sont trouvés par l'index spatial (utils/spatial_index.py) et
+    seuls eux sont classés : les autres ne sont jamais sources d'un BFS. Les candidats de
+    la zone sont traités par borne supérieure décroissante et les BFS sont interrompus
+    dès que le sommet ne peut plus entrer dans le top-k (voir ClosenessQuery) : le coût
+    suit la taille de la zone et non celle de la ville.
+
+    Retourne le dernier snapshot (voir utils/anytime.py), comme top_k_closeness_anytime :
+
+        snap = top_k_closeness_in_region(G, 10, bbox=(4.99, 47.30, 5.06, 47.34))
+        snap["topk"], snap["complete"]
+    """
+    if not isinstance(G, CSRGraph):
+        G = from_networkx(G)
+    candidates = region_nodes(G, bbox=bbox, polygon=polygon)
+    query = ClosenessQuery(G, work_dir=work_dir, candidates=candidates)
+    return query.top_k(k, time_budget=time_budget, work_budget=work_budget, callback=callback)
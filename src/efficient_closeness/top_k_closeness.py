@@ -1,10 +1,13 @@
 import math
-import time
 from collections import deque
 import heapq
-import networkx as nx
 from collections import defaultdict
 from efficient_closeness import Sketch   
+from utils.csr_graph import CSRGraph, working_array
+from utils.result_cache import cached
+from utils.instrumentation import perf_counter, phase
+from utils.checkpoint import as_checkpoint
+from efficient_closeness.cost_model import resolve_cost_model
 
 def prep(G):
     """
@@ -75,23 +78,110 @@ def prep(G):
     return V_hat, S_hat
 
 
+def prep_csr(G, work_dir=None, m=64):
+    """
+    Version de prep() pour un CSRGraph : les sketches V_hat sont une SketchArray
+    (registres (n, m) éventuellement en np.memmap) et S_hat un tableau de travail.
+    Seules les couches en attente V[x][pi] restent en mémoire (un dict par couche).
+    """
+    import numpy as np
+
+    n_nodes = G.number_of_nodes()
+    offsets, targets, weights = G.offsets, G.targets, G.weights
+
+    mu = float(weights.min()) if len(weights) else 1.0
+    if mu <= 0:
+        mu = 1.0
+
+    V_hat = Sketch.SketchArray(n_nodes, m=m, work_dir=work_dir)
+    S_hat = working_array(n_nodes, np.float64, 0.0, work_dir)
+    ids = G.original_ids(range(n_nodes))
+    for v in range(n_nodes):
+        V_hat.add(v, ids[v])
+    counts = V_hat.counts()
+    R = V_hat.registers
+
+    # layers[tau][x] = registres à livrer à x à la distance arrondie tau
+    layers = defaultdict(dict)
+
+    def push(v, base):
+        lo, hi = int(offsets[v]), int(offsets[v + 1])
+        for succ, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            hop = int(math.ceil(w / mu))
+            if hop < 1:
+                hop = 1
+            pending = layers[base + hop]
+            regs = pending.get(succ)
+            if regs is None:
+                pending[succ] = R[v].copy()
+            else:
+                np.maximum(regs, R[v], out=regs)
+
+    # Propagation couche 1 (voisins directs)
+    for v in range(n_nodes):
+        push(v, 0)
+
+    # Expansion par couches croissantes
+    i = 1
+    while layers:
+        pending = layers.pop(i, None)
+        if pending:
+            for v, regs in pending.items():
+                Vprime = np.maximum(R[v], regs)
+                c = V_hat.count_registers(Vprime)
+                delta = c - counts[v]
+                if delta > 0:
+                    S_hat[v] += i * delta
+                    R[v] = Vprime
+                    counts[v] = c
+                    push(v, i)
+        i += 1
+
+    return V_hat, S_hat
 
 
-def schedule(G, V_hat, S_hat):
+def weighted_graph(G, weight):
     """
-    Construit la table de planification (schedule) :
-      - détermine les sommets sources (PFS)
-      - détermine les sommets dépendants (Δ-PFS)
-    selon les coûts estimés basés sur les sketches.
+    Graphe simple pondéré par l'attribut `weight` (ex. "length" d'OSMnx) : les multi-arêtes
+    sont réduites à leur poids minimal (1.0 si l'attribut manque), stocké dans "weight".
+    Un CSRGraph est rendu tel quel (ses poids sont choisis à la conversion,
+    from_networkx(G, weight="length")).
+    """
+    if isinstance(G, CSRGraph):
+        return G
+    best = {}
+    directed = G.is_directed()
+    for u, v, data in G.edges(data=True):
+        if not directed and (v, u) in best:
+            u, v = v, u
+        w = float(data.get(weight, 1.0))
+        if (u, v) not in best or w < best[(u, v)]:
+            best[(u, v)] = w
+    import networkx as nx
+    H = nx.DiGraph() if directed else nx.Graph()
+    H.add_nodes_from(G.nodes())
+    H.add_weighted_edges_from((u, v, w) for (u, v), w in best.items())
+    return H
+
+
+def planner_inputs(G, V_hat, S_hat, adjacency=True):
+    """
+    Estimations utilisées par le planificateur (schedule, calibration du modèle de coût) :
+    count_map[v] (sommets atteignables estimés), S_hat, prédécesseurs (voisins si non orienté)
+    et poids des arcs (None, None si adjacency=False).
     """
-    gamma = 1.79
-    # References locales (micro-opt Python)
-    log1p = math.log1p
     is_dir = G.is_directed()
 
     # pre-caches : evite hasattr, .count() repetes et les acces G couteux
-    count_map = {v: (V_hat[v].count() if hasattr(V_hat[v], "count") else len(V_hat[v]))
-                 for v in G.nodes()}
+    if hasattr(V_hat, "counts"):
+        # SketchArray (graphe CSR) : estimations vectorisées
+        count_map = V_hat.counts().tolist()
+        S_hat = S_hat.tolist()
+    else:
+        count_map = {v: (V_hat[v].count() if hasattr(V_hat[v], "count") else len(V_hat[v]))
+                     for v in G.nodes()}
+    if not adjacency:
+        return count_map, S_hat, None, None
     # preds_map[v] : liste de predecesseurs (ou voisins si non oriente), calculee une fois
     if is_dir:
         preds_map = {v: list(G.predecessors(v)) for v in G.nodes()}
@@ -105,33 +195,52 @@ def schedule(G, V_hat, S_hat):
         poids_map[(u, v)] = w
         if not is_dir:
             poids_map[(v, u)] = w
+    return count_map, S_hat, preds_map, poids_map
 
-    def poids(u, v):
-        return poids_map.get((u, v), 1.0)
 
-    S_hat_map = S_hat  # alias local
+def sigma_hat(count_map, S_hat, w, v, p):
+    """Somme des distances de v estimée depuis celle de son parent p (arc p -> v de poids w)."""
+    c_v = count_map[v]
+    if c_v == 0:
+        return 0.0
+    c_p = count_map[p]
+    return w * c_p + S_hat[p] - (c_p / c_v) * S_hat[v]
 
-    def sigma_hat(v, p):
-        c_v = count_map[v]
-        if c_v == 0:
-            return 0.0
-        c_p = count_map[p]
-        return poids(p, v) * c_p + S_hat_map[p] - (c_p / c_v) * S_hat_map[v]
+
+def schedule(G, V_hat, S_hat, model=None):
+    """
+    Construit la table de planification (schedule) :
+      - détermine les sommets sources (PFS)
+      - détermine les sommets dépendants (Δ-PFS)
+    selon les coûts estimés basés sur les sketches.
+    model : CostModel (efficient_closeness/cost_model.py), None ou "default" (constantes
+    d'origine), ou nom de famille ("road", "social") pour le modèle calibré s'il existe.
+    """
+    model = resolve_cost_model(G, model)
+    gamma = model.gamma
+    coef, e_sigma, e_cp, e_w, e_sp = model.coef, model.exp_sigma, model.exp_cp, model.exp_w, model.exp_sp
+    # References locales (micro-opt Python)
+    log1p = math.log1p
+
+    count_map, S_hat_map, preds_map, poids_map = planner_inputs(G, V_hat, S_hat)
+
+    def poids(u, v):
+        return poids_map.get((u, v), 1.0)
 
     def promoted_vertices(v, p):
         c_p = count_map[p]
         if c_p <= 0:
             return 0.0
-        s = sigma_hat(v, p)
+        w = poids(p, v)
+        s = sigma_hat(count_map, S_hat_map, w, v, p)
         if s < 1.0:
             s = 1.0
-        w = poids(p, v)
         if w < 1.0:
             w = 1.0
         s_p = S_hat_map[p]
         if s_p < 1.0:
             s_p = 1.0
-        return 0.82 * (s ** 0.96) * (c_p ** 0.23) / ( (w ** 0.83) * (s_p ** 0.16) )
+        return coef * (s ** e_sigma) * (c_p ** e_cp) / ( (w ** e_w) * (s_p ** e_sp) )
 
     # Boucle principale
     S = {}
@@ -170,6 +279,23 @@ def schedule(G, V_hat, S_hat):
         else:
             optimized.append((v, best_parent))
 
+    # un cycle de parents (v dépend de p qui dépend de v...) ne serait jamais atteint depuis
+    # une source : un sommet de chaque cycle devient source
+    parent = dict(optimized)
+    state = {}
+    for v in list(parent):
+        path = []
+        while v in parent and v not in state:
+            state[v] = 1
+            path.append(v)
+            v = parent[v]
+        if state.get(v) == 1:
+            del parent[v]
+            sources.append(v)
+        for u in path:
+            state[u] = 2
+    optimized = list(parent.items())
+
     # construction S (sans branches inutiles)
     for p, children in _group_by_parent(optimized).items():
         S[p] = children
@@ -202,9 +328,14 @@ def Start(S):
 
 
 def prune(v,L,s,teta_A,S,delta_v,G,neighbors_cache,weights_cache):
+    """
+    Élague du schedule les dépendants dont la borne de centralité ne peut plus atteindre θ_A.
+    Retourne le nombre de sommets retirés.
+    """
     # 1-Préparation (caches et constantes)
     len_L = len(L)
     m = len(G.nodes())
+    removed = 0
 
     # caches locaux
     phi = {}
@@ -244,7 +375,9 @@ def prune(v,L,s,teta_A,S,delta_v,G,neighbors_cache,weights_cache):
                     except ValueError:
                         pass
                 S.pop(u, None)
+                removed += 1
 
+    return removed
 
 
 def PFS(G, v,neighbors_cache):
@@ -266,6 +399,32 @@ def PFS(G, v,neighbors_cache):
                 Q.append(vprime)
     return dist, s, delta_v
 
+def weighted_PFS(G, v, neighbors_cache, weights_cache):
+    """
+    PFS pondéré (Dijkstra) : mêmes sorties que PFS (distances, somme, distance maximale),
+    les distances étant des sommes de poids d'arcs.
+    """
+    dist = {v: 0.0}
+    s = 0.0
+    delta_v = 0.0
+    done = set()
+    Q = [(0.0, v)]
+
+    while Q:
+        l, n = heapq.heappop(Q)
+        if n in done:
+            continue
+        done.add(n)
+        s += l
+        delta_v = l
+        for vprime in neighbors_cache[n]:
+            lprime = l + weights_cache.get((n, vprime), 1.0)
+            old = dist.get(vprime)
+            if old is None or lprime < old:
+                dist[vprime] = lprime
+                heapq.heappush(Q, (lprime, vprime))
+    return dist, s, delta_v
+
 def optimized_PFS(G, v, p, L, s, delta_p,neighbors_cache,weights_cache):
     """
     Δ-PFS : version optimisée du PFS classique.
@@ -323,18 +482,122 @@ def rollback(L, log_level):
         else:
             L[n] = old
 
-def top_k_closeness(G, k):
-    A = {}
-    if not hasattr(G, "_neighbors_cache"):
+def _adjacency_caches(G):
+    """Pose G._neighbors_cache / G._weights_cache (listes de successeurs et poids des arcs)."""
+    if isinstance(G, CSRGraph):
+        G._neighbors_cache, G._weights_cache = G.adjacency_caches()
+    elif not hasattr(G, "_neighbors_cache"):
         G._neighbors_cache = {u: list(G.successors(u)) if G.is_directed() else list(G.neighbors(u)) for u in G.nodes()}
         G._weights_cache = {(u, v): G[u][v].get('weight', 1.0) for u, v in G.edges()}
+        if not G.is_directed():
+            G._weights_cache.update({(v, u): w for (u, v), w in list(G._weights_cache.items())})
+
+
+@cached("top_k_closeness", params=("k", "weight", "cost_model"), resolve={"cost_model": resolve_cost_model})
+def top_k_closeness(G, k, work_dir=None, stats=None, checkpoint=None, workers=None, weight=None, cost_model=None):
+    """
+    Top-k closeness (Olsen et al.). G peut être un graphe networkx ou un CSRGraph
+    (éventuellement projeté en mémoire depuis le disque, voir utils/csr_graph.py) ;
+    dans ce cas work_dir permet de placer les sketches de prep() sur disque.
+
+    stats : objet utils.instrumentation.Stats facultatif, rempli avec les temps des phases
+    (prep, schedule, PFS, Δ-PFS, prune, rollback) et les compteurs associés.
+    Rien n'est mesuré lorsque le résultat provient du cache.
+
+    checkpoint : chemin (ou utils.checkpoint.Checkpoint) d'un point de reprise. L'état est
+    sauvegardé après prep (sketches), après schedule, puis périodiquement entre deux sources
+    du schedule (top-k courant, schedule élagué, sources traitées) ; un appel avec le même
+    chemin reprend au dernier état et rend le même résultat qu'un calcul ininterrompu.
+
+    workers : nombre de processus pour la recherche (sous-arbres du schedule répartis entre
+    processus, voir efficient_closeness/parallel.py). En mode parallèle, le point de reprise
+    n'est enregistré qu'après prep et schedule.
+
+    weight : nom d'un attribut d'arête (ex. "length") pour une closeness en distance réelle.
+    Les multi-arêtes sont réduites à leur poids minimal. Le top-k pondéré est exact : ni
+    sketches ni Δ-PFS (leurs majorants de distances, en mètres, fausseraient le classement),
+    chaque sommet est évalué par un Dijkstra arrêté dès que sa borne passe sous θ_A
+    (bounded_weighted_PFS), les plus centraux d'abord (weighted_order). Sans weight, toutes
+    les arêtes comptent pour 1 (nombre de sauts). Pour un CSRGraph, les poids sont ceux de la conversion.
+
+    cost_model : modèle de coût du planificateur (voir schedule et efficient_closeness/cost_model.py) ;
+    par défaut les constantes d'origine, "road" / "social" pour le modèle calibré de la famille.
+    Refusé avec weight (ValueError) : le mode pondéré n'a pas de schedule.
+    """
+    if weight is not None and cost_model is not None:
+        raise ValueError("cost_model est sans effet avec weight : le mode pondéré n'utilise pas schedule()")
+    if weight is not None or (not isinstance(G, CSRGraph) and G.is_multigraph()):
+        # G[u][v] d'un MultiDiGraph est le dictionnaire des clés, pas les attributs de l'arête
+        G = weighted_graph(G, weight or "weight")
+    cost_model = resolve_cost_model(G, cost_model)
+    ckpt = as_checkpoint(checkpoint, G, "top_k_closeness", {"k": k, "weight": weight, "cost_model": repr(cost_model)})
+    state = ckpt.load() if ckpt is not None else None
+
+    if state is None:
+        with phase(stats, "prep"):
+            _adjacency_caches(G)
+            if weight is not None:
+                V_hat = S_hat = None  # mode pondéré : pas de sketches (voir weighted_order)
+            elif isinstance(G, CSRGraph):
+                V_hat, S_hat = prep_csr(G, work_dir=work_dir)
+            else:
+                V_hat, S_hat = prep(G)
+        if ckpt is not None:
+            ckpt.save({"stage": "prep", "V_hat": V_hat, "S_hat": S_hat})
+    else:
+        _adjacency_caches(G)
+        V_hat = S_hat = None  # les sketches ne sont plus sauvegardés après schedule
+        if state["stage"] == "prep":
+            V_hat, S_hat = state["V_hat"], state["S_hat"]
     V = len(G.nodes())
-    V_hat, S_hat = prep(G)
-    S = schedule(G, V_hat, S_hat)
-    dead = set()
-    for v in Start(S):
-        (L, s, delta_p) = PFS(G, v ,G._neighbors_cache)
-        process(G, v, L, s, A, S, k, V, delta_p, dead,neighbors_cache=G._neighbors_cache,weights_cache=G._weights_cache)  
+
+    if state is None or state["stage"] == "prep":
+        with phase(stats, "schedule"):
+            if weight is not None:
+                S, roots = {}, weighted_order(G)
+            else:
+                S = schedule(G, V_hat, S_hat, cost_model)
+                roots = Start(S)
+        A, dead, start = {}, set(), 0
+        if ckpt is not None:
+            ckpt.save({"stage": "search", "S": S, "roots": roots, "next": 0, "A": A, "dead": dead})
+    else:
+        S, roots, start, A, dead = state["S"], state["roots"], state["next"], state["A"], state["dead"]
+    if stats is not None:
+        stats.add("schedule_sources", len(roots))
+        stats.add("schedule_dependents", sum(len(children) for children in S.values()))
+
+    if workers is not None and workers > 1:
+        from efficient_closeness.parallel import parallel_search
+        with phase(stats, "search"):
+            found = parallel_search(G, S, roots[start:], V_hat, k, workers=workers, stats=stats,
+                                    weighted=weight is not None)
+        for v, c in found.items():
+            update_topk(A, v, c, k)
+    else:
+        with phase(stats, "search"):
+            adj, reach = weighted_inputs(G) if weight is not None else (None, None)
+            for i in range(start, len(roots)):
+                v = roots[i]
+                if reach is not None:
+                    weighted_root(adj, v, A, k, V, reach[v], stats=stats, directed=G.is_directed())
+                    if ckpt is not None:
+                        ckpt.maybe_save(lambda: {"stage": "search", "S": S, "roots": roots, "next": i + 1, "A": A, "dead": dead})
+                    continue
+                if stats is not None:
+                    t0 = perf_counter()
+                    (L, s, delta_p) = PFS(G, v ,G._neighbors_cache)
+                    stats.record("PFS", t0)
+                    stats.add("pfs_settled", len(L))
+                else:
+                    (L, s, delta_p) = PFS(G, v ,G._neighbors_cache)
+                process(G, v, L, s, A, S, k, V, delta_p, dead,neighbors_cache=G._neighbors_cache,weights_cache=G._weights_cache, stats=stats)
+                if ckpt is not None:
+                    ckpt.maybe_save(lambda: {"stage": "search", "S": S, "roots": roots, "next": i + 1, "A": A, "dead": dead})
+    if ckpt is not None:
+        ckpt.done()
+    if isinstance(G, CSRGraph):
+        return dict(zip(G.original_ids(A.keys()), A.values()))
     return A
 
 
@@ -360,7 +623,125 @@ def update_topk(A, p, c_p, k):
     return min(A.values()) if len(A) == k else 0
 
 
-def process(G, p, L, s, A, S, k, V, delta_p, dead,neighbors_cache,weights_cache):
+def weighted_inputs(G):
+    """
+    Entrées du mode pondéré : listes d'adjacence adj[u] = [(v, poids), ...] (plus rapides que
+    neighbors_cache / weights_cache dans les Dijkstra) et reach[u], majorant du nombre de sommets
+    atteignables depuis u : taille de sa composante (faiblement) connexe, par union-find sur les
+    arcs (exacte pour un graphe non orienté).
+    """
+    if isinstance(G, CSRGraph):
+        offsets, targets, weights = G.offsets.tolist(), G.targets.tolist(), G.weights.tolist()
+        adj = [list(zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]]))
+               for u in range(G.number_of_nodes())]
+    else:
+        neighbors, weights = G._neighbors_cache, G._weights_cache
+        adj = {u: [(v, weights.get((u, v), 1.0)) for v in neighbors[u]] for u in G.nodes()}
+
+    parent = {}
+
+    def find(u):
+        root = u
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while u != root:
+            parent[u], u = root, parent.get(u, u)
+        return root
+
+    for u in G.nodes():
+        for v, _ in adj[u]:
+            ru, rv = find(u), find(v)
+            if ru != rv:
+                parent[ru] = rv
+    roots = {u: find(u) for u in G.nodes()}
+    sizes = defaultdict(int)
+    for r in roots.values():
+        sizes[r] += 1
+    reach = {u: sizes[r] for u, r in roots.items()}
+    return adj, reach
+
+
+def bounded_weighted_PFS(adj, v, theta, reach, V, directed=False):
+    """
+    Dijkstra depuis v (mode pondéré) arrêté dès que la closeness de v ne peut plus dépasser theta.
+    Après r sommets fixés (somme s), le sommet extrait à la distance l est atteignable, donc v en
+    atteint R ∈ [r + 1, reach], les R - r restants à distance ≥ l :
+        c_v ≤ f(R) = (R - 1)² / ((V - 1) · (s + (R - r) · l)).
+    En non orienté R = reach (composante connexe). En orienté reach (composante faiblement connexe)
+    n'est qu'un majorant et f n'est pas monotone en R (décroissante puis croissante) : la borne est
+    max(f(r + 1), f(reach)).
+    Retourne (closeness exacte ou None si élaguée, nombre de sommets fixés).
+    """
+    heappush, heappop = heapq.heappush, heapq.heappop
+    dist = {v: 0.0}
+    done = set()
+    s = 0.0
+    r = 0
+    Q = [(0.0, v)]
+    # f(R) < theta  <=>  s + (R - r) · l > (R - 1)² / ((V - 1) · theta)
+    scale = (V - 1) * theta if theta > 0 and V > 1 else 0.0
+    limit = (reach - 1) ** 2 / scale if scale > 0 else math.inf
+
+    while Q:
+        l, n = heappop(Q)
+        if n in done:
+            continue
+        if s + (reach - r) * l > limit and not (directed and s + l <= r * r / scale):
+            return None, r
+        done.add(n)
+        r += 1
+        s += l
+        for vprime, w in adj[n]:
+            lprime = l + w
+            old = dist.get(vprime)
+            if old is None or lprime < old:
+                dist[vprime] = lprime
+                heappush(Q, (lprime, vprime))
+    if s <= 0:
+        return None, r
+    return ((r - 1) ** 2) / ((V - 1) * s), r
+
+
+def weighted_root(adj, v, A, k, V, reach, stats=None, shared=None, directed=False):
+    """Mode pondéré : évalue v par un Dijkstra borné par θ_A et met à jour le top-k A."""
+    theta = min(A.values()) if len(A) == k else 0.0
+    if shared is not None:
+        # mode parallèle : seuil commun aux processus (voir efficient_closeness/parallel.py)
+        theta = shared.exchange(theta)
+    t0 = perf_counter()
+    c, settled = bounded_weighted_PFS(adj, v, theta, reach, V, directed)
+    if c is not None:
+        theta = update_topk(A, v, c, k)
+        if shared is not None:
+            shared.exchange(theta)
+    if stats is not None:
+        stats.record("PFS", t0)
+        stats.add("pfs_settled", settled)
+        stats.add("pruned", c is None)
+
+
+def weighted_order(G, samples=16, seed=0):
+    """
+    Ordre de traitement du mode pondéré : farness estimée par échantillonnage (Eppstein–Wang),
+    moyenne des distances depuis `samples` pivots tirés au hasard, croissante. Les sommets
+    centraux passent d'abord, le seuil θ_A monte vite et élague le plus de Dijkstra possible ;
+    l'ordre n'influe que sur la durée, pas sur le résultat.
+    """
+    import random
+    nodes = list(G.nodes())
+    rng = random.Random(seed)
+    total = defaultdict(float)
+    hits = defaultdict(int)
+    for p in rng.sample(nodes, min(samples, len(nodes))):
+        dist, _, _ = weighted_PFS(G, p, G._neighbors_cache, G._weights_cache)
+        for v, d in dist.items():
+            total[v] += d
+            hits[v] += 1
+    return sorted(nodes, key=lambda v: total[v] / hits[v] if hits[v] else math.inf)
+
+
+
+def process(G, p, L, s, A, S, k, V, delta_p, dead,neighbors_cache,weights_cache, stats=None, shared=None):
     """
     Étape de traitement récursif du sommet p :
     - calcule la centralité de p
@@ -377,14 +758,31 @@ def process(G, p, L, s, A, S, k, V, delta_p, dead,neighbors_cache,weights_cache)
 
     # 2- Mise à jour du top-k et récupération du seuil θ_A
     theta_A = update_topk(A, p, c_p, k)
-    #start_optimized = time.perf_counter()
-    prune(p, L, s, theta_A, S, delta_p, G,neighbors_cache,weights_cache)
-    #end_optimized = time.perf_counter()
-    #print(f"Prune Time: {end_optimized - start_optimized:.4f} seconds")
-   
+    if shared is not None:
+        # mode parallèle : seuil commun aux processus (voir efficient_closeness/parallel.py)
+        theta_A = shared.exchange(theta_A)
+    if stats is None:
+        prune(p, L, s, theta_A, S, delta_p, G,neighbors_cache,weights_cache)
+    else:
+        t0 = perf_counter()
+        stats.add("pruned", prune(p, L, s, theta_A, S, delta_p, G,neighbors_cache,weights_cache))
+        stats.record("prune", t0)
 
     # 3- Propagation à chaque successeur planifié
     for v in S.get(p, []):
+        if stats is None:
+            L, s2, delta_v, log_level = optimized_PFS(G, v, p, L, s, delta_p,neighbors_cache,weights_cache)
+            process(G, v, L, s2, A, S, k, V, delta_v, dead,neighbors_cache,weights_cache, shared=shared)
+            rollback(L, log_level)
+            continue
+
+        t0 = perf_counter()
         L, s2, delta_v, log_level = optimized_PFS(G, v, p, L, s, delta_p,neighbors_cache,weights_cache)
-        process(G, v, L, s2, A, S, k, V, delta_v, dead,neighbors_cache,weights_cache)
-        rollback(L, log_level) 
\ No newline at end of file
+        stats.record("delta_PFS", t0)
+        stats.add("delta_pfs_settled", len(log_level))
+        process(G, v, L, s2, A, S, k, V, delta_v, dead,neighbors_cache,weights_cache, stats, shared)
+        t0 = perf_counter()
+        rollback(L, log_level)
+        stats.record("rollback", t0)
+        stats.add("rollback_log", len(log_level))
+        stats.peak("rollback_log", len(log_level))
@@ -1,4 +1,5 @@
 from utils.graph_utils import get_city_graph, plot_city_graph
+from utils.pipeline import run_pipeline
 from classic_closeness.classic_closeness import closeness_centrality_all_nodes
 
 cities = [
@@ -14,8 +15,16 @@ cities = [
     "Annecy, France"
 ]
 
-for city in cities:
-    G = get_city_graph(city)
+
+def compute(city, G):
     closeness = closeness_centrality_all_nodes(G)
-    top5 = sorted(closeness, key=closeness.get, reverse=True)[:5]
+    return sorted(closeness, key=closeness.get, reverse=True)[:5]
+
+
+def render(city, G, top5):
     plot_city_graph(G, city, top_nodes=top5, mode="classic_no_oriented")
+
+
+if __name__ == "__main__":
+    # chargement de la ville suivante et rendu de la précédente pendant le calcul
+    run_pipeline(cities, get_city_graph, compute, render)
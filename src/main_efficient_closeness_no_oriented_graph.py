@@ -1,4 +1,5 @@
 from utils.graph_utils import get_city_graph, plot_city_graph
+from utils.pipeline import run_pipeline
 from efficient_closeness.top_k_closeness import top_k_closeness
 
 cities = [
@@ -16,11 +17,17 @@ cities = [
 
 k = 5
 
-for city in cities:
-    G = get_city_graph(city)
-    A = top_k_closeness(G, k)
 
+def compute(city, G):
+    A = top_k_closeness(G, k)
     topk_sorted = sorted(A.items(), key=lambda x: x[1], reverse=True)[:k]
-    top_nodes = [n for n, _ in topk_sorted]
+    return [n for n, _ in topk_sorted]
+
 
+def render(city, G, top_nodes):
     plot_city_graph(G, city, top_nodes=top_nodes, mode="efficient_no_oriented")
+
+
+if __name__ == "__main__":
+    # chargement de la ville suivante et rendu de la précédente pendant le calcul
+    run_pipeline(cities, get_city_graph, compute, render)
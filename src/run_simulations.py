@@ -0,0 +1,192 @@
+import os
+import sys
+import argparse
+import importlib
+import subprocess
+
+from utils.orchestrator import Task, run_tasks
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+STATE_PATH = os.path.join(BASE_DIR, "results", "simulations_state.json")
+
+CITIES = [
+    "Paris, France",
+    "Lyon, France",
+    "Marseille, France",
+    "Toulouse, France",
+    "Bordeaux, France",
+    "Nice, France",
+    "Nantes, France",
+    "Dijon, France",
+    "Reims, France",
+    "Annecy, France"
+]
+
+# Sources dont dépend chaque moteur (une modification relance les tâches concernées)
+GRAPH_SOURCES = ("utils/graph_utils.py", "utils/overpass_cache.py")
+CLASSIC_SOURCES = ("classic_closeness/classic_closeness.py", "utils/csr_graph.py")
+EFFICIENT_SOURCES = ("efficient_closeness/top_k_closeness.py", "efficient_closeness/Sketch.py", "utils/csr_graph.py")
+TEMPORAL_SOURCES = ("temporal_closeness/benchmark_osmnx.py", "temporal_closeness/topk_temporal_closeness.py",
+                    "temporal_closeness/fastest_path.py", "temporal_closeness/temporal_graph.py")
+
+MAIN_SCRIPTS = [
+    # (script, variante du graphe, sources du moteur)
+    ("main_classic_closeness_no_oriented_graph", "no_oriented", CLASSIC_SOURCES),
+    ("main_classic_closeness_oriented_graph", "oriented", CLASSIC_SOURCES),
+    ("main_efficient_closeness_no_oriented_graph", "no_oriented", EFFICIENT_SOURCES),
+    ("main_efficient_closeness_oriented_graph", "oriented", EFFICIENT_SOURCES),
+]
+COMPARE_SCRIPTS = [
+    ("compare_algorithms_no_oriented_graph", "no_oriented"),
+    ("compare_algorithms_oriented_graph", "oriented"),
+]
+
+
+# ------------------------------------------------------------
+# Fonctions exécutées par les processus de travail
+# ------------------------------------------------------------
+def graph_path(variant, city):
+    """data/<Ville>.graphml (non orienté, comme get_city_graph) ou data/oriented/<Ville>.graphml."""
+    name = city.replace(", ", "_").replace(" ", "_") + ".graphml"
+    if variant == "oriented":
+        return os.path.join(BASE_DIR, "data", "oriented", name)
+    return os.path.join(BASE_DIR, "data", name)
+
+
+def prepare_graph(city, offline=False):
+    """
+    Télécharge (ou reconstruit) le graphe orienté de la ville une seule fois et écrit les deux
+    variantes : data/oriented/<Ville>.graphml et data/<Ville>.graphml (G.to_undirected(), comme
+    get_city_graph). Les tâches suivantes relisent ces fichiers sans retélécharger ni réécrire.
+    """
+    from utils.graph_utils import get_oriented_city_graph, save_graph
+    G = get_oriented_city_graph(city, save_local=False, offline=offline)
+    for variant, graph in (("oriented", G), ("no_oriented", G.to_undirected())):
+        path = graph_path(variant, city)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        save_graph(graph, path)
+    return [G.number_of_nodes(), G.number_of_edges()]
+
+
+def _load(variant, city):
+    from utils.graph_utils import load_graph
+    return load_graph(graph_path(variant, city))
+
+
+def run_main_city(script, variant, city):
+    """Calcul et rendu d'une ville pour un script main_* (fonctions compute / render)."""
+    module = importlib.import_module(script)
+    G = _load(variant, city)
+    top = module.compute(city, G)
+    module.render(city, G, top)
+    return [str(v) for v in top]
+
+
+def run_compare_city(script, variant, city):
+    """Mesures Classic / Efficient d'une ville pour un script compare_* (résultat de compare_top5)."""
+    module = importlib.import_module(script)
+    G = _load(variant, city)
+    return list(module.compare_top5(city, G))
+
+
+def compare_summary(script, results):
+    """Tableau résumé et graphiques d'un script compare_* à partir des mesures par ville."""
+    module = importlib.import_module(script)
+    module.write_summary([module.result_row(*row) for row in results])
+
+
+def _import_temporal_benchmark():
+    temporal_dir = os.path.join(SRC_DIR, "temporal_closeness")
+    if temporal_dir not in sys.path:
+        sys.path.append(temporal_dir)
+    return importlib.import_module("benchmark_osmnx")
+
+
+def run_temporal_city(city):
+    res = _import_temporal_benchmark().benchmark_city_graph(_load("oriented", city), city, k=5)
+    return [res] if res else []
+
+
+def temporal_summary(results):
+    benchmark = _import_temporal_benchmark()
+    results_dir = os.path.join(BASE_DIR, "results")
+    os.makedirs(results_dir, exist_ok=True)
+    rows = [row for city_rows in results for row in city_rows]
+    benchmark.write_results(rows, os.path.join(results_dir, "results_osmnx_algo2_oriented.csv"))
+
+
+def run_script(path):
+    """Script non découpable (ex. Wiki-Vote) : lancé tel quel dans un sous-processus."""
+    subprocess.run([sys.executable, os.path.join(SRC_DIR, path)], check=True, cwd=BASE_DIR)
+
+
+# ------------------------------------------------------------
+# Graphe des tâches
+# ------------------------------------------------------------
+def build_tasks(cities=CITIES, offline=False, temporal=True):
+    tasks = []
+    here = "run_simulations:"
+
+    for city in cities:
+        # un seul téléchargement par ville ; les deux variantes sont écrites par la même tâche
+        tasks.append(Task(f"graph/{city}", here + "prepare_graph", (city, offline), sources=GRAPH_SOURCES))
+
+    for script, variant, engine_sources in MAIN_SCRIPTS:
+        for city in cities:
+            tasks.append(Task(f"{script}/{city}", here + "run_main_city", (script, variant, city),
+                              deps=(f"graph/{city}",),
+                              sources=(script + ".py",) + engine_sources))
+
+    for script, variant in COMPARE_SCRIPTS:
+        city_tasks = []
+        for city in cities:
+            name = f"{script}/{city}"
+            city_tasks.append(name)
+            tasks.append(Task(name, here + "run_compare_city", (script, variant, city),
+                              deps=(f"graph/{city}",),
+                              sources=(script + ".py",) + CLASSIC_SOURCES + EFFICIENT_SOURCES))
+        tasks.append(Task(f"{script}/résumé", here + "compare_summary", (script,), deps=city_tasks,
+                          sources=(script + ".py",), pass_results=True))
+
+    tasks.append(Task("compare_algorithms_oriented_others", here + "run_script",
+                      ("compare_algorithms_oriented_others.py",),
+                      sources=("compare_algorithms_oriented_others.py", "utils/edgelist.py")
+                      + CLASSIC_SOURCES + EFFICIENT_SOURCES))
+
+    if temporal:
+        city_tasks = []
+        for city in cities:
+            name = f"temporal/{city}"
+            city_tasks.append(name)
+            tasks.append(Task(name, here + "run_temporal_city", (city,), deps=(f"graph/{city}",),
+                              sources=TEMPORAL_SOURCES))
+        tasks.append(Task("temporal/résumé", here + "temporal_summary", deps=city_tasks,
+                          sources=("temporal_closeness/benchmark_osmnx.py",), pass_results=True))
+    return tasks
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Lance toutes les simulations (scripts × villes) en parallèle, avec reprise sur incident."
+    )
+    parser.add_argument("--workers", type=int, default=None, help="processus en parallèle (défaut : nombre de cœurs)")
+    parser.add_argument("--cities", nargs="+", default=CITIES)
+    parser.add_argument("--tasks", nargs="+", metavar="MOTIF",
+                        help="ne lance que les tâches dont le nom correspond (fnmatch), ex: 'main_efficient*'")
+    parser.add_argument("--only-failed", action="store_true", help="ne relance que les tâches en échec")
+    parser.add_argument("--force", action="store_true", help="ignore le point de reprise et relance tout")
+    parser.add_argument("--dry-run", action="store_true", help="affiche les tâches à exécuter sans les lancer")
+    parser.add_argument("--offline", action="store_true", help="reconstruit les graphes depuis le cache Overpass")
+    parser.add_argument("--no-temporal", action="store_true", help="sans le benchmark temporel")
+    parser.add_argument("--state", default=STATE_PATH, help="fichier du point de reprise")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    tasks = build_tasks(args.cities, offline=args.offline, temporal=not args.no_temporal)
+    state = run_tasks(tasks, args.state, workers=args.workers, only_failed=args.only_failed,
+                      force=args.force, patterns=args.tasks, dry_run=args.dry_run)
+    if any(state.get(t.name, {}).get("status") in ("failed", "blocked") for t in tasks):
+        raise SystemExit(1)
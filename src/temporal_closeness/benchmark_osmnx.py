@@ -6,9 +6,6 @@ import os
 import time
 import random
 import csv
-import osmnx as ox
-import networkx as nx
-import matplotlib.pyplot as plt
 
 from temporal_graph import TemporalGraph
 from topk_temporal_closeness import topk_temporal_closeness
@@ -41,6 +38,7 @@ def get_largest_component(G):
     """
     Récupère la plus grande composante fortement connexe (pour graphe orienté).
     """
+    import networkx as nx
     comps = list(nx.strongly_connected_components(G))
     largest = max(comps, key=len)
     return G.subgraph(largest).copy()
@@ -49,40 +47,22 @@ def get_largest_component(G):
 # ------------------------------------------------------------
 # Visualisation des Top-k sur le graphe routier
 # ------------------------------------------------------------
-def plot_topk_on_city(G_static, topk_nodes, city, save_dir):
+def plot_topk_on_city(G_static, topk_nodes, city, save_dir, dpi=300):
     """
     Affiche le graphe routier d'une ville avec les Top-k sommets mis en évidence.
     - G_static : graphe OSMnx (statique)
     - topk_nodes : liste des identifiants de nœuds à surligner
     - city : nom de la ville
     - save_dir : dossier où sauvegarder l’image
+    Le fond de carte (réseau seul) est rendu une fois par ville et réutilisé (utils/map_render.py).
     """
-    fig, ax = ox.plot_graph(
-        G_static,
-        node_size=0,
-        edge_color="white",
-        bgcolor="black",
-        show=False,
-        close=False
-    )
-
-    node_x = [G_static.nodes[n]["x"] for n in topk_nodes if n in G_static.nodes]
-    node_y = [G_static.nodes[n]["y"] for n in topk_nodes if n in G_static.nodes]
-
-    if len(node_x) == 0:
-        print(" Aucun nœud top-k trouvé dans le graphe statique ! (vérifie les IDs)")
-    else:
-        ax.scatter(node_x, node_y, c="red", s=50, label="Top closeness", zorder=3)
-        for i, (x, y) in enumerate(zip(node_x, node_y)):
-            ax.text(x, y, f"{i+1}", color="white", fontsize=6, zorder=4)
+    from utils.map_render import render_topk_maps, node_positions
 
-    ax.legend(facecolor="black", edgecolor="white", labelcolor="white")
-    ax.set_title(f"{city} (orienté)", color="white")
+    if not node_positions(G_static, topk_nodes):
+        print(" Aucun nœud top-k trouvé dans le graphe statique ! (vérifie les IDs)")
 
-    os.makedirs(save_dir, exist_ok=True)
     path = os.path.join(save_dir, f"{city.replace(',', '').replace(' ', '_')}_oriented.png")
-    plt.savefig(path, dpi=300, bbox_inches="tight", facecolor="black")
-    plt.close(fig)
+    render_topk_maps(G_static, city, [(topk_nodes, path, f"{city} (orienté)")], style="dark", dpi=dpi)
 
     print(f" Graphe sauvegardé dans : {path}")
 
@@ -147,6 +127,7 @@ def benchmark_city(city, k=5, T_max=100, interval=(0, 100)):
     print(f"\n {city}")
     results_city = []
 
+    import osmnx as ox
     G_oriented = ox.graph_from_place(city, network_type="drive")
     res_oriented = benchmark_city_graph(G_oriented, city, k, T_max, interval)
     if res_oriented:
@@ -155,6 +136,24 @@ def benchmark_city(city, k=5, T_max=100, interval=(0, 100)):
     return results_city
 
 
+# ------------------------------------------------------------
+# Sauvegarde CSV
+# ------------------------------------------------------------
+def write_results(results, csv_path):
+    if results:
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=["city", "nodes", "edges", "k", "algo2_time_s", "oriented"]
+            )
+            writer.writeheader()
+            writer.writerows(results)
+
+        print(f"\n Résultats enregistrés dans : {csv_path}")
+    else:
+        print(" Aucun résultat à enregistrer")
+
+
 # ------------------------------------------------------------
 # Exécution sur plusieurs villes
 # ------------------------------------------------------------
@@ -184,16 +183,4 @@ if __name__ == "__main__":
             results.extend(city_results)
         print(f"{'=' * 70}")
 
-    # Sauvegarde CSV
-    if results:
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["city", "nodes", "edges", "k", "algo2_time_s", "oriented"]
-            )
-            writer.writeheader()
-            writer.writerows(results)
-
-        print(f"\n Résultats enregistrés dans : {csv_path}")
-    else:
-        print(" Aucun résultat à enregistrer")
+    write_results(results, csv_path)
@@ -0,0 +1,214 @@
+# ==========================================
+# Top-k Temporal Closeness en flux (fenêtre glissante)
+# ==========================================
+
+import os
+import sys
+import heapq
+import time
+from collections import defaultdict, deque, Counter
+from temporal_graph import TemporalGraph, TemporalEdge
+from topk_temporal_closeness import _source_closeness, source_upper_bound
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.anytime import snapshot
+
+
+class WindowTemporalGraph(TemporalGraph):
+    """
+    Graphe temporel limité à une fenêtre glissante : les arêtes arrivent par t croissant
+    et celles qui sortent de la fenêtre sont supprimées (mémoire bornée par la fenêtre).
+    Les listes sortantes sont des deques triées par t : l'arête la plus ancienne d'un
+    sommet est toujours en tête, l'expiration se fait en O(1) par arête.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.adj = defaultdict(deque)
+        self.edges = deque()        # toutes les arêtes, dans l'ordre d'arrivée
+        self.degree = Counter()     # arêtes (entrantes + sortantes) par sommet
+        self.now = None
+
+    def add_edge(self, u, v, t, l):
+        if self.now is not None and t < self.now:
+            raise ValueError(f"Arête hors ordre : t={t} < {self.now}")
+        self.now = t
+        edge = TemporalEdge(u, v, t, l)
+        self.adj[u].append(edge)
+        self.edges.append(edge)
+        self.V.update([u, v])
+        self.degree[u] += 1
+        self.degree[v] += 1
+        return edge
+
+    def expire(self, before):
+        """Supprime les arêtes de t < before ; retourne la liste des arêtes supprimées."""
+        removed = []
+        while self.edges and self.edges[0].t < before:
+            edge = self.edges.popleft()
+            out = self.adj[edge.u]
+            out.popleft()
+            if not out:
+                del self.adj[edge.u]
+            for w in (edge.u, edge.v):
+                self.degree[w] -= 1
+                if not self.degree[w]:
+                    del self.degree[w]
+                    self.V.discard(w)
+            removed.append(edge)
+        return removed
+
+
+class StreamingTemporalCloseness:
+    """
+    Top-k de la closeness temporelle maintenu sur un flux d'arêtes (u, v, t, λ) ordonné par t,
+    sur la fenêtre [now - horizon, +∞) : les arêtes plus anciennes que l'horizon expirent.
+
+    Le top-k est publié toutes les `every` unités de temps du flux (callback(snapshot), voir
+    utils/anytime.py, avec en plus "time" et "window"), sans reconstruire le graphe ni tout
+    recalculer :
+    - une arête ajoutée ou expirée (a -> b) ne peut changer que la closeness des sources
+      qui atteignent a dans la fenêtre (parcours inverse sans contrainte de temps, qui
+      contient les sources atteignant a par un chemin temporel) : ces sources sont marquées
+      « sales », les autres gardent leur valeur ;
+    - à la publication, les sources sales reçoivent la borne de source_upper_bound, puis
+      les sources sans valeur exacte sont traitées par borne décroissante jusqu'à ce que le
+      seuil du top-k dépasse la borne suivante (comme iter_topk_temporal_closeness). Une
+      source écartée par le pruning garde le seuil courant comme borne supérieure.
+
+        stream = StreamingTemporalCloseness(k=10, horizon=3600, every=300, callback=print)
+        for (u, v, t, l) in events:
+            stream.add_edge(u, v, t, l)
+        stream.publish()
+    """
+
+    def __init__(self, k, horizon, every=None, callback=None):
+        self.k = k
+        self.horizon = horizon
+        self.every = every
+        self.callback = callback
+        self.G = WindowTemporalGraph()
+        self.exact = {}      # source propre -> closeness exacte dans la fenêtre
+        self.upper = {}      # source propre écartée -> borne supérieure de sa closeness
+        self.touched = set() # sommets origine d'une arête ajoutée ou expirée depuis la publication
+        self.next_publish = None
+        self.last = None
+
+    # ---------------- ingestion ----------------
+    def add_edge(self, u, v, t, l):
+        """Ajoute une arête du flux ; publie le top-k si l'échéance de la cadence est passée."""
+        if self.every is not None and self.next_publish is not None and t >= self.next_publish:
+            self.publish()
+        self.G.add_edge(u, v, t, l)
+        self.touched.add(u)
+        for edge in self.G.expire(t - self.horizon):
+            self.touched.add(edge.u)
+        if self.next_publish is None and self.every is not None:
+            self.next_publish = t + self.every
+        return self.last
+
+    def extend(self, edges):
+        """Ingère une suite d'arêtes (u, v, t, λ) ; retourne le dernier snapshot publié."""
+        for u, v, t, l in edges:
+            self.add_edge(u, v, t, l)
+        return self.last
+
+    # ---------------- sources à recalculer ----------------
+    def _dirty(self):
+        """Sources qui atteignent un sommet touché dans la fenêtre courante."""
+        if not self.touched:
+            return set()
+        radj = defaultdict(set)
+        for u, out in self.G.adj.items():
+            for e in out:
+                radj[e.v].add(u)
+        seen = set(self.touched)
+        stack = list(seen)
+        while stack:
+            v = stack.pop()
+            for u in radj.get(v, ()):
+                if u not in seen:
+                    seen.add(u)
+                    stack.append(u)
+        self.touched = set()
+        return seen
+
+    # ---------------- publication ----------------
+    def publish(self):
+        """Met à jour le top-k sur la fenêtre courante et le publie (callback) ; retourne le snapshot."""
+        t0 = time.perf_counter()
+        G = self.G
+        now = G.now if G.now is not None else 0
+        interval = (now - self.horizon, float("inf"))
+        if self.every is not None:
+            self.next_publish = now + self.every
+
+        for u in self._dirty():
+            self.exact.pop(u, None)
+            self.upper.pop(u, None)
+        for table in (self.exact, self.upper):
+            for u in [u for u in table if u not in G.V]:
+                del table[u]
+
+        delta = 0.0
+        lambda_min = min((e.l for e in G.edges), default=1.0)
+        for u in G.V:
+            if u not in self.exact and u not in self.upper:
+                self.upper[u] = source_upper_bound(G, u, interval, lambda_min)
+
+        topk = heapq.nlargest(self.k, ((c, u) for u, c in self.exact.items()))
+        heapq.heapify(topk)
+        pending = sorted(self.upper, key=self.upper.get, reverse=True)
+        computed = 0
+        for u in pending:
+            B_k = topk[0][0] if len(topk) == self.k else 0.0
+            if len(topk) == self.k and B_k >= self.upper[u]:
+                break
+            c_u = _source_closeness(G, u, interval, B_k, delta, lambda_min)
+            computed += 1
+            if c_u >= B_k:
+                # exploration complète : valeur exacte
+                del self.upper[u]
+                self.exact[u] = c_u
+                heapq.heappush(topk, (c_u, u))
+                if len(topk) > self.k:
+                    heapq.heappop(topk)
+            else:
+                # élaguée (ou complète mais sous le seuil) : closeness < B_k
+                self.upper[u] = B_k
+
+        bound = max(self.upper.values(), default=0.0)
+        ranked = [(u, c) for c, u in sorted(topk, reverse=True)]
+        snap = snapshot(ranked, bound, computed, len(G.V), t0, complete=True)
+        snap.update(time=now, window=[now - self.horizon, now], edges=len(G.edges))
+        self.last = snap
+        if self.callback is not None:
+            self.callback(snap)
+        return snap
+
+
+def stream_topk_temporal_closeness(edges, k, horizon, every):
+    """
+    Générateur : ingère les arêtes (u, v, t, λ) ordonnées par t et rend le top-k publié
+    toutes les `every` unités de temps, puis une dernière fois à la fin du flux.
+    """
+    published = []
+    stream = StreamingTemporalCloseness(k, horizon, every=every, callback=published.append)
+    for u, v, t, l in edges:
+        stream.add_edge(u, v, t, l)
+        while published:
+            yield published.pop(0)
+    yield stream.publish()
+
+
+# Test local
+if __name__ == "__main__":
+    import random
+
+    random.seed(1)
+    events = sorted(((random.randrange(30), random.randrange(30), t, random.randint(1, 5))
+                     for t in range(1, 2000)), key=lambda e: e[2])
+    start_time = time.perf_counter()
+    for snap in stream_topk_temporal_closeness(events, k=3, horizon=200, every=250):
+        print(f"t={snap['time']:>5} arêtes={snap['edges']:>4} recalculées={snap['processed']:>3} top-3={snap['topk']}")
+    print("\n Temps total d'exécution : {:.6f} secondes".format(time.perf_counter() - start_time))
@@ -2,68 +2,160 @@
 # Algorithm 2 : Top-k Temporal Closeness
 # ==========================================
 
+import os
+import sys
 from temporal_graph import TemporalGraph
 from fastest_path import incremental_fastest_paths
 import heapq
 import time
 
+# accès aux utilitaires partagés (src/utils) quand le module est lancé depuis son dossier
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.result_cache import cached
+from utils.checkpoint import as_checkpoint
+from utils.anytime import snapshot, run_anytime
+from utils.instrumentation import phase
+
 # L'algorithme de calcul de la borne supérieure de la closeness
 def compute_upper_bound(S_F, len_T, len_R, len_F, d_next, delta, lambda_min):
     """Calcule la borne supérieure de la closeness courante."""
     return S_F + (len_T / d_next) + ((len_R - len_F - len_T) / (d_next + delta + lambda_min))
 
+def _source_closeness(G, u, interval, B_k, delta, lambda_min):
+    """
+    Closeness temporelle de la source u, avec pruning : l'exploration s'arrête dès que la
+    borne supérieure passe sous le seuil B_k (la valeur rendue est alors partielle, < B_k).
+    """
+    S_F = 0.0
+    F = set()
+    T = set()
+    len_R = len(G.V)  # approximation du nombre de sommets atteignables
+
+    # On explore le graphe temporel en direct
+    for (v, duration, d_next) in incremental_fastest_paths(G, u, interval):
+        if duration == 0:
+            continue
+
+        F.add(v)
+        S_F += 1.0 / duration
+
+        # mise à jour de la frontière
+        for e in G.adj[v]:
+            if e.v not in F:
+                T.add(e.v)
+
+        # calcul de la borne supérieure
+        c_hat = compute_upper_bound(S_F, len(T), len_R, len(F), d_next, delta, lambda_min)
+
+        # pruning (si la borne < seuil top-k)
+        if c_hat < B_k:
+            break
+
+    return S_F
+
 # Algorithme principal de calcul du top-k temporal closeness avec pruning
 # L'idée principale est d'utiliser le générateur incremental_fastest_paths pour explorer le graphe temporel
 # et de calculer une borne supérieure de la closeness à chaque étape pour décider si on continue l'exploration ou pas.
-def topk_temporal_closeness(G: TemporalGraph, k: int, interval=(0, 100)):
+@cached("topk_temporal_closeness", params=("k", "interval"))
+def topk_temporal_closeness(G: TemporalGraph, k: int, interval=(0, 100), checkpoint=None, stats=None):
     """
     Calcule le Top-k des sommets selon la centralité temporelle,
     avec pruning (arrêt anticipé) pendant le parcours.
-    """
-    topk = []      # [(closeness, node)]
-    B_k = 0.0      # seuil minimal du top-k
 
-    sources = sorted(G.V, key=lambda u: len(G.adj[u]), reverse=True)
+    checkpoint : chemin (ou utils.checkpoint.Checkpoint) d'un point de reprise ; le top-k,
+    le seuil et l'ordre des sources déjà traitées y sont sauvegardés périodiquement entre
+    deux sources, et un appel avec le même chemin reprend là où le calcul s'était arrêté.
+    stats : utils.instrumentation.Stats (ou MemoryProfiler), phases "order" (tri des sources)
+    et "search" (parcours temporels et listes d'étiquettes Π).
+    """
+    ckpt = as_checkpoint(checkpoint, G, "topk_temporal_closeness", {"k": k, "interval": interval})
+    state = ckpt.load() if ckpt is not None else None
+
+    if state is None:
+        topk = []      # [(closeness, node)]
+        B_k = 0.0      # seuil minimal du top-k
+        with phase(stats, "order"):
+            sources = sorted(G.V, key=lambda u: len(G.adj[u]), reverse=True)
+        start = 0
+    else:
+        # l'ordre des sources est repris tel quel (les ex æquo dépendent de l'ordre de G.V)
+        topk, B_k, sources, start = state["topk"], state["B_k"], state["sources"], state["next"]
 
     delta = 0.0
     lambda_min = min(e.l for edges in G.adj.values() for e in edges)
 
-    for u in sources:
-        S_F = 0.0
-        F = set()
-        T = set()
-        len_R = len(G.V)  # approximation du nombre de sommets atteignables
+    with phase(stats, "search"):
+        for i in range(start, len(sources)):
+            u = sources[i]
+            c_u = _source_closeness(G, u, interval, B_k, delta, lambda_min)
 
-        # On explore le graphe temporel en direct
-        for (v, duration, d_next) in incremental_fastest_paths(G, u, interval):
-            if duration == 0:
-                continue
+            # mise à jour du top-k
+            heapq.heappush(topk, (c_u, u))
+            if len(topk) > k:
+                heapq.heappop(topk)
+            B_k = topk[0][0]
 
-            F.add(v)
-            S_F += 1.0 / duration
+            if ckpt is not None:
+                ckpt.maybe_save(lambda: {"topk": topk, "B_k": B_k, "sources": sources, "next": i + 1})
 
-            # mise à jour de la frontière
-            for e in G.adj[v]:
-                if e.v not in F:
-                    T.add(e.v)
+    if ckpt is not None:
+        ckpt.done()
+    return sorted(topk, reverse=True)
 
-            # calcul de la borne supérieure
-            c_hat = compute_upper_bound(S_F, len(T), len_R, len(F), d_next, delta, lambda_min)
 
-            # pruning (si la borne < seuil top-k)
-            if c_hat < B_k:
-                break
+def source_upper_bound(G, u, interval, lambda_min):
+    """
+    Borne supérieure de la closeness de u avant toute exploration : ses d voisins directs
+    sont atteints en au moins lambda_min, les autres sommets en au moins 2·lambda_min.
+    Un départ à t = 0 remet le début du trajet à zéro (voir incremental_fastest_paths) :
+    on ne garde alors que la borne lambda_min pour tous les sommets.
+    """
+    out = G.get_out_edges(u, interval)
+    d = len({e.v for e in out if e.v != u})
+    others = len(G.V) - 1 - d
+    if any(e.t == 0 for e in out):
+        return (d + others) / lambda_min
+    return d / lambda_min + others / (2 * lambda_min)
 
-        # closeness finale pour ce sommet
-        c_u = S_F
 
-        # mise à jour du top-k
+def iter_topk_temporal_closeness(G: TemporalGraph, k: int, interval=(0, 100)):
+    """
+    Top-k temporel « anytime » : générateur de snapshots (voir utils/anytime.py), un par
+    source traitée. Les sources sont prises par borne supérieure décroissante ; le seuil
+    de pruning n'est utilisé qu'une fois le top-k rempli, si bien que ses valeurs sont
+    exactes, et le calcul s'arrête dès que ce seuil atteint la borne de la source suivante.
+    """
+    t0 = time.perf_counter()
+    delta = 0.0
+    lambda_min = min((e.l for edges in G.adj.values() for e in edges), default=1.0)
+    bounds = {u: source_upper_bound(G, u, interval, lambda_min) for u in G.V}
+    sources = sorted(G.V, key=bounds.get, reverse=True)
+    topk = []  # [(closeness, node)]
+
+    def current(i, complete):
+        bound = bounds[sources[i]] if i < len(sources) else 0.0
+        ranked = [(u, c) for c, u in sorted(topk, reverse=True)]
+        return snapshot(ranked, bound, i, len(sources), t0, complete)
+
+    for i, u in enumerate(sources):
+        B_k = topk[0][0] if len(topk) == k else 0.0
+        if len(topk) == k and B_k >= bounds[u]:
+            yield current(i, True)
+            return
+        c_u = _source_closeness(G, u, interval, B_k, delta, lambda_min)
         heapq.heappush(topk, (c_u, u))
         if len(topk) > k:
             heapq.heappop(topk)
-        B_k = topk[0][0]
+        if i + 1 < len(sources):
+            yield current(i + 1, False)
+    yield current(len(sources), True)
 
-    return sorted(topk, reverse=True)
+
+def topk_temporal_closeness_anytime(G: TemporalGraph, k: int, interval=(0, 100),
+                                    time_budget=None, work_budget=None, callback=None):
+    """Top-k temporel sous budget (secondes / nombre de sources) : dernier snapshot obtenu."""
+    return run_anytime(iter_topk_temporal_closeness(G, k, interval),
+                       time_budget=time_budget, work_budget=work_budget, callback=callback)
 
 
 # Test local 
@@ -0,0 +1,49 @@
+import time
+
+
+def snapshot(topk, bound, processed, total, t0, complete=False):
+    """
+    État courant d'un calcul de top-k « anytime » :
+
+    - topk : [(sommet, centralité)] triés par centralité décroissante (valeurs exactes)
+    - bound : plus grande borne supérieure des sommets pas encore traités
+    - certified : sommets du top-k dont la place est prouvée (centralité >= bound :
+      aucun sommet restant ne peut les dépasser)
+    - complete : plus rien ne peut entrer dans le top-k, qui est alors entièrement certifié
+    """
+    if complete:
+        bound = 0.0
+    return {
+        "topk": topk,
+        "certified": [v for v, c in topk if c >= bound],
+        "bound": bound,
+        "threshold": topk[-1][1] if topk else 0.0,
+        "processed": processed,
+        "total": total,
+        "elapsed_s": time.perf_counter() - t0,
+        "complete": complete,
+    }
+
+
+def run_anytime(snapshots, time_budget=None, work_budget=None, callback=None):
+    """
+    Consomme un générateur de snapshots jusqu'à la fin du calcul ou l'épuisement du budget :
+    time_budget en secondes, work_budget en nombre de sources traitées. callback(snapshot)
+    est appelé à chaque amélioration (affichage progressif). Retourne le dernier snapshot.
+    """
+    t0 = time.perf_counter()
+    last = None
+    try:
+        for snap in snapshots:
+            last = snap
+            if callback is not None:
+                callback(snap)
+            if snap["complete"]:
+                break
+            if time_budget is not None and time.perf_counter() - t0 >= time_budget:
+                break
+            if work_budget is not None and snap["processed"] >= work_budget:
+                break
+    finally:
+        snapshots.close()
+    return last
@@ -0,0 +1,73 @@
+import os
+import time
+import pickle
+
+from utils.result_cache import graph_fingerprint
+
+# Version du format des points de reprise : à incrémenter si l'état sauvegardé change de forme
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """
+    Point de reprise d'un calcul de top-k long (moteur efficient ou temporel).
+
+    Les moteurs appellent maybe_save(state) entre deux sources ; l'état n'est écrit que si
+    `every` secondes se sont écoulées depuis la dernière sauvegarde (écriture atomique :
+    fichier temporaire + os.replace, un arrêt pendant l'écriture laisse l'ancien point intact).
+    Au redémarrage, load() rend le dernier état si le graphe et les paramètres sont les mêmes.
+
+        top_k_closeness(G, 10, checkpoint="marseille.ckpt")   # reprend si le fichier existe
+    """
+
+    def __init__(self, path, every=60.0, keep=False):
+        self.path = path
+        self.every = every
+        self.keep = keep  # conserver le fichier une fois le calcul terminé
+        self._last = time.monotonic()
+        self._key = None
+
+    def bind(self, G, algorithm, params):
+        """Associe le point de reprise à un graphe et à des paramètres (k, intervalle...)."""
+        self._key = (CHECKPOINT_VERSION, algorithm, sorted(params.items()), graph_fingerprint(G))
+        return self
+
+    def load(self):
+        """Dernier état sauvegardé pour ce calcul, ou None."""
+        try:
+            with open(self.path, "rb") as f:
+                key, state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        if key != self._key:
+            raise ValueError(f"Le point de reprise {self.path} correspond à un autre graphe ou à d'autres paramètres")
+        return state
+
+    def save(self, state):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((self._key, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._last = time.monotonic()
+
+    def maybe_save(self, state_fn):
+        """Sauvegarde state_fn() si l'intervalle est écoulé (l'état n'est construit qu'à ce moment)."""
+        if time.monotonic() - self._last >= self.every:
+            self.save(state_fn())
+
+    def done(self):
+        if not self.keep:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def as_checkpoint(checkpoint, G, algorithm, params):
+    """Accepte un chemin ou un objet Checkpoint (ou None) et le lie au calcul courant."""
+    if checkpoint is None:
+        return None
+    if not isinstance(checkpoint, Checkpoint):
+        checkpoint = Checkpoint(checkpoint)
+    return checkpoint.bind(G, algorithm, params)
@@ -0,0 +1,349 @@
+import os
+import json
+import math
+import tempfile
+import numpy as np
+
+# Version du format disque (à incrémenter si la structure des fichiers change)
+CSR_FORMAT_VERSION = 1
+
+
+class CSRGraph:
+    """
+    Graphe compact au format CSR (Compressed Sparse Row), indexé par des entiers 0..n-1.
+
+    - offsets[u] .. offsets[u+1] délimitent les successeurs de u dans targets / weights
+    - in_offsets / in_sources / in_weights : même chose pour les prédécesseurs (graphe orienté)
+    - node_ids[i] : identifiant d'origine (ex: id OSM) du sommet i
+    - x / y : coordonnées des sommets si disponibles (graphes OSMnx)
+
+    Les tableaux peuvent être des np.memmap (voir load_csr) : les moteurs travaillent
+    directement dessus, sans étape de chargement en mémoire.
+    L'objet expose le petit sous-ensemble de l'API networkx utilisé par les moteurs
+    (nodes, successors, predecessors, neighbors, edges, is_directed).
+    """
+
+    def __init__(self, offsets, targets, weights, node_ids, directed=True,
+                 in_offsets=None, in_sources=None, in_weights=None, x=None, y=None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.node_ids = node_ids
+        self.directed = directed
+        # graphe non orienté : les arcs sont stockés dans les deux sens, prédécesseurs = successeurs
+        self.in_offsets = offsets if in_offsets is None else in_offsets
+        self.in_sources = targets if in_sources is None else in_sources
+        self.in_weights = weights if in_weights is None else in_weights
+        self.x = x
+        self.y = y
+
+    # ---------------- API "networkx-like" ----------------
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def number_of_nodes(self):
+        return len(self.offsets) - 1
+
+    def number_of_edges(self):
+        m = len(self.targets)
+        return m if self.directed else m // 2
+
+    def nodes(self):
+        return range(len(self.offsets) - 1)
+
+    def is_directed(self):
+        return self.directed
+
+    def successors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]].tolist()
+
+    def neighbors(self, u):
+        return self.successors(u)
+
+    def predecessors(self, u):
+        return self.in_sources[self.in_offsets[u]:self.in_offsets[u + 1]].tolist()
+
+    def out_degree(self, u):
+        return int(self.offsets[u + 1] - self.offsets[u])
+
+    def edge_weight(self, u, v, default=1.0):
+        """Poids de l'arc (u, v) par recherche dichotomique (les successeurs sont triés)."""
+        lo, hi = int(self.offsets[u]), int(self.offsets[u + 1])
+        j = lo + int(np.searchsorted(self.targets[lo:hi], v))
+        if j < hi and self.targets[j] == v:
+            return float(self.weights[j])
+        return default
+
+    def edges(self, data=False):
+        """Itère sur les arcs (une seule fois par arête si non orienté)."""
+        for u in range(self.number_of_nodes()):
+            lo, hi = int(self.offsets[u]), int(self.offsets[u + 1])
+            for v, w in zip(self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist()):
+                if not self.directed and v < u:
+                    continue
+                yield (u, v, {"weight": w}) if data else (u, v)
+
+    def adjacency_caches(self):
+        """
+        Équivalents de _neighbors_cache / _weights_cache des moteurs (dict de listes et
+        dict de poids), mais calculés à la demande depuis les tableaux CSR.
+        """
+        return _NeighborsView(self), _WeightsView(self)
+
+    def original_ids(self, indices):
+        """Convertit des indices internes en identifiants d'origine."""
+        ids = self.node_ids
+        return [ids[i].item() if hasattr(ids[i], "item") else ids[i] for i in indices]
+
+    def __repr__(self):
+        kind = "orienté" if self.directed else "non orienté"
+        return f"CSRGraph({self.number_of_nodes()} sommets, {self.number_of_edges()} arêtes, {kind})"
+
+
+class _NeighborsView:
+    """Vue indexable neighbors_cache[u] -> liste des successeurs de u."""
+
+    def __init__(self, G):
+        self.G = G
+
+    def __getitem__(self, u):
+        return self.G.successors(u)
+
+
+class _WeightsView:
+    """Vue compatible avec weights_cache.get((u, v), défaut)."""
+
+    def __init__(self, G):
+        self.G = G
+
+    def get(self, key, default=None):
+        u, v = key
+        return self.G.edge_weight(u, v, default)
+
+
+# ------------------------------------------------------------
+# Construction
+# ------------------------------------------------------------
+def _build_rows(src, dst, w, n):
+    """Trie les arcs par (src, dst), fusionne les multi-arcs (poids min) et calcule les offsets."""
+    order = np.lexsort((w, dst, src))
+    src, dst, w = src[order], dst[order], w[order]
+    if len(src):
+        # après le tri, le premier arc de chaque couple (src, dst) porte le poids minimal
+        keep = np.ones(len(src), dtype=bool)
+        keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, w = src[keep], dst[keep], w[keep]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    return offsets, dst.astype(np.int64), w.astype(np.float64)
+
+
+def from_edge_arrays(src, dst, weights, node_ids, directed=True, x=None, y=None):
+    """
+    Construit un CSRGraph à partir de tableaux d'arcs déjà indexés (0..n-1).
+    Les multi-arcs sont fusionnés en gardant le poids minimal.
+    """
+    n = len(node_ids)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    w = np.ones(len(src), dtype=np.float64) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    if not directed:
+        src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        w = np.concatenate([w, w])
+
+    offsets, targets, out_w = _build_rows(src, dst, w, n)
+    if not directed:
+        return CSRGraph(offsets, targets, out_w, node_ids, directed=False, x=x, y=y)
+
+    in_offsets, in_sources, in_w = _build_rows(dst, src, w, n)
+    return CSRGraph(offsets, targets, out_w, node_ids, directed=True,
+                    in_offsets=in_offsets, in_sources=in_sources, in_weights=in_w, x=x, y=y)
+
+
+def _ids_array(ids):
+    """Tableau numpy des identifiants d'origine (entiers si possible, sinon chaînes)."""
+    if all(isinstance(i, (int, np.integer)) and not isinstance(i, bool) for i in ids):
+        return np.asarray(ids, dtype=np.int64)
+    return np.asarray([str(i) for i in ids])
+
+
+def from_networkx(G, weight="weight"):
+    """
+    Convertit un graphe networkx (Graph, DiGraph, MultiDiGraph OSMnx...) en CSRGraph.
+    Les multi-arêtes sont réduites à leur poids minimal (défaut 1.0 si l'attribut manque).
+    """
+    nodes = list(G.nodes())
+    index = {u: i for i, u in enumerate(nodes)}
+    m = G.number_of_edges()
+    src = np.empty(m, dtype=np.int64)
+    dst = np.empty(m, dtype=np.int64)
+    w = np.empty(m, dtype=np.float64)
+    for j, (u, v, data) in enumerate(G.edges(data=True)):
+        src[j] = index[u]
+        dst[j] = index[v]
+        w[j] = data.get(weight, 1.0)
+
+    x = y = None
+    if nodes and all("x" in G.nodes[u] and "y" in G.nodes[u] for u in nodes):
+        x = np.asarray([float(G.nodes[u]["x"]) for u in nodes])
+        y = np.asarray([float(G.nodes[u]["y"]) for u in nodes])
+
+    return from_edge_arrays(src, dst, w, _ids_array(nodes), directed=G.is_directed(), x=x, y=y)
+
+
+# ------------------------------------------------------------
+# Format disque (un dossier de fichiers .npy + meta.json)
+# ------------------------------------------------------------
+_ARRAYS = ["offsets", "targets", "weights", "node_ids", "in_offsets", "in_sources", "in_weights", "x", "y"]
+
+
+def save_csr(G, path):
+    """
+    Sauvegarde un CSRGraph dans le dossier `path` (un fichier .npy par tableau).
+    Les fichiers sont relus par load_csr en np.memmap.
+    """
+    os.makedirs(path, exist_ok=True)
+    saved = []
+    for name in _ARRAYS:
+        arr = getattr(G, name)
+        if arr is None:
+            continue
+        if not G.directed and name.startswith("in_"):
+            continue
+        np.save(os.path.join(path, name + ".npy"), np.asarray(arr))
+        saved.append(name)
+
+    meta = {
+        "version": CSR_FORMAT_VERSION,
+        "directed": bool(G.directed),
+        "nodes": G.number_of_nodes(),
+        "edges": G.number_of_edges(),
+        "arrays": saved,
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_csr(path, mmap=True):
+    """
+    Ouvre un graphe CSR sauvegardé par save_csr.
+    Avec mmap=True, les tableaux sont projetés en mémoire (np.memmap, lecture seule) :
+    aucune copie, le cache de pages est partagé entre processus.
+    """
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != CSR_FORMAT_VERSION:
+        raise ValueError(f"Format CSR non supporté : {meta.get('version')}")
+
+    mode = "r" if mmap else None
+    arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode)
+              for name in meta["arrays"]}
+    return CSRGraph(
+        arrays["offsets"], arrays["targets"], arrays["weights"], arrays["node_ids"],
+        directed=meta["directed"],
+        in_offsets=arrays.get("in_offsets"),
+        in_sources=arrays.get("in_sources"),
+        in_weights=arrays.get("in_weights"),
+        x=arrays.get("x"),
+        y=arrays.get("y"),
+    )
+
+
+# ------------------------------------------------------------
+# Tableaux de travail (distances, sketches...)
+# ------------------------------------------------------------
+def working_array(shape, dtype, fill=0, work_dir=None):
+    """
+    Alloue un tableau de travail.
+    - work_dir=None : tableau numpy classique en RAM
+    - work_dir=<dossier> : np.memmap sur un fichier temporaire de ce dossier
+      (le fichier est supprimé immédiatement, la projection reste valide jusqu'à la libération)
+    """
+    if work_dir is None:
+        return np.full(shape, fill, dtype=dtype)
+
+    os.makedirs(work_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=work_dir, suffix=".work")
+    os.close(fd)
+    arr = np.memmap(tmp_path, dtype=dtype, mode="w+", shape=shape)
+    os.unlink(tmp_path)
+    arr[...] = fill
+    return arr
+
+
+def bfs_levels(G, source, dist, stop=None):
+    """
+    BFS par niveaux, vectorisé sur les tableaux CSR (fonctionne sur des np.memmap).
+    `dist` est un tableau de travail de taille n (réinitialisé à -1 ici).
+    Retourne (nombre de sommets atteints, somme des distances).
+    stop(level, reached, total) : appelé après chaque niveau terminé ; s'il rend vrai, le
+    parcours s'arrête et les valeurs rendues sont partielles.
+    """
+    offsets, targets = G.offsets, G.targets
+    dist.fill(-1)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    reached, total, level = 1, 0, 0
+
+    while len(frontier):
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        nb_out = int(counts.sum())
+        if nb_out == 0:
+            break
+        # indices des arcs sortants de toute la frontière (astuce repeat/cumsum)
+        shift = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        succ = targets[np.arange(nb_out, dtype=np.int64) + shift]
+        succ = np.unique(succ[dist[succ] < 0])
+        level += 1
+        dist[succ] = level
+        reached += len(succ)
+        total += level * len(succ)
+        frontier = succ
+        if stop is not None and len(frontier) and stop(level, reached, total):
+            break
+
+    return reached, total
+
+
+def dijkstra_array(G, source, dist):
+    """
+    Dijkstra sur les tableaux CSR (poids G.weights). `dist` : tableau de travail flottant.
+    Retourne (nombre de sommets atteints, somme des distances).
+    """
+    import heapq
+
+    offsets, targets, weights = G.offsets, G.targets, G.weights
+    dist.fill(math.inf)
+    dist[source] = 0.0
+    Q = [(0.0, source)]
+    reached, total = 0, 0.0
+    while Q:
+        d, u = heapq.heappop(Q)
+        if d > dist[u]:
+            continue
+        reached += 1
+        total += d
+        lo, hi = int(offsets[u]), int(offsets[u + 1])
+        for v, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(Q, (nd, v))
+    return reached, total
+
+
+# Conversion d'un fichier .graphml en dossier CSR
+if __name__ == "__main__":
+    import sys
+    import networkx as nx
+
+    if len(sys.argv) != 3:
+        print("Usage : python csr_graph.py <graphe.graphml> <dossier_csr>")
+        sys.exit(1)
+
+    G_nx = nx.read_graphml(sys.argv[1], node_type=int)
+    G_csr = from_networkx(G_nx)
+    save_csr(G_csr, sys.argv[2])
+    print(f"💾 {G_csr} sauvegardé dans {sys.argv[2]}")
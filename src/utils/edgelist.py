@@ -0,0 +1,140 @@
+import gzip
+from itertools import islice
+import numpy as np
+
+try:
+    from utils.csr_graph import from_edge_arrays, save_csr
+except ImportError:  # exécution directe : python src/utils/edgelist.py
+    from csr_graph import from_edge_arrays, save_csr
+
+
+def _open_text(path):
+    """Ouvre un fichier texte, compressé gzip ou non (détection par les octets magiques)."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _bad_line(text, count, width):
+    """
+    Indice de la première des `count` lignes de `text` qui n'a pas `width` champs (None si aucune) :
+    un champ manquant sur une ligne et en trop sur une autre décaleraient le flux de valeurs sans
+    changer leur total. Champs comptés sur les octets : début de champ = non-blanc après un blanc.
+    """
+    buf = np.frombuffer(text.encode(), dtype=np.uint8)
+    blank = buf <= ord(" ")                  # espace, tabulation, fin de ligne
+    starts = np.flatnonzero(~blank[1:] & blank[:-1]) + 1
+    if len(buf) and not blank[0]:
+        starts = np.concatenate(([0], starts))
+    ends = np.flatnonzero(buf == ord("\n"))
+    if len(ends) < count:                    # dernière ligne du fichier sans fin de ligne
+        ends = np.append(ends, len(buf))
+    fields = np.diff(np.searchsorted(starts, ends), prepend=0)
+    bad = np.flatnonzero(fields != width)
+    return (int(bad[0]), int(fields[bad[0]])) if len(bad) else None
+
+
+def iter_edge_chunks(path, chunk_lines=1_000_000, weighted=False):
+    """
+    Lit une liste d'arêtes au format SNAP par blocs de `chunk_lines` lignes.
+    - lignes de commentaire (# ou %) et lignes vides ignorées
+    - séparateurs tabulation ou espaces
+    - 2 colonnes (u v) ou 3 colonnes (u v poids) si weighted=True ; les colonnes suivantes
+      (ex. horodatage) sont ignorées, le nombre de colonnes étant fixé par la première ligne
+
+    Produit des tuples (src, dst, poids) de tableaux numpy (poids=None si non pondéré).
+    """
+    ncols = 3 if weighted else 2
+    width = None   # nombre de colonnes du fichier, lu sur la première ligne de données
+    first = 1      # numéro (dans le fichier) de la première ligne du bloc
+    with _open_text(path) as f:
+        while True:
+            lines = list(islice(f, chunk_lines))
+            if not lines:
+                break
+            start, first = first, first + len(lines)
+            data = [l for l in lines if l.strip() and l[0] not in "#%"]
+            if not data:
+                continue
+            if width is None:
+                width = len(data[0].split())
+                if width < ncols:
+                    raise ValueError(f"{path} : {width} colonne(s) sur la première ligne, {ncols} attendues")
+            text = "".join(data)
+            bad = _bad_line(text, len(data), width)
+            if bad is not None:
+                # numéro de la ligne dans le fichier (commentaires et lignes vides compris)
+                rows = [i for i, l in enumerate(lines) if l.strip() and l[0] not in "#%"]
+                raise ValueError(f"Ligne {start + rows[bad[0]]} mal formée dans {path} : "
+                                 f"{bad[1]} colonne(s), {width} attendues")
+
+            try:
+                values = np.fromstring(text, dtype=np.float64 if weighted else np.int64, sep=" ")
+            except ValueError:
+                values = None
+            # champ non numérique : np.fromstring échoue ou s'arrête avant la fin du bloc
+            if values is None or len(values) != len(data) * width:
+                raise ValueError(f"Valeur non numérique dans {path} (lignes {start} à {first - 1})")
+
+            # colonnes supplémentaires (ex. horodatage SNAP u v t) ignorées
+            values = values.reshape(-1, width)
+            src = values[:, 0].astype(np.int64)
+            dst = values[:, 1].astype(np.int64)
+            w = values[:, 2].copy() if weighted else None
+            yield src, dst, w
+
+
+def read_snap_edgelist(path, directed=True, weighted=False, chunk_lines=1_000_000, out_dir=None):
+    """
+    Charge un fichier SNAP (ex: data/Wiki-Vote.txt) directement en CSRGraph, sans passer par networkx.
+
+    Les identifiants d'origine sont renumérotés en 0..n-1 (np.unique) et conservés
+    dans G.node_ids : les moteurs renvoient donc leurs résultats avec les ids du fichier.
+    Si out_dir est donné, le graphe est aussi sauvegardé au format CSR (voir load_csr).
+    """
+    src_parts, dst_parts, w_parts = [], [], []
+    for src, dst, w in iter_edge_chunks(path, chunk_lines=chunk_lines, weighted=weighted):
+        src_parts.append(src)
+        dst_parts.append(dst)
+        if weighted:
+            w_parts.append(w)
+
+    if src_parts:
+        src = np.concatenate(src_parts)
+        dst = np.concatenate(dst_parts)
+    else:
+        src = np.empty(0, dtype=np.int64)
+        dst = np.empty(0, dtype=np.int64)
+    del src_parts, dst_parts
+    weights = np.concatenate(w_parts) if weighted and w_parts else None
+
+    # Renumérotation compacte des sommets
+    node_ids, inverse = np.unique(np.concatenate([src, dst]), return_inverse=True)
+    m = len(src)
+    del src, dst
+    G = from_edge_arrays(inverse[:m], inverse[m:], weights, node_ids, directed=directed)
+
+    if out_dir is not None:
+        save_csr(G, out_dir)
+    return G
+
+
+# Conversion d'une liste d'arêtes SNAP en dossier CSR
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 3:
+        print("Usage : python edgelist.py <edges.txt[.gz]> <dossier_csr> [--undirected] [--weighted]")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    G = read_snap_edgelist(
+        sys.argv[1],
+        directed="--undirected" not in sys.argv,
+        weighted="--weighted" in sys.argv,
+        out_dir=sys.argv[2],
+    )
+    print(f"✅ {G} chargé et sauvegardé dans {sys.argv[2]} en {time.perf_counter() - start:.2f}s")
@@ -1,19 +1,25 @@
-import osmnx as ox
 import os
-import networkx as nx
-import matplotlib.pyplot as plt
 
+# osmnx n'est importé qu'au téléchargement et matplotlib qu'au tracé (utils/map_render.py) :
+# les moteurs et le chargement d'un graphe déjà en cache n'en dépendent pas (démarrage rapide).
 
-def get_city_graph(city_name, network_type='drive', save_local=True):
+
+def get_city_graph(city_name, network_type='drive', save_local=True, offline=False):
     """
     Télécharge le graphe d'une ville via OSMnx, ou le charge depuis un fichier si déjà sauvegardé.
     Les fichiers .graphml sont enregistrés dans ../../data
+    Avec offline=True, le graphe est reconstruit depuis le cache Overpass (sans réseau ni osmnx).
     """
-    
+    if offline and network_type == 'drive':
+        from utils.overpass_cache import build_city_graph_from_cache
+        print(f"⏳ Reconstruction hors ligne du graphe pour {city_name}...")
+        G = build_city_graph_from_cache(city_name, oriented=False)
+    else:
+        import osmnx as ox
 
-    print(f"⏳ Téléchargement du graphe pour {city_name}...")
-    G = ox.graph_from_place(city_name, network_type=network_type)
-    G = G.to_undirected()
+        print(f"⏳ Téléchargement du graphe pour {city_name}...")
+        G = ox.graph_from_place(city_name, network_type=network_type)
+        G = G.to_undirected()
 
     if save_local:
         data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'data'))
@@ -22,14 +28,14 @@ def get_city_graph(city_name, network_type='drive', save_local=True):
         filename = city_name.replace(',', '').replace(' ', '_') + '.graphml'
         file_path = os.path.join(data_dir, filename)
         
-        ox.save_graphml(G, file_path)
+        save_graph(G, file_path)
         print(f"💾 Graphe sauvegardé dans {file_path}")
 
     print(f"✅ Graphe téléchargé : {len(G.nodes)} nœuds, {len(G.edges)} arêtes")
     return G
 
 
-def get_oriented_city_graph(city_name, network_type='drive', save_local=True):
+def get_oriented_city_graph(city_name, network_type='drive', save_local=True, offline=False):
     """
     Télécharge le graphe routier EXACT d'une ville depuis OpenStreetMap
     et le sauvegarde dans le dossier data/ sous forme de fichier .graphml.
@@ -38,14 +44,21 @@ def get_oriented_city_graph(city_name, network_type='drive', save_local=True):
         city_name (str): Nom complet de la ville (ex: "Paris, France")
         network_type (str): Type de réseau (par défaut 'drive')
         save_local (bool): Si True, sauvegarde le graphe dans data/
+        offline (bool): Si True, reconstruit le graphe depuis le cache Overpass (sans réseau)
 
     Returns:
         G (networkx.MultiDiGraph): Graphe orienté de la ville
     """
-    print(f"⏳ Téléchargement du graphe brut pour {city_name}...")
+    # 1 Télécharger le graphe routier (ou le reconstruire depuis le cache)
+    if offline and network_type == 'drive':
+        from utils.overpass_cache import build_city_graph_from_cache
+        print(f"⏳ Reconstruction hors ligne du graphe pour {city_name}...")
+        G = build_city_graph_from_cache(city_name, oriented=True)
+    else:
+        import osmnx as ox
 
-    # 1 Télécharger le graphe routier
-    G = ox.graph_from_place(city_name, network_type=network_type)
+        print(f"⏳ Téléchargement du graphe brut pour {city_name}...")
+        G = ox.graph_from_place(city_name, network_type=network_type)
 
     # 2 Sauvegarder localement dans le dossier data/
     if save_local:
@@ -56,18 +69,77 @@ def get_oriented_city_graph(city_name, network_type='drive', save_local=True):
         filename = city_name.replace(", ", "_").replace(" ", "_") + ".graphml"
         path = os.path.join(data_dir, filename)
 
-        ox.save_graphml(G, path)
+        save_graph(G, path)
         print(f"💾 Graphe sauvegardé dans : {path}")
 
     return G
 
-def plot_city_graph(G, city_name, top_nodes=None, mode="classic"):
+def save_graph(G, path):
+    """
+    Sauvegarde un graphe routier en .graphml : ox.save_graphml si osmnx est installé,
+    sinon nx.write_graphml avec les attributs non scalaires (listes d'osmid...) en texte, comme osmnx.
+    """
+    try:
+        import osmnx as ox
+    except ImportError:
+        ox = None
+    if ox is not None:
+        ox.save_graphml(G, path)
+        return path
+
+    import networkx as nx
+    scalar = (str, int, float, bool)
+    H = G.copy()
+    for _, data in H.nodes(data=True):
+        for key, val in data.items():
+            if not isinstance(val, scalar):
+                data[key] = str(val)
+    for *_, data in H.edges(keys=True, data=True) if H.is_multigraph() else H.edges(data=True):
+        for key, val in data.items():
+            if not isinstance(val, scalar):
+                data[key] = str(val)
+    for key, val in list(H.graph.items()):
+        if not isinstance(val, scalar):
+            H.graph[key] = str(val)
+    nx.write_graphml(H, path)
+    return path
+
+
+def load_graph(path):
+    """
+    Relit un .graphml écrit par save_graph (orienté ou non) : ox.load_graphml si osmnx est
+    installé, sinon networkx avec les identifiants entiers et les coordonnées / longueurs en float.
+    """
+    try:
+        import osmnx as ox
+    except ImportError:
+        ox = None
+    if ox is not None:
+        return ox.load_graphml(path)
+
+    import networkx as nx
+    G = nx.read_graphml(path, node_type=int, force_multigraph=True)
+    for _, data in G.nodes(data=True):
+        for key in ("x", "y"):
+            if key in data:
+                data[key] = float(data[key])
+    for *_, data in G.edges(keys=True, data=True):
+        if "length" in data:
+            data["length"] = float(data["length"])
+    return G
+
+
+def plot_city_graph(G, city_name, top_nodes=None, mode="classic", dpi=300):
     """
     Sauvegarde le graphe dans le dossier ../../visualisation/<mode>/
     Les 5 nœuds les plus centraux sont affichés en rouge.
     - mode="classic"  => visualisation/classic/
     - mode="efficient" => visualisation/efficient/
+    Le réseau est tracé une fois par ville (fond de carte en cache, voir utils/map_render.py) ;
+    chaque appel ne dessine que les marqueurs du top-k.
     """
+    from utils.map_render import render_topk_maps
+
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'visualisation'))
     output_dir = os.path.join(base_dir, mode)
     os.makedirs(output_dir, exist_ok=True)
@@ -75,24 +147,7 @@ def plot_city_graph(G, city_name, top_nodes=None, mode="classic"):
     filename = f"{city_name.replace(',', '').replace(' ', '_')}_graph.png"
     output_path = os.path.join(output_dir, filename)
 
-    fig, ax = ox.plot_graph(
-        G,
-        node_color='lightgray',
-        edge_color='gray',
-        node_size=5,
-        show=False,
-        close=False
-    )
-
-    if top_nodes:
-        node_positions = {n: (data['x'], data['y']) for n, data in G.nodes(data=True)}
-        x_top = [node_positions[n][0] for n in top_nodes]
-        y_top = [node_positions[n][1] for n in top_nodes]
-        ax.scatter(x_top, y_top, c='red', s=30, label='Top closeness')
-        plt.legend()
-
-    plt.title(f"Graphe routier de {city_name}")
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    render_topk_maps(G, city_name, [(top_nodes, output_path, f"Graphe routier de {city_name}")],
+                     style="light", dpi=dpi)
 
     print(f"🖼️  Graphe sauvegardé dans : {output_path}")
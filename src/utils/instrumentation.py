@@ -0,0 +1,90 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict
+
+perf_counter = time.perf_counter
+
+
+class Stats:
+    """
+    Statistiques d'exécution d'un moteur de closeness : temps cumulés par phase,
+    nombre d'appels par phase et compteurs libres (sommets visités, élagués...).
+
+    Désactivé par défaut : les moteurs reçoivent stats=None et ne font alors qu'un test
+    `if stats is not None`. Activé, chaque mesure coûte un perf_counter() et une addition.
+
+        stats = Stats()
+        top_k_closeness(G, 10, stats=stats)
+        print(stats)                 # résumé lisible
+        json.dumps(stats.as_dict())  # à journaliser
+    """
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.maxima = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Chronomètre un bloc : `with stats.phase("prep"): ...`"""
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += perf_counter() - t0
+            self.calls[name] += 1
+
+    def record(self, name, t0):
+        """Variante sans gestionnaire de contexte pour les boucles chaudes : t0 = perf_counter()."""
+        self.times[name] += perf_counter() - t0
+        self.calls[name] += 1
+
+    def add(self, name, n=1):
+        self.counters[name] += n
+
+    def peak(self, name, value):
+        """Conserve la valeur maximale observée (ex. taille maximale d'un journal de rollback)."""
+        if value > self.maxima.get(name, value - 1):
+            self.maxima[name] = value
+
+    def merge(self, other):
+        """Cumule les statistiques d'une autre exécution (plusieurs villes, plusieurs k...)."""
+        for name, t in other.times.items():
+            self.times[name] += t
+        for name, c in other.calls.items():
+            self.calls[name] += c
+        for name, c in other.counters.items():
+            self.counters[name] += c
+        for name, v in other.maxima.items():
+            self.peak(name, v)
+        return self
+
+    def as_dict(self):
+        return {
+            "phases": {name: {"seconds": self.times[name], "calls": self.calls[name]} for name in self.times},
+            "counters": dict(self.counters),
+            "maxima": dict(self.maxima),
+        }
+
+    def to_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def __str__(self):
+        lines = ["⏱️  Phases :"]
+        for name, t in sorted(self.times.items(), key=lambda x: -x[1]):
+            lines.append(f"   {name:<12} {t:10.4f}s  ({self.calls[name]} appels)")
+        if self.counters or self.maxima:
+            lines.append("🔢 Compteurs :")
+            for name, c in sorted(self.counters.items()):
+                lines.append(f"   {name:<24} {c}")
+            for name, v in sorted(self.maxima.items()):
+                lines.append(f"   {name + ' (max)':<24} {v}")
+        return "\n".join(lines)
+
+
+def phase(stats, name):
+    """`with phase(stats, "prep"):` — chronomètre le bloc si stats est fourni, ne fait rien sinon."""
+    return stats.phase(name) if stats is not None else nullcontext()
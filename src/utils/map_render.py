@@ -0,0 +1,206 @@
+import os
+import math
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# matplotlib n'est importé qu'au rendu (voir benchmarks/import_time.py)
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+BASEMAP_DIR = os.path.join(BASE_DIR, "visualisation", ".basemaps")
+
+# Styles des cartes : équivalents des appels ox.plot_graph de plot_city_graph / plot_topk_on_city
+STYLES = {
+    "light": {"bgcolor": "white", "edge_color": "gray", "edge_width": 1.0, "node_color": "lightgray",
+              "node_size": 5, "marker_color": "red", "marker_size": 30, "text_color": "black", "labels": False},
+    "dark": {"bgcolor": "black", "edge_color": "white", "edge_width": 1.0, "node_color": None,
+             "node_size": 0, "marker_color": "red", "marker_size": 50, "text_color": "white", "labels": True},
+}
+
+
+# ------------------------------------------------------------
+# Géométrie : segments et coordonnées des sommets
+# ------------------------------------------------------------
+def _coords(G):
+    """(ids, x, y) des sommets, pour un graphe networkx (attributs x / y) ou un CSRGraph."""
+    if hasattr(G, "offsets"):
+        if G.x is None or G.y is None:
+            raise ValueError("Le graphe n'a pas de coordonnées x / y")
+        return None, np.asarray(G.x, dtype=np.float64), np.asarray(G.y, dtype=np.float64)
+    ids = list(G.nodes())
+    x = np.fromiter((float(G.nodes[u]["x"]) for u in ids), dtype=np.float64, count=len(ids))
+    y = np.fromiter((float(G.nodes[u]["y"]) for u in ids), dtype=np.float64, count=len(ids))
+    return ids, x, y
+
+
+def edge_segments(G):
+    """
+    Segments des rues, tableau (m, 2, 2) : une fois par graphe, depuis les tableaux de
+    coordonnées. Une arête OSMnx qui porte sa géométrie (LineString) est découpée en
+    segments le long de la géométrie, comme dans ox.plot_graph ; sinon ligne droite.
+    Chaque arête non orientée n'est tracée qu'une fois.
+    """
+    ids, x, y = _coords(G)
+    if ids is None:
+        n = len(x)
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(G.offsets)))
+        dst = np.asarray(G.targets, dtype=np.int64)
+        keep = src < dst if not G.is_directed() else src != dst
+        src, dst = src[keep], dst[keep]
+        return np.stack([np.stack([x[src], y[src]], axis=1), np.stack([x[dst], y[dst]], axis=1)], axis=1)
+
+    index = {u: i for i, u in enumerate(ids)}
+    src, dst, curved = [], [], []
+    seen = set()
+    for u, v, data in G.edges(data=True):
+        if u == v:
+            continue
+        geometry = data.get("geometry")
+        if hasattr(geometry, "coords"):
+            pts = np.asarray(geometry.coords, dtype=np.float64)
+            curved.append(np.stack([pts[:-1], pts[1:]], axis=1))
+            continue
+        key = (u, v) if G.is_directed() else frozenset((u, v))
+        if key in seen:
+            continue
+        seen.add(key)
+        src.append(index[u])
+        dst.append(index[v])
+    src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+    straight = np.stack([np.stack([x[src], y[src]], axis=1), np.stack([x[dst], y[dst]], axis=1)], axis=1)
+    return np.concatenate([straight.reshape(-1, 2, 2)] + curved) if curved else straight.reshape(-1, 2, 2)
+
+
+def node_positions(G, nodes):
+    """Coordonnées (x, y) des sommets demandés (identifiants d'origine) ; sommets absents ignorés."""
+    if hasattr(G, "offsets"):
+        index = {u: i for i, u in enumerate(G.original_ids(range(G.number_of_nodes())))}
+        found = [index[u] for u in nodes if u in index]
+        return [(float(G.x[i]), float(G.y[i])) for i in found]
+    return [(float(G.nodes[u]["x"]), float(G.nodes[u]["y"])) for u in nodes if u in G.nodes]
+
+
+def _extent(x, y, margin=0.02):
+    x0, x1, y0, y1 = float(np.nanmin(x)), float(np.nanmax(x)), float(np.nanmin(y)), float(np.nanmax(y))
+    dx, dy = (x1 - x0) or 1.0, (y1 - y0) or 1.0
+    return (x0 - margin * dx, x1 + margin * dx, y0 - margin * dy, y1 + margin * dy)
+
+
+def _figsize(extent, width=8.0):
+    """Taille de figure à l'échelle : longitude corrigée par cos(latitude) pour des coordonnées en degrés."""
+    x0, x1, y0, y1 = extent
+    lat = (y0 + y1) / 2
+    ratio = math.cos(math.radians(lat)) if abs(lat) <= 90 and abs(x0) <= 180 and abs(x1) <= 180 else 1.0
+    w, h = (x1 - x0) * ratio, (y1 - y0)
+    return (width, max(1.0, min(4 * width, width * h / w))) if w > 0 else (width, width)
+
+
+# ------------------------------------------------------------
+# Fond de carte (réseau seul), rendu une fois par graphe et par style
+# ------------------------------------------------------------
+def _render_base(segments, points, extent, figsize, dpi, style):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor=style["bgcolor"])
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_facecolor(style["bgcolor"])
+    ax.add_collection(LineCollection(segments, colors=style["edge_color"], linewidths=style["edge_width"],
+                                     rasterized=True))
+    if style["node_size"] and style["node_color"]:
+        ax.scatter(points[0], points[1], s=style["node_size"], c=style["node_color"], linewidths=0, zorder=2)
+    ax.set_xlim(extent[0], extent[1])
+    ax.set_ylim(extent[2], extent[3])
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[..., :3].copy()
+
+
+def basemap(G, key, style="light", dpi=300, cache_dir=None):
+    """
+    Fond de carte de G (image RGB sans marqueurs) : rendu une seule fois puis conservé sur
+    disque (visualisation/.basemaps/), partagé entre moteurs et scripts d'une même ville.
+    La clé du fichier contient un hachage des segments : un autre graphe de la même ville
+    (orienté / non orienté) a son propre fond.
+    Retourne {"path", "extent", "figsize", "dpi", "style"}.
+    """
+    cache_dir = cache_dir or BASEMAP_DIR
+    segments = edge_segments(G)
+    _, x, y = _coords(G)
+    extent = _extent(x, y)
+    figsize = _figsize(extent)
+    digest = hashlib.sha1(np.ascontiguousarray(segments).tobytes()).hexdigest()[:12]
+    name = f"{str(key).replace(',', '').replace(' ', '_')}_{style}_{dpi}_{digest}.npy"
+    path = os.path.join(cache_dir, name)
+    if not os.path.exists(path):
+        image = _render_base(segments, (x, y), extent, figsize, dpi, STYLES[style])
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = path + ".tmp.npy"
+        np.save(tmp, image)
+        os.replace(tmp, path)
+    return {"path": path, "extent": extent, "figsize": figsize, "dpi": dpi, "style": style}
+
+
+# ------------------------------------------------------------
+# Superposition du top-k (parallélisable : arguments légers et picklables)
+# ------------------------------------------------------------
+def render_overlay(base, positions, output_path, title=None, label="Top closeness"):
+    """
+    Fond de carte + marqueurs du top-k, enregistré en PNG à la résolution du fond.
+    Seuls les marqueurs (et titre, légende) sont tracés, sur une figure transparente de la
+    même taille en pixels que le fond ; les deux images sont ensuite fusionnées pixel à pixel.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+
+    style = STYLES[base["style"]]
+    fig = Figure(figsize=base["figsize"], dpi=base["dpi"], facecolor="none")
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.patch.set_alpha(0)
+    x0, x1, y0, y1 = base["extent"]
+    if positions:
+        xs, ys = zip(*positions)
+        ax.scatter(xs, ys, c=style["marker_color"], s=style["marker_size"], label=label, zorder=3)
+        if style["labels"]:
+            for i, (x, y) in enumerate(positions):
+                ax.text(x, y, f"{i + 1}", color=style["text_color"], fontsize=6, zorder=4)
+        ax.legend(facecolor=style["bgcolor"], edgecolor=style["text_color"], labelcolor=style["text_color"])
+    if title:
+        ax.set_title(title, color=style["text_color"], y=0.97)
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
+    canvas.draw()
+
+    over = np.asarray(canvas.buffer_rgba())
+    image = np.array(np.load(base["path"], mmap_mode="r")[..., :3])
+    # seuls les pixels touchés par la superposition sont recalculés
+    rows, cols = np.nonzero(over[..., 3])
+    alpha = over[rows, cols, 3:4].astype(np.float32) / 255.0
+    image[rows, cols] = (over[rows, cols, :3] * alpha + image[rows, cols] * (1.0 - alpha) + 0.5).astype(np.uint8)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    Image.fromarray(image).save(output_path, dpi=(base["dpi"], base["dpi"]), compress_level=3)
+    return output_path
+
+
+def render_topk_maps(G, key, figures, style="light", dpi=300, workers=1, cache_dir=None):
+    """
+    Rend plusieurs cartes top-k d'un même graphe : le fond est rendu (ou relu) une fois,
+    puis chaque figure ne trace que ses marqueurs, en parallèle si workers > 1.
+
+        render_topk_maps(G, "Dijon, France", [(top_classic, "classic.png", "Classic"),
+                                              (top_efficient, "efficient.png", "Efficient")], workers=2)
+
+    figures : liste de (sommets du top-k, chemin de sortie, titre). Retourne les chemins.
+    """
+    base = basemap(G, key, style=style, dpi=dpi, cache_dir=cache_dir)
+    jobs = [(base, node_positions(G, nodes or []), path, title) for nodes, path, title in figures]
+    if workers <= 1 or len(jobs) <= 1:
+        return [render_overlay(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(render_overlay, *zip(*jobs)))
@@ -0,0 +1,265 @@
+import os
+import ast
+import json
+import time
+import resource
+import linecache
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+from utils.instrumentation import Stats, perf_counter
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MB = 1 << 20
+
+
+def current_rss_mb():
+    """Mémoire résidente actuelle (Linux : /proc/self/statm ; ailleurs : pic ru_maxrss)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError):
+        return max_rss_mb()
+
+
+def max_rss_mb():
+    """Pic de mémoire résidente du processus (ru_maxrss est en Ko sous Linux, en octets sous macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / MB if os.uname().sysname == "Darwin" else rss / 1024
+
+
+# ------------------------------------------------------------
+# Attribution : ligne d'allocation -> fonction englobante
+# ------------------------------------------------------------
+_functions = {}
+
+
+def _function_ranges(filename):
+    """[(première ligne, dernière ligne, nom qualifié)] des fonctions d'un fichier source."""
+    if filename not in _functions:
+        ranges = []
+        try:
+            with open(filename, encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            tree = None
+
+        def visit(node, prefix):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    name = prefix + child.name
+                    if not isinstance(child, ast.ClassDef):
+                        ranges.append((child.lineno, child.end_lineno, name))
+                    visit(child, name + ".")
+
+        if tree is not None:
+            visit(tree, "")
+        _functions[filename] = ranges
+    return _functions[filename]
+
+
+def enclosing_function(filename, lineno):
+    """Fonction la plus interne contenant la ligne (ou '<module>')."""
+    best = None
+    for start, end, name in _function_ranges(filename):
+        if start <= lineno <= end and (best is None or start >= best[0]):
+            best = (start, name)
+    return best[1] if best else "<module>"
+
+
+def _short_path(filename):
+    if filename.startswith(SRC_DIR):
+        return os.path.relpath(filename, SRC_DIR)
+    return os.path.basename(filename)
+
+
+# allocations du profileur lui-même (instantanés, lecture des sources pour l'attribution)
+_IGNORED = tuple(tracemalloc.Filter(False, f) for f in (
+    tracemalloc.__file__, __file__, linecache.__file__, ast.__file__, "<frozen importlib._bootstrap>",
+))
+
+
+def attribute(snapshot, baseline=None, top=10):
+    """
+    Regroupe par fonction et par ligne les allocations vivantes d'un instantané tracemalloc,
+    en ne gardant que ce qui a été alloué depuis `baseline` (début de la phase).
+    Les lignes sont accompagnées de leur code source, ce qui désigne directement la structure
+    responsable (couches V de prep(), dictionnaires dist, listes d'étiquettes Π...).
+    """
+    snapshot = snapshot.filter_traces(_IGNORED)
+    if baseline is not None:
+        stats = [(st.traceback, st.size_diff, st.count_diff)
+                 for st in snapshot.compare_to(baseline.filter_traces(_IGNORED), "lineno")]
+    else:
+        stats = [(st.traceback, st.size, st.count) for st in snapshot.statistics("lineno")]
+    stats = sorted((s for s in stats if s[1] > 0), key=lambda s: -s[1])
+
+    by_function = {}
+    lines = []
+    for traceback, size_diff, count_diff in stats:
+        frame = traceback[0]
+        key = (_short_path(frame.filename), enclosing_function(frame.filename, frame.lineno))
+        size, count = by_function.get(key, (0, 0))
+        by_function[key] = (size + size_diff, count + count_diff)
+        if len(lines) < top:
+            lines.append({
+                "file": _short_path(frame.filename), "line": frame.lineno,
+                "code": linecache.getline(frame.filename, frame.lineno).strip(),
+                "size_mb": size_diff / MB, "blocks": count_diff,
+            })
+    functions = [{"file": f, "function": fn, "size_mb": size / MB, "blocks": count}
+                 for (f, fn), (size, count) in sorted(by_function.items(), key=lambda x: -x[1][0])[:top]]
+    return {"functions": functions, "lines": lines}
+
+
+# ------------------------------------------------------------
+# Profileur
+# ------------------------------------------------------------
+class MemoryProfiler(Stats):
+    """
+    Stats enrichies d'un suivi mémoire par phase : pic tracemalloc, RSS au début et à la fin,
+    pic RSS du processus, et attribution des allocations faites depuis le début de la phase
+    et encore vivantes au moment du pic.
+
+    S'utilise partout où un objet Stats est accepté (top_k_closeness(..., stats=profiler)) ;
+    les phases chronométrées par `with stats.phase(...)` reçoivent en plus leur profil mémoire,
+    les mesures fines (record()) restent de simples temps.
+
+    Un fil d'échantillonnage prend un instantané tracemalloc chaque fois que la mémoire tracée
+    dépasse de `growth` le plus gros instantané déjà pris pour une phase active : l'instantané
+    le plus lourd de chaque phase est donc proche de son pic, pour un nombre d'instantanés
+    logarithmique en la mémoire consommée.
+
+    tracemalloc ralentit fortement l'exécution : les temps relevés par un MemoryProfiler
+    ne sont pas comparables à ceux d'une exécution normale.
+    """
+
+    def __init__(self, top=10, interval=0.02, growth=1.25):
+        super().__init__()
+        self.top = top
+        self.interval = interval
+        self.growth = growth
+        self.memory = {}
+        self._active = []
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    # -- suivi des pics imbriqués ------------------------------------------
+    def _fold_peak(self):
+        """Reporte le pic global tracemalloc sur les phases actives puis le réinitialise."""
+        _, peak = tracemalloc.get_traced_memory()
+        for entry in self._active:
+            entry["traced_peak"] = max(entry["traced_peak"], peak)
+        tracemalloc.reset_peak()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                current, _ = tracemalloc.get_traced_memory()
+                threshold = min(e["snapshot_size"] for e in self._active) * self.growth
+                if current <= threshold:
+                    continue
+                snapshot = tracemalloc.take_snapshot()
+                for entry in self._active:
+                    if current > entry["snapshot_size"]:
+                        entry["snapshot_size"] = current
+                        entry["snapshot"] = snapshot
+
+    def _start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        else:
+            self._owns_tracing = False
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="memory-profiler", daemon=True)
+        self._sampler.start()
+
+    def _shutdown(self):
+        self._stop.set()
+        self._sampler.join()
+        self._sampler = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        with self._lock:
+            if not self._active and self._sampler is None:
+                self._start()
+            self._fold_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            entry = {"name": name, "traced_start": current, "traced_peak": current,
+                     "rss_start_mb": current_rss_mb(), "baseline": tracemalloc.take_snapshot(),
+                     "snapshot": None, "snapshot_size": current}
+            self._active.append(entry)
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += perf_counter() - t0
+            self.calls[name] += 1
+            with self._lock:
+                self._fold_peak()
+                self._active.remove(entry)
+                if entry["snapshot"] is None:
+                    entry["snapshot"] = tracemalloc.take_snapshot()
+                self._store(entry)
+                last = not self._active
+            if last:
+                self._shutdown()  # hors du verrou : le fil d'échantillonnage peut l'attendre
+
+    def _store(self, entry):
+        """Conserve le profil de la phase (le plus lourd si elle est appelée plusieurs fois)."""
+        profile = {
+            "traced_peak_mb": entry["traced_peak"] / MB,
+            "traced_growth_mb": (entry["traced_peak"] - entry["traced_start"]) / MB,
+            "rss_start_mb": entry["rss_start_mb"],
+            "rss_end_mb": current_rss_mb(),
+            "max_rss_mb": max_rss_mb(),
+            **attribute(entry["snapshot"], entry["baseline"], self.top),
+        }
+        previous = self.memory.get(entry["name"])
+        if previous is None or profile["traced_peak_mb"] >= previous["traced_peak_mb"]:
+            self.memory[entry["name"]] = profile
+
+    # -- sorties -------------------------------------------------------------
+    def as_dict(self):
+        out = super().as_dict()
+        out["memory"] = self.memory
+        return out
+
+    def peak_mb(self):
+        return max((p["traced_peak_mb"] for p in self.memory.values()), default=0.0)
+
+    def __str__(self):
+        lines = [super().__str__(), "🧠 Mémoire par phase :"]
+        for name, p in sorted(self.memory.items(), key=lambda x: -x[1]["traced_peak_mb"]):
+            lines.append(f"   {name:<12} pic tracé {p['traced_peak_mb']:9.1f} Mo "
+                         f"(+{p['traced_growth_mb']:.1f})  RSS {p['rss_start_mb']:.0f} -> {p['rss_end_mb']:.0f} Mo"
+                         f"  pic RSS {p['max_rss_mb']:.0f} Mo")
+            for f in p["functions"][:5]:
+                lines.append(f"      {f['size_mb']:9.2f} Mo  {f['file']}:{f['function']}")
+            for l in p["lines"][:3]:
+                lines.append(f"      {l['size_mb']:9.2f} Mo  {l['file']}:{l['line']}  {l['code']}")
+        return "\n".join(lines)
+
+
+def write_memory_report(profiles, output_prefix):
+    """
+    Écrit <prefix>_memory.json et <prefix>_memory.txt à côté des résultats du banc d'essai.
+    profiles : liste de (étiquette, MemoryProfiler).
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_prefix)), exist_ok=True)
+    json_path, txt_path = output_prefix + "_memory.json", output_prefix + "_memory.txt"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({label: prof.as_dict() for label, prof in profiles}, f, indent=2)
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write(f"Profil mémoire — {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        for label, prof in profiles:
+            f.write(f"=== {label} ===\n{prof}\n\n")
+    return json_path, txt_path
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import fnmatch
+import hashlib
+import importlib
+import traceback
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class Task:
+    """
+    Tâche de simulation :
+    - target : "module:fonction" importée dans le processus de travail (depuis src/)
+    - args : arguments (sérialisables) de la fonction
+    - deps : noms des tâches qui doivent être terminées avant
+    - sources : fichiers (relatifs à src/) dont le contenu entre dans l'empreinte de la tâche ;
+      la tâche est relancée si l'un d'eux change
+    - pass_results : la fonction reçoit en plus `results=[résultat de chaque dépendance]`
+
+    Le résultat de la fonction doit être sérialisable en JSON (il est conservé dans le point
+    de reprise pour les tâches qui en dépendent).
+    """
+
+    def __init__(self, name, target, args=(), deps=(), sources=(), pass_results=False):
+        self.name = name
+        self.target = target
+        self.args = tuple(args)
+        self.deps = tuple(deps)
+        self.sources = tuple(sources)
+        self.pass_results = pass_results
+
+    def __repr__(self):
+        return f"Task({self.name!r})"
+
+
+def _file_digest(path, _cache={}):
+    if path not in _cache:
+        h = hashlib.sha1()
+        with open(os.path.join(SRC_DIR, path), "rb") as f:
+            h.update(f.read())
+        _cache[path] = h.hexdigest()
+    return _cache[path]
+
+
+def fingerprints(tasks):
+    """
+    Empreinte de chaque tâche : cible, arguments, contenu des sources et empreintes des
+    dépendances (une tâche modifiée invalide donc tout ce qui en dépend).
+    """
+    by_name = {t.name: t for t in tasks}
+    out = {}
+
+    def visit(name):
+        if name not in out:
+            t = by_name[name]
+            h = hashlib.sha1(repr((t.target, t.args)).encode())
+            for path in sorted(t.sources):
+                h.update(_file_digest(path).encode())
+            for dep in t.deps:
+                h.update(visit(dep).encode())
+            out[name] = h.hexdigest()
+        return out[name]
+
+    for t in tasks:
+        visit(t.name)
+    return out
+
+
+def _run_task(target, args, results):
+    """Exécuté dans un processus de travail : importe la cible et l'appelle."""
+    module_name, func_name = target.split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+    t0 = time.perf_counter()
+    if results is None:
+        value = func(*args)
+    else:
+        value = func(*args, results=results)
+    return value, time.perf_counter() - t0
+
+
+# ------------------------------------------------------------
+# Point de reprise
+# ------------------------------------------------------------
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, default=str)
+    os.replace(tmp, path)  # écriture atomique : un arrêt brutal laisse l'ancien état intact
+
+
+# ------------------------------------------------------------
+# Ordonnanceur
+# ------------------------------------------------------------
+def select(tasks, state, only_failed=False, force=False, patterns=None):
+    """
+    Tâches à (re)lancer : celles qui ne sont pas terminées avec l'empreinte courante.
+    only_failed restreint aux échecs du dernier passage (et aux tâches qu'ils ont bloquées) ;
+    patterns (motifs fnmatch) filtre par nom. Les dépendances non à jour des tâches retenues
+    sont ajoutées.
+    """
+    fps = fingerprints(tasks)
+    by_name = {t.name: t for t in tasks}
+
+    def up_to_date(name):
+        entry = state.get(name)
+        return not force and entry is not None and entry["status"] == "done" and entry["fingerprint"] == fps[name]
+
+    chosen = set()
+    for t in tasks:
+        if patterns and not any(fnmatch.fnmatch(t.name, p) for p in patterns):
+            continue
+        if only_failed and state.get(t.name, {}).get("status") not in ("failed", "blocked"):
+            continue
+        if not up_to_date(t.name):
+            chosen.add(t.name)
+
+    stack = list(chosen)
+    while stack:
+        for dep in by_name[stack.pop()].deps:
+            if dep not in chosen and not up_to_date(dep):
+                chosen.add(dep)
+                stack.append(dep)
+    return [t for t in tasks if t.name in chosen], fps
+
+
+def run_tasks(tasks, state_path, workers=None, only_failed=False, force=False, patterns=None,
+              dry_run=False, log=print):
+    """
+    Exécute le graphe de tâches sur un pool de processus.
+
+    Les tâches indépendantes tournent en parallèle ; l'état est enregistré après chaque
+    tâche terminée, si bien qu'une exécution interrompue reprend là où elle s'était arrêtée.
+    Un échec n'arrête pas le reste : seules les tâches qui en dépendent sont bloquées.
+    Retourne le dictionnaire d'état ({nom: {status, fingerprint, result, seconds, error}}).
+    """
+    state = load_state(state_path)
+    todo, fps = select(tasks, state, only_failed, force, patterns)
+    by_name = {t.name: t for t in tasks}
+    skipped = len(tasks) - len(todo)
+    log(f"🗂️  {len(tasks)} tâches : {len(todo)} à exécuter, {skipped} déjà à jour")
+    if dry_run:
+        for t in todo:
+            status = state.get(t.name, {}).get("status", "nouvelle")
+            log(f"   • {t.name} ({status})")
+        return state
+
+    remaining = {t.name for t in todo}
+    blocked = set()
+    running = {}
+    workers = workers or os.cpu_count() or 1
+    t_start = time.perf_counter()
+
+    def ready(name):
+        return all(state.get(d, {}).get("status") == "done" and d not in remaining for d in by_name[name].deps)
+
+    def block_dependents(name):
+        for t in todo:
+            if t.name in remaining and name in t.deps:
+                remaining.discard(t.name)
+                blocked.add(t.name)
+                state[t.name] = {"status": "blocked", "fingerprint": fps[t.name], "error": f"dépend de {name}"}
+                log(f"⛔ {t.name} bloquée (dépend de {name})")
+                block_dependents(t.name)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while remaining or running:
+            for t in todo:
+                if len(running) >= workers:
+                    break
+                if t.name in remaining and t.name not in running.values() and ready(t.name):
+                    results = [state[d].get("result") for d in t.deps] if t.pass_results else None
+                    running[pool.submit(_run_task, t.target, t.args, results)] = t.name
+                    log(f"▶️  {t.name}")
+            if not running:
+                break  # tout ce qui reste est bloqué
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                remaining.discard(name)
+                try:
+                    value, seconds = future.result()
+                    state[name] = {"status": "done", "fingerprint": fps[name], "result": value,
+                                   "seconds": seconds, "finished": time.strftime("%Y-%m-%dT%H:%M:%S")}
+                    log(f"✅ {name} ({seconds:.1f}s)")
+                except Exception as e:
+                    state[name] = {"status": "failed", "fingerprint": fps[name],
+                                   "error": "".join(traceback.format_exception(type(e), e, e.__traceback__))[-4000:]}
+                    log(f"❌ {name} : {e!r}")
+                    block_dependents(name)
+                save_state(state, state_path)
+
+    failed = [n for n in (t.name for t in todo) if state.get(n, {}).get("status") == "failed"]
+    log(f"\n🏁 {len(todo) - len(failed) - len(blocked)} terminées, {len(failed)} en échec, "
+        f"{len(blocked)} bloquées en {time.perf_counter() - t_start:.1f}s")
+    return state
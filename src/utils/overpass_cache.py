@@ -0,0 +1,490 @@
+import os
+import re
+import json
+import math
+import glob
+from itertools import groupby
+from collections import Counter
+import numpy as np
+import networkx as nx
+
+# Lecture JSON en flux si ijson est installé (beaucoup plus rapide et sobre sur les gros
+# fichiers Overpass), sinon json de la bibliothèque standard.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_DIR = os.path.dirname(SRC_DIR)
+
+# Dossiers où osmnx a laissé son cache (il écrit dans ./cache du répertoire courant)
+DEFAULT_CACHE_DIRS = [
+    os.path.join(BASE_DIR, "cache"),
+    os.path.join(SRC_DIR, "cache"),
+    os.path.join(SRC_DIR, "temporal_closeness", "cache"),
+]
+
+EARTH_RADIUS_M = 6_371_009
+BUFFER_M = 500
+BOUNDARY_EPS_M = 1e-6
+
+# Filtre "drive" d'osmnx : (tag, regex interdite) — équivalent de ["tag"!~"regex"]
+DRIVE_EXCLUDE = [
+    ("area", "yes"),
+    ("highway", "abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|"
+                "escalator|footway|no|path|pedestrian|planned|platform|proposed|raceway|"
+                "razed|service|steps|track"),
+    ("motor_vehicle", "no"),
+    ("motorcar", "no"),
+    ("service", "alley|driveway|emergency_access|parking|parking_aisle|private"),
+    ("access", "private"),
+]
+DRIVE_EXCLUDE = [(tag, re.compile(rx)) for tag, rx in DRIVE_EXCLUDE]
+
+ONEWAY_VALUES = {"yes", "true", "1", "-1", "reverse", "T", "F"}
+REVERSED_VALUES = {"-1", "reverse", "T"}
+USEFUL_TAGS_NODE = ["highway", "junction", "railway", "ref"]
+USEFUL_TAGS_WAY = ["access", "area", "bridge", "est_width", "highway", "junction", "landuse",
+                   "lanes", "maxspeed", "name", "oneway", "ref", "service", "tunnel", "width"]
+
+
+# ------------------------------------------------------------
+# Lecture des fichiers du cache
+# ------------------------------------------------------------
+def _iter_overpass_elements(path):
+    """Itère sur les éléments d'une réponse Overpass (en flux si ijson est disponible)."""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "elements.item", use_float=True)
+        else:
+            yield from json.load(f).get("elements", [])
+
+
+def _is_overpass_file(path):
+    # Overpass renvoie un objet {"elements": [...]}, Nominatim une liste de résultats
+    with open(path, "rb") as f:
+        head = f.read(64)
+    return head.lstrip().startswith(b"{")
+
+
+def overpass_snapshot(path):
+    """
+    Date (AAAA-MM-JJ) des données OSM d'une réponse Overpass (champ osm3s.timestamp_osm_base,
+    en tête de fichier), ou "" si elle est absente.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1024).decode("utf-8", "ignore")
+    m = re.search(r'"timestamp_osm_base"\s*:\s*"(\d{4}-\d\d-\d\d)', head)
+    return m.group(1) if m else ""
+
+
+def classify_cache(cache_dirs=None):
+    """
+    Sépare les fichiers du cache osmnx en réponses Overpass et réponses Nominatim.
+    Retourne (liste de chemins Overpass, liste de chemins Nominatim).
+    Une même requête (même hash) peut figurer dans plusieurs dossiers avec des données
+    de dates différentes : les réponses Overpass sont gardées par (requête, date).
+    """
+    overpass, nominatim = [], []
+    seen = set()
+    for d in cache_dirs or DEFAULT_CACHE_DIRS:
+        for path in sorted(glob.glob(os.path.join(d, "*.json"))):
+            name = os.path.basename(path)
+            if not _is_overpass_file(path):
+                if name not in seen:  # même hash = même requête
+                    seen.add(name)
+                    nominatim.append(path)
+                continue
+            key = (name, overpass_snapshot(path))
+            if key not in seen:
+                seen.add(key)
+                overpass.append(path)
+    return overpass, nominatim
+
+
+def find_city_polygon(city_name, cache_dirs=None):
+    """
+    Retrouve dans le cache la réponse Nominatim de la ville et renvoie son polygone
+    sous forme de liste de polygones [[anneau extérieur, trous...], ...] en (lon, lat).
+    """
+    _, nominatim = classify_cache(cache_dirs)
+    wanted = [p.strip().lower() for p in city_name.split(",")]
+    for path in nominatim:
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)
+        for res in results if isinstance(results, list) else []:
+            parts = [p.strip().lower() for p in res.get("display_name", "").split(",")]
+            if not parts or parts[0] != wanted[0]:
+                continue
+            if len(wanted) > 1 and wanted[-1] not in parts[-1]:
+                continue
+            geom = res.get("geojson", {})
+            if geom.get("type") == "Polygon":
+                return [geom["coordinates"]]
+            if geom.get("type") == "MultiPolygon":
+                return geom["coordinates"]
+    raise FileNotFoundError(f"Aucune réponse Nominatim en cache pour {city_name}")
+
+
+# ------------------------------------------------------------
+# Géométrie (sans shapely) : appartenance et distance à un polygone
+# ------------------------------------------------------------
+def _ring_contains(x, y, ring):
+    """Test pair-impair vectorisé : points (x, y) dans l'anneau ?"""
+    ring = np.asarray(ring, dtype=np.float64)
+    inside = np.zeros(len(x), dtype=bool)
+    x1, y1 = ring[:-1, 0], ring[:-1, 1]
+    x2, y2 = ring[1:, 0], ring[1:, 1]
+    for a, b, c, d in zip(x1, y1, x2, y2):
+        crosses = (b > y) != (d > y)
+        if not crosses.any():
+            continue
+        x_int = a + (y[crosses] - b) * (c - a) / (d - b)
+        idx = np.nonzero(crosses)[0]
+        inside[idx[x[crosses] < x_int]] ^= True
+    return inside
+
+
+def points_in_polygons(lon, lat, polygons):
+    inside = np.zeros(len(lon), dtype=bool)
+    for poly in polygons:
+        p_in = _ring_contains(lon, lat, poly[0])
+        for hole in poly[1:]:
+            p_in &= ~_ring_contains(lon, lat, hole)
+        inside |= p_in
+    return inside
+
+
+def distance_to_polygons(lon, lat, polygons, lat0):
+    """Distance (m) des points aux bords des polygones, en projection équirectangulaire locale."""
+    kx = math.radians(1) * EARTH_RADIUS_M * math.cos(math.radians(lat0))
+    ky = math.radians(1) * EARTH_RADIUS_M
+    px, py = lon * kx, lat * ky
+    best = np.full(len(lon), np.inf)
+    for poly in polygons:
+        for ring in poly:
+            ring = np.asarray(ring, dtype=np.float64)
+            rx, ry = ring[:, 0] * kx, ring[:, 1] * ky
+            for ax, ay, bx, by in zip(rx[:-1], ry[:-1], rx[1:], ry[1:]):
+                dx, dy = bx - ax, by - ay
+                L2 = dx * dx + dy * dy
+                t = np.zeros(len(px)) if L2 == 0 else np.clip(((px - ax) * dx + (py - ay) * dy) / L2, 0, 1)
+                np.minimum(best, np.hypot(px - (ax + t * dx), py - (ay + t * dy)), out=best)
+    return best
+
+
+def _great_circle(lat1, lon1, lat2, lon2):
+    """Distance orthodromique (m), même formule que osmnx.distance.great_circle."""
+    y1, y2 = math.radians(lat1), math.radians(lat2)
+    dy = y2 - y1
+    dx = math.radians(lon2 - lon1)
+    h = math.sin(dy / 2) ** 2 + math.cos(y1) * math.cos(y2) * math.sin(dx / 2) ** 2
+    h = min(1.0, h)
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+# ------------------------------------------------------------
+# Construction du graphe (mêmes règles qu'osmnx)
+# ------------------------------------------------------------
+def _is_drive_way(tags):
+    if "highway" not in tags:
+        return False
+    for tag, rx in DRIVE_EXCLUDE:
+        if tag in tags and rx.search(tags[tag]):
+            return False
+    return True
+
+
+def _load_elements(paths, bbox, min_coverage=0.9, snapshot=None):
+    """
+    Nœuds et voies 'drive' des fichiers Overpass dont l'emprise couvre la bbox de la ville.
+    Les réponses partielles (requêtes sur un arrondissement, par exemple) sont ignorées.
+    Les fichiers d'une seule date de données sont réunis (voies supprimées ou découpées
+    entre deux dates sinon mélangées) : `snapshot` (préfixe de date, ex. "2025-10-22"),
+    à défaut la date la plus récente qui couvre la ville.
+    Retourne (nœuds, voies, date retenue).
+    """
+    by_date = {}
+    for path in paths:
+        by_date.setdefault(overpass_snapshot(path), []).append(path)
+    dates = sorted((d for d in by_date if snapshot is None or d.startswith(snapshot)), reverse=True)
+    for date in dates:
+        nodes, ways = _load_snapshot(by_date[date], bbox, min_coverage)
+        if ways:
+            return nodes, ways, date
+    return {}, {}, None
+
+
+def _load_snapshot(paths, bbox, min_coverage):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    area = (max_lon - min_lon) * (max_lat - min_lat)
+    nodes, ways = {}, {}
+    for path in paths:
+        file_nodes, file_ways = {}, {}
+        lo_lon = lo_lat = math.inf
+        hi_lon = hi_lat = -math.inf
+        for el in _iter_overpass_elements(path):
+            if el["type"] == "node":
+                file_nodes[el["id"]] = el
+                lo_lon, hi_lon = min(lo_lon, el["lon"]), max(hi_lon, el["lon"])
+                lo_lat, hi_lat = min(lo_lat, el["lat"]), max(hi_lat, el["lat"])
+            elif el["type"] == "way" and _is_drive_way(el.get("tags", {})):
+                file_ways[el["id"]] = el
+
+        inter_lon = min(hi_lon, max_lon) - max(lo_lon, min_lon)
+        inter_lat = min(hi_lat, max_lat) - max(lo_lat, min_lat)
+        if inter_lon > 0 and inter_lat > 0 and inter_lon * inter_lat >= min_coverage * area:
+            nodes.update(file_nodes)
+            ways.update(file_ways)
+    return nodes, ways
+
+
+def _create_graph(nodes, ways):
+    """Équivalent de osmnx.graph._create_graph pour le réseau 'drive'."""
+    G = nx.MultiDiGraph(crs="epsg:4326")
+    for way in ways.values():
+        path = [n for n, _ in groupby(way["nodes"])]
+        if any(n not in nodes for n in path):
+            path = [n for n in path if n in nodes]
+        if len(path) < 2:
+            continue
+        tags = way.get("tags", {})
+        attrs = {"osmid": way["id"]}
+        attrs.update({t: tags[t] for t in USEFUL_TAGS_WAY if t in tags})
+
+        oneway = tags.get("oneway") in ONEWAY_VALUES or tags.get("junction") == "roundabout"
+        if oneway and tags.get("oneway") in REVERSED_VALUES:
+            path = path[::-1]
+
+        for n in path:
+            if n not in G:
+                el = nodes[n]
+                node_tags = el.get("tags", {})
+                G.add_node(n, y=el["lat"], x=el["lon"],
+                           **{t: node_tags[t] for t in USEFUL_TAGS_NODE if t in node_tags})
+
+        # comme osmnx, l'attribut "oneway" devient un booléen
+        attrs["oneway"] = oneway
+        edges = zip(path[:-1], path[1:])
+        if oneway:
+            for u, v in edges:
+                G.add_edge(u, v, **attrs, reversed=False)
+        else:
+            for u, v in edges:
+                G.add_edge(u, v, **attrs, reversed=False)
+                G.add_edge(v, u, **attrs, reversed=True)
+
+    for u, v, data in G.edges(data=True):
+        nu, nv = G.nodes[u], G.nodes[v]
+        data["length"] = _great_circle(nu["y"], nu["x"], nv["y"], nv["x"])
+    return G
+
+
+def _largest_component(G):
+    if len(G) == 0:
+        return G
+    largest = max(nx.weakly_connected_components(G), key=len)
+    return G.subgraph(largest).copy()
+
+
+def _truncate(G, keep):
+    G = G.copy()
+    G.remove_nodes_from([n for n, k in zip(list(G.nodes()), keep) if not k])
+    return G
+
+
+def _is_endpoint(G, node):
+    neighbors = set(G.predecessors(node)) | set(G.successors(node))
+    d = G.degree(node)
+    if node in neighbors:
+        return True
+    if G.out_degree(node) == 0 or G.in_degree(node) == 0:
+        return True
+    return not (len(neighbors) == 2 and d in (2, 4))
+
+
+def _build_path(G, endpoint, successor, endpoints):
+    path = [endpoint, successor]
+    for nxt in G.successors(successor):
+        if nxt in path:
+            continue
+        path.append(nxt)
+        while nxt not in endpoints:
+            succs = [n for n in G.successors(nxt) if n not in path]
+            if len(succs) == 1:
+                nxt = succs[0]
+                path.append(nxt)
+            elif not succs:
+                if endpoint in G.successors(nxt):
+                    return path + [endpoint]
+                return path
+            else:
+                raise ValueError(f"Motif de simplification impossible près du nœud {nxt}")
+        return path
+    return path
+
+
+def simplify_graph(G):
+    """Supprime les nœuds interstitiels (même règles que osmnx.simplify_graph, mode non strict)."""
+    G = G.copy()
+    endpoints = {n for n in G.nodes() if _is_endpoint(G, n)}
+    to_add, to_remove = [], []
+    for endpoint in endpoints:
+        for successor in G.successors(endpoint):
+            if successor in endpoints:
+                continue
+            path = _build_path(G, endpoint, successor, endpoints)
+            merged = {}
+            for u, v in zip(path[:-1], path[1:]):
+                data = next(iter(G.get_edge_data(u, v).values()))
+                for attr, val in data.items():
+                    merged.setdefault(attr, []).append(val)
+            for attr, vals in merged.items():
+                if attr == "length":
+                    merged[attr] = sum(vals)
+                else:
+                    uniq = list(dict.fromkeys(_flatten(vals)))
+                    merged[attr] = uniq[0] if len(uniq) == 1 else uniq
+            to_add.append((path[0], path[-1], merged))
+            to_remove.extend(path[1:-1])
+
+    for u, v, data in to_add:
+        G.add_edge(u, v, **data)
+    G.remove_nodes_from(set(to_remove))
+    G.graph["simplified"] = True
+    return G
+
+
+def _flatten(vals):
+    for v in vals:
+        if isinstance(v, list):
+            yield from v
+        else:
+            yield v
+
+
+def _count_streets_per_node(G, nodes):
+    Gu = G.to_undirected(reciprocal=False, as_view=True)
+    self_loops = set(nx.selfloop_edges(Gu))
+    edges = [e for e in Gu.edges(keys=False) if e not in self_loops] + list(self_loops)
+    counts = Counter(n for e in edges for n in e)
+    return {n: counts[n] for n in nodes}
+
+
+def build_city_graph_from_cache(city_name, oriented=True, cache_dirs=None, snapshot=None):
+    """
+    Reconstruit hors ligne le graphe routier 'drive' d'une ville à partir du cache osmnx
+    (réponses Nominatim + Overpass), en suivant les étapes de osmnx.graph_from_place :
+    filtre drive, sens uniques, troncature au polygone tamponné de 500 m, simplification,
+    troncature au polygone de la ville, plus grande composante faiblement connexe.
+
+    Args:
+        city_name (str): ex "Dijon, France"
+        oriented (bool): True -> MultiDiGraph (get_oriented_city_graph),
+                         False -> graphe non orienté (get_city_graph)
+        snapshot (str): date des données OSM à utiliser (préfixe "AAAA-MM-JJ") quand le cache en
+                        contient plusieurs ; par défaut la plus récente. Retenue dans G.graph["snapshot"].
+    """
+    polygons = find_city_polygon(city_name, cache_dirs)
+    overpass, _ = classify_cache(cache_dirs)
+
+    coords = np.concatenate([np.asarray(r, dtype=np.float64) for poly in polygons for r in poly])
+    lat0 = float(coords[:, 1].mean())
+    pad_lat = BUFFER_M / (math.radians(1) * EARTH_RADIUS_M)
+    pad_lon = pad_lat / math.cos(math.radians(lat0))
+    bbox = (coords[:, 0].min() - pad_lon, coords[:, 1].min() - pad_lat,
+            coords[:, 0].max() + pad_lon, coords[:, 1].max() + pad_lat)
+
+    nodes, ways, date = _load_elements(overpass, bbox, snapshot=snapshot)
+    if not ways:
+        when = f" datée {snapshot}" if snapshot else ""
+        raise FileNotFoundError(f"Aucune réponse Overpass{when} en cache pour {city_name} "
+                                f"(graphe téléchargé sans conserver le cache osmnx ?)")
+
+    G_buff = _create_graph(nodes, ways)
+
+    # 1 Troncature au polygone tamponné (500 m)
+    lon = np.array([d["x"] for _, d in G_buff.nodes(data=True)])
+    lat = np.array([d["y"] for _, d in G_buff.nodes(data=True)])
+    inside = points_in_polygons(lon, lat, polygons)
+    near = inside.copy()
+    near[~inside] = distance_to_polygons(lon[~inside], lat[~inside], polygons, lat0) <= BUFFER_M
+    G_buff = _largest_component(_truncate(G_buff, near))
+
+    # 2 Simplification puis troncature au polygone exact
+    G_buff = simplify_graph(G_buff)
+    lon = np.array([d["x"] for _, d in G_buff.nodes(data=True)])
+    lat = np.array([d["y"] for _, d in G_buff.nodes(data=True)])
+    inside = points_in_polygons(lon, lat, polygons)
+    # comme shapely.intersects (osmnx), les nœuds sur la frontière (rues limites de la commune) sont gardés
+    inside[~inside] = distance_to_polygons(lon[~inside], lat[~inside], polygons, lat0) <= BOUNDARY_EPS_M
+    G = _largest_component(_truncate(G_buff, inside))
+    nx.set_node_attributes(G, _count_streets_per_node(G_buff, G.nodes()), name="street_count")
+
+    G.graph["snapshot"] = date
+    if not oriented:
+        G = G.to_undirected()
+    return G
+
+
+def compare_with_graphml(G, path):
+    """
+    Compare un graphe reconstruit à un .graphml sauvegardé par osmnx (mêmes nœuds, mêmes arêtes
+    avec multiplicité, orientation du fichier). Retourne un dict de différences, vide si identiques.
+    """
+    H = nx.read_graphml(path)
+    if not H.is_directed():
+        G = G.to_undirected()
+
+    def edges(graph):
+        if graph.is_directed():
+            return Counter((str(u), str(v)) for u, v in graph.edges())
+        return Counter(tuple(sorted((str(u), str(v)))) for u, v in graph.edges())
+
+    g_nodes, h_nodes = {str(n) for n in G.nodes()}, set(H.nodes())
+    g_edges, h_edges = edges(G), edges(H)
+    diff = {}
+    if g_nodes != h_nodes:
+        diff["nodes"] = (len(g_nodes), len(h_nodes), sorted(g_nodes - h_nodes)[:10], sorted(h_nodes - g_nodes)[:10])
+    if g_edges != h_edges:
+        diff["edges"] = (sum(g_edges.values()), sum(h_edges.values()),
+                         list((g_edges - h_edges).elements())[:10], list((h_edges - g_edges).elements())[:10])
+    return diff
+
+
+# Reconstruction hors ligne des villes du projet (sauvegarde en CSR, sans osmnx)
+#   --snapshot=AAAA-MM-JJ : date des données OSM si le cache en contient plusieurs
+#   --check : compare à data/<Ville>.graphml (nœuds et arêtes), code de sortie 1 si différent
+if __name__ == "__main__":
+    import sys
+    import time
+    sys.path.insert(0, SRC_DIR)
+    from utils.csr_graph import from_networkx, save_csr
+
+    options = [a for a in sys.argv[1:] if a.startswith("--")]
+    check = "--check" in options
+    snapshot = next((a.split("=", 1)[1] for a in options if a.startswith("--snapshot=")), None)
+    cities = [a for a in sys.argv[1:] if not a.startswith("--")] or [
+        "Paris, France", "Lyon, France", "Marseille, France", "Toulouse, France", "Bordeaux, France",
+        "Nice, France", "Nantes, France", "Dijon, France", "Reims, France", "Annecy, France"]
+    out_root = os.path.join(BASE_DIR, "data", "csr")
+    failed = False
+    for city in cities:
+        start = time.perf_counter()
+        try:
+            G = build_city_graph_from_cache(city, oriented=True, snapshot=snapshot)
+        except FileNotFoundError as e:
+            print(f"⚠️  {e}")
+            continue
+        name = city.replace(", ", "_").replace(" ", "_")
+        path = os.path.join(out_root, name)
+        save_csr(from_networkx(G), path)
+        print(f"✅ {city} : {len(G)} nœuds, {G.number_of_edges()} arêtes, données du {G.graph['snapshot']} "
+              f"({time.perf_counter() - start:.2f}s) -> {path}")
+        reference = os.path.join(BASE_DIR, "data", f"{name}.graphml")
+        if check and os.path.exists(reference):
+            diff = compare_with_graphml(G, reference)
+            failed = failed or bool(diff)
+            print(f"   {'❌' if diff else '✔️'} comparaison à {reference} : {diff or 'identique'}")
+    sys.exit(1 if failed else 0)
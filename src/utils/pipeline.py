@@ -0,0 +1,100 @@
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+_END = object()
+
+
+def run_pipeline(items, load, compute, render=None, prefetch=1, render_mode="process", render_workers=1):
+    """
+    Exécute un traitement par ville en 3 étages qui se recouvrent :
+
+        chargement (thread)  ->  calcul (thread principal)  ->  rendu (processus ou thread)
+
+    Pendant que la ville i est calculée, la ville i+1 est chargée/téléchargée et la
+    figure de la ville i-1 est rendue. Les files sont bornées (prefetch graphes chargés
+    d'avance au plus), la mémoire reste donc limitée à quelques graphes.
+    Avec prefetch=0, chaque ville est chargée dans le thread principal avant son calcul :
+    aucun chargement ne lui dispute le GIL, pour les scripts qui chronomètrent compute.
+
+    Args:
+        items: éléments à traiter (ex: noms de villes), dans l'ordre
+        load(item) -> data : chargement du graphe
+        compute(item, data) -> result : calcul de centralité
+        render(item, data, result) : visualisation (optionnelle). En mode "process",
+            la fonction et ses arguments doivent être picklables (fonction de module).
+        prefetch (int): nombre d'éléments chargés en avance (0 : chargement sans recouvrement)
+        render_mode (str): "process" (évite le GIL et l'état global de matplotlib) ou "thread"
+        render_workers (int): nombre de rendus simultanés
+
+    Returns:
+        liste de (item, result) dans l'ordre des items
+    """
+    executor = None
+    if render is not None:
+        if render_mode == "process":
+            # pas de fork pendant que le thread de chargement tourne (verrous copiés dans un état incohérent)
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            executor = ProcessPoolExecutor(max_workers=render_workers, mp_context=ctx)
+        else:
+            executor = ThreadPoolExecutor(max_workers=render_workers)
+
+    loaded = queue.Queue(maxsize=max(1, prefetch))
+    stop = threading.Event()
+
+    def loader():
+        for item in items:
+            if stop.is_set():
+                break
+            try:
+                data = load(item)
+            except BaseException as e:  # l'erreur est relancée dans le thread principal
+                loaded.put((item, None, e))
+                return
+            loaded.put((item, data, None))
+        loaded.put(_END)
+
+    def entries():
+        if prefetch > 0:
+            threading.Thread(target=loader, name="pipeline-loader", daemon=True).start()
+            while (entry := loaded.get()) is not _END:
+                yield entry
+            return
+        for item in items:
+            yield item, load(item), None
+
+    pending = []
+    results = []
+    compute_time = 0.0
+    start = time.perf_counter()
+
+    try:
+        for item, data, error in entries():
+            if error is not None:
+                raise error
+
+            t0 = time.perf_counter()
+            result = compute(item, data)
+            compute_time += time.perf_counter() - t0
+            results.append((item, result))
+
+            if executor is not None:
+                pending.append(executor.submit(render, item, data, result))
+                # on ne garde pas plus de rendus en attente que de workers + prefetch
+                while len(pending) > render_workers + prefetch:
+                    pending.pop(0).result()
+            del data
+
+        for fut in pending:
+            fut.result()
+    finally:
+        stop.set()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    total = time.perf_counter() - start
+    print(f"⏱️  Pipeline : {len(results)} éléments en {total:.2f}s (calcul seul : {compute_time:.2f}s)")
+    return results
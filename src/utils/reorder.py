@@ -0,0 +1,175 @@
+import numpy as np
+from utils.csr_graph import CSRGraph, from_networkx, from_edge_arrays
+
+# Numérotations proposées (voir node_order)
+ORDERINGS = ("rcm", "bfs", "hilbert", "degree")
+
+
+def _symmetric(G):
+    """offsets / voisins du graphe sous-jacent non orienté (arcs sortants + entrants)."""
+    if not G.is_directed():
+        return np.asarray(G.offsets), np.asarray(G.targets)
+    n = G.number_of_nodes()
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(G.offsets)))
+    dst = np.asarray(G.targets, dtype=np.int64)
+    a, b = np.concatenate([src, dst]), np.concatenate([dst, src])
+    order = np.lexsort((b, a))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(a, minlength=n), out=offsets[1:])
+    return offsets, b[order]
+
+
+def cuthill_mckee(G, reverse=True):
+    """
+    Ordre de Cuthill–McKee : BFS depuis un sommet de degré minimal de chaque composante,
+    chaque niveau étant rangé par rang du parent puis degré croissant (vectorisé par
+    niveau). reverse=True donne le Reverse Cuthill–McKee (RCM).
+    Retourne order : order[nouvel indice] = ancien indice.
+    """
+    offsets, targets = _symmetric(G)
+    n = len(offsets) - 1
+    degree = np.diff(offsets)
+    off, tgt, deg = offsets.tolist(), targets.tolist(), degree.tolist()
+    rank = np.full(n, -1, dtype=np.int64)
+    seen = bytearray(n)
+    order = np.empty(n, dtype=np.int64)
+    # sommets isolés : numérotés en bloc
+    isolated = np.flatnonzero(degree == 0)
+    filled = len(isolated)
+    rank[isolated] = np.arange(filled)
+    order[:filled] = isolated
+    for u in isolated.tolist():
+        seen[u] = 1
+    # sources candidates par degré croissant (premier sommet non visité de chaque composante)
+    starts = iter(np.argsort(degree, kind="stable")[filled:].tolist())
+    while filled < n:
+        root = next(starts)
+        while seen[root]:
+            root = next(starts)
+        seen[root] = 1
+        rank[root] = filled
+        order[filled] = root
+        filled += 1
+        frontier = [root]
+        while len(frontier):
+            if len(frontier) <= 64:
+                # petite frontière (début de parcours, petite composante) : boucle Python
+                nxt = []
+                for u in frontier:
+                    cand = sorted((v for v in tgt[off[u]:off[u + 1]] if not seen[v]), key=deg.__getitem__)
+                    for v in cand:
+                        if not seen[v]:
+                            seen[v] = 1
+                            nxt.append(v)
+                if nxt:
+                    rank[nxt] = np.arange(filled, filled + len(nxt))
+                    order[filled:filled + len(nxt)] = nxt
+                    filled += len(nxt)
+                frontier = nxt
+                continue
+            frontier = np.asarray(frontier, dtype=np.int64)
+            lo = offsets[frontier]
+            counts = offsets[frontier + 1] - lo
+            total = int(counts.sum())
+            shift = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+            succ = targets[np.arange(total, dtype=np.int64) + shift]
+            parent = np.repeat(rank[frontier], counts)
+            new = rank[succ] < 0
+            succ, parent = succ[new], parent[new]
+            # rang du premier parent (le plus tôt numéroté), puis degré croissant
+            idx = np.lexsort((degree[succ], parent))
+            succ = succ[idx]
+            _, first = np.unique(succ, return_index=True)
+            succ = succ[np.sort(first)]
+            rank[succ] = np.arange(filled, filled + len(succ))
+            order[filled:filled + len(succ)] = succ
+            filled += len(succ)
+            frontier = succ.tolist()
+            for v in frontier:
+                seen[v] = 1
+    return order[::-1].copy() if reverse else order
+
+
+def hilbert_index(x, y, bits=16):
+    """Indice de chaque point (x, y) sur une courbe de Hilbert de 2^bits × 2^bits cases."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    side = (1 << bits) - 1
+    span_x = (np.nanmax(x) - np.nanmin(x)) or 1.0
+    span_y = (np.nanmax(y) - np.nanmin(y)) or 1.0
+    xi = np.nan_to_num((x - np.nanmin(x)) / span_x * side).astype(np.int64)
+    yi = np.nan_to_num((y - np.nanmin(y)) / span_y * side).astype(np.int64)
+    d = np.zeros(len(x), dtype=np.int64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (xi & s) > 0
+        ry = (yi & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # rotation du quadrant
+        flip = ~ry & rx
+        xi = np.where(flip, side - xi, xi)
+        yi = np.where(flip, side - yi, yi)
+        swap = ~ry
+        xi, yi = np.where(swap, yi, xi), np.where(swap, xi, yi)
+        s >>= 1
+    return d
+
+
+def node_order(G, method="rcm"):
+    """
+    Nouvelle numérotation des sommets (order[nouvel indice] = ancien indice) :
+    - "rcm" : Reverse Cuthill–McKee (voisins proches en mémoire, largeur de bande réduite) ;
+    - "bfs" : Cuthill–McKee, ordre de découverte d'un BFS ;
+    - "hilbert" : courbe de Hilbert sur les coordonnées x / y (graphes routiers) ;
+    - "degree" : degré décroissant (sommets les plus sollicités regroupés en tête).
+    """
+    if method == "rcm":
+        return cuthill_mckee(G, reverse=True)
+    if method == "bfs":
+        return cuthill_mckee(G, reverse=False)
+    if method == "hilbert":
+        if G.x is None or G.y is None:
+            raise ValueError("Numérotation 'hilbert' : le graphe n'a pas de coordonnées x / y")
+        return np.argsort(hilbert_index(G.x, G.y), kind="stable")
+    if method == "degree":
+        offsets, _ = _symmetric(G)
+        return np.argsort(-np.diff(offsets), kind="stable")
+    raise ValueError(f"Numérotation inconnue : {method} (choix : {', '.join(ORDERINGS)})")
+
+
+def reorder(G, method="rcm"):
+    """
+    CSRGraph renuméroté selon node_order(G, method) : arcs, poids, identifiants d'origine
+    et coordonnées sont permutés ensemble. Les moteurs rendent leurs résultats par
+    identifiant d'origine (G.original_ids) : la renumérotation ne change que la disposition
+    en mémoire. L'ordre appliqué est conservé dans G.order (ancien indice de chaque sommet).
+    """
+    if not isinstance(G, CSRGraph):
+        G = from_networkx(G)
+    order = node_order(G, method)
+    n = G.number_of_nodes()
+    new_index = np.empty(n, dtype=np.int64)
+    new_index[order] = np.arange(n, dtype=np.int64)
+
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(G.offsets)))
+    dst = np.asarray(G.targets, dtype=np.int64)
+    w = np.asarray(G.weights, dtype=np.float64)
+    if not G.is_directed():
+        keep = src <= dst   # from_edge_arrays remet les deux sens
+        src, dst, w = src[keep], dst[keep], w[keep]
+    pick = lambda a: None if a is None else np.asarray(a)[order]
+    H = from_edge_arrays(new_index[src], new_index[dst], w, np.asarray(G.node_ids)[order],
+                         directed=G.is_directed(), x=pick(G.x), y=pick(G.y))
+    H.order = order
+    return H
+
+
+def edge_gap(G):
+    """
+    Indicateur de localité : médiane et moyenne de |u - v| sur les arcs (écart en mémoire
+    entre un sommet et ses voisins ; plus il est petit, moins un parcours change de ligne de cache).
+    """
+    n = G.number_of_nodes()
+    src = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(G.offsets)))
+    gap = np.abs(np.asarray(G.targets, dtype=np.int64) - src)
+    return {"median": float(np.median(gap)) if len(gap) else 0.0, "mean": float(gap.mean()) if len(gap) else 0.0}
@@ -0,0 +1,168 @@
+import os
+import pickle
+import hashlib
+import inspect
+import functools
+
+# Version du format du cache : à incrémenter si la forme des résultats change
+CACHE_VERSION = 1
+
+# Le cache est désactivé par défaut (les scripts de comparaison mesurent des temps de calcul) ;
+# on l'active en définissant AAGA_RESULT_CACHE=<dossier> ou via set_default_cache().
+ENV_DIR = "AAGA_RESULT_CACHE"
+ENV_MAX_MB = "AAGA_RESULT_CACHE_MAX_MB"
+
+_default_cache = None
+
+
+class ResultCache:
+    """
+    Cache disque de résultats de centralité, adressé par contenu.
+    Une entrée = un fichier <clé>.pkl ; l'éviction se fait par ordre LRU (date d'accès
+    mémorisée dans le mtime du fichier) dès que la taille totale dépasse max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)  # marque l'entrée comme récemment utilisée
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # écriture atomique
+        self.evict()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées jusqu'à repasser sous max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
+
+
+def set_default_cache(directory, max_bytes=1 << 30):
+    """Active (directory=dossier) ou désactive (directory=None) le cache utilisé par les moteurs."""
+    global _default_cache
+    _default_cache = ResultCache(directory, max_bytes) if directory else None
+    return _default_cache
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None and os.environ.get(ENV_DIR):
+        max_mb = float(os.environ.get(ENV_MAX_MB, 1024))
+        _default_cache = ResultCache(os.environ[ENV_DIR], int(max_mb * (1 << 20)))
+    return _default_cache
+
+
+# ------------------------------------------------------------
+# Empreinte de la structure d'un graphe
+# ------------------------------------------------------------
+def graph_fingerprint(G, weight="weight"):
+    """
+    Hash SHA-1 de la structure du graphe (sommets, arcs et poids, dans l'ordre d'itération,
+    qui influence les départages des moteurs). Accepte networkx, CSRGraph et TemporalGraph.
+    weight : attribut des arêtes networkx lu comme poids (celui qu'utilise le calcul) ; les clés
+    des multi-arêtes en font partie.
+    """
+    h = hashlib.sha1()
+
+    if hasattr(G, "offsets") and hasattr(G, "targets"):  # CSRGraph
+        h.update(b"csr" + (b"D" if G.directed else b"U"))
+        for arr in (G.offsets, G.targets, G.weights, G.node_ids):
+            h.update(memoryview(arr).tobytes() if arr.dtype.kind != "U" else "\0".join(arr.tolist()).encode())
+        return h.hexdigest()
+
+    if hasattr(G, "adj") and hasattr(G, "V") and not hasattr(G, "is_directed"):  # TemporalGraph
+        h.update(b"temporal")
+        h.update(repr(sorted(map(repr, G.V))).encode())
+        for u, edges in G.adj.items():
+            h.update(repr((u, [(e.v, e.t, e.l) for e in edges])).encode())
+        return h.hexdigest()
+
+    # networkx
+    h.update(b"nx" + (b"D" if G.is_directed() else b"U") + (b"M" if G.is_multigraph() else b""))
+    h.update(repr(list(G.nodes())).encode())
+    if G.is_multigraph():
+        h.update(repr([(u, v, key, d.get(weight)) for u, v, key, d in G.edges(keys=True, data=True)]).encode())
+    else:
+        h.update(repr([(u, v, d.get(weight)) for u, v, d in G.edges(data=True)]).encode())
+    return h.hexdigest()
+
+
+def result_key(G, algorithm, params, version=1, weight="weight"):
+    payload = repr((CACHE_VERSION, algorithm, version, sorted(params.items()), graph_fingerprint(G, weight)))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def cached(algorithm, params=(), version=1, resolve=None):
+    """
+    Décorateur : consulte le cache par défaut (s'il est actif) avant d'appeler le moteur.
+    Le premier argument de la fonction décorée est le graphe ; `params` liste les noms des
+    arguments qui entrent dans la clé (k, interval...). use_cache=False force le calcul.
+    Incrémenter `version` quand le moteur change de résultats.
+    resolve : {argument: fonction(G, valeur)} donnant la valeur effective d'un argument à
+    mettre dans la clé (ex. modèle de coût choisi quand l'argument vaut None).
+    """
+    def decorator(func):
+        sig = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, use_cache=True, **kwargs):
+            cache = get_default_cache() if use_cache else None
+            if cache is None:
+                return func(*args, **kwargs)
+
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            G = next(iter(bound.arguments.values()))
+            values = {p: bound.arguments[p] for p in params}
+            for p, func_resolve in (resolve or {}).items():
+                values[p] = func_resolve(G, values[p])
+            # poids effectivement lus par le moteur (argument weight), pas seulement l'attribut "weight"
+            key = result_key(G, algorithm, values, version, weight=bound.arguments.get("weight") or "weight")
+
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            result = func(*args, **kwargs)
+            cache.put(key, result)
+            return result
+
+        return wrapper
+    return decorator
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+def points_in_polygon(x, y, polygon):
+    """
+    Masque des points (x, y) situés dans le polygone [(x, y), ...] (règle pair-impair,
+    vectorisée sur les points ; le polygone est fermé implicitement).
+    """
+    poly = np.asarray(polygon, dtype=np.float64)
+    if poly.ndim != 2 or poly.shape[1] != 2 or len(poly) < 3:
+        raise ValueError("Polygone attendu : au moins 3 sommets (x, y)")
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    inside = np.zeros(len(x), dtype=bool)
+    x1, y1 = poly[-1]
+    for x2, y2 in poly:
+        # l'arête (x1, y1) -> (x2, y2) coupe-t-elle la demi-droite horizontale partant du point ?
+        crosses = (y1 > y) != (y2 > y)
+        if crosses.any():
+            t = (y[crosses] - y1) / (y2 - y1)
+            hit = x[crosses] < x1 + t * (x2 - x1)
+            idx = np.flatnonzero(crosses)[hit]
+            inside[idx] = ~inside[idx]
+        x1, y1 = x2, y2
+    return inside
+
+
+def _polygon_coords(polygon):
+    """Sommets d'un polygone : liste de (x, y), ou objet shapely (contour extérieur)."""
+    if hasattr(polygon, "exterior"):
+        return list(polygon.exterior.coords)
+    return polygon
+
+
+class GridIndex:
+    """
+    Index spatial des sommets par grille régulière sur les coordonnées x / y (longitude /
+    latitude des graphes OSMnx, les mêmes que plot_city_graph). Les sommets sont rangés
+    par cellule (ordre ligne par ligne), si bien qu'une rangée de cellules d'un rectangle
+    est une tranche contiguë : une requête ne lit que les cellules qu'elle recouvre.
+
+        index = GridIndex(G.x, G.y)
+        index.bbox(4.99, 47.30, 5.06, 47.34)        # indices des sommets du rectangle
+        index.polygon([(4.99, 47.30), (5.06, 47.30), (5.03, 47.34)])
+    """
+
+    def __init__(self, x, y, per_cell=4):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        n = len(self.x)
+        known = np.isfinite(self.x) & np.isfinite(self.y)
+        if not known.any():
+            raise ValueError("Aucune coordonnée exploitable")
+        self.x0, self.x1 = float(self.x[known].min()), float(self.x[known].max())
+        self.y0, self.y1 = float(self.y[known].min()), float(self.y[known].max())
+        self.side = max(1, int(np.sqrt(known.sum() / per_cell)))
+
+        cell = np.full(n, -1, dtype=np.int64)
+        cell[known] = self._row(self.y[known]) * self.side + self._col(self.x[known])
+        order = np.argsort(cell, kind="stable")
+        self.order = order[cell[order] >= 0]   # sommets sans coordonnées exclus
+        self.offsets = np.searchsorted(cell[self.order], np.arange(self.side * self.side + 1))
+
+    def _col(self, x):
+        w = (self.x1 - self.x0) or 1.0
+        return np.clip(((np.asarray(x) - self.x0) / w * self.side).astype(np.int64), 0, self.side - 1)
+
+    def _row(self, y):
+        h = (self.y1 - self.y0) or 1.0
+        return np.clip(((np.asarray(y) - self.y0) / h * self.side).astype(np.int64), 0, self.side - 1)
+
+    def bbox(self, xmin, ymin, xmax, ymax):
+        """Indices (triés) des sommets tels que xmin <= x <= xmax et ymin <= y <= ymax."""
+        if xmin > xmax or ymin > ymax or xmax < self.x0 or xmin > self.x1 or ymax < self.y0 or ymin > self.y1:
+            return np.zeros(0, dtype=np.int64)
+        c0, c1 = int(self._col(xmin)), int(self._col(xmax))
+        r0, r1 = int(self._row(ymin)), int(self._row(ymax))
+        parts = [self.order[self.offsets[r * self.side + c0]:self.offsets[r * self.side + c1 + 1]]
+                 for r in range(r0, r1 + 1)]
+        idx = np.concatenate(parts)
+        x, y = self.x[idx], self.y[idx]
+        return np.sort(idx[(x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)])
+
+    def polygon(self, polygon):
+        """Indices (triés) des sommets à l'intérieur du polygone (liste de (x, y) ou objet shapely)."""
+        coords = np.asarray(_polygon_coords(polygon), dtype=np.float64)
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError("Polygone attendu : liste de sommets (x, y)")
+        idx = self.bbox(*coords.min(axis=0), *coords.max(axis=0))
+        return idx[points_in_polygon(self.x[idx], self.y[idx], coords)]
+
+
+def grid_index(G):
+    """GridIndex des sommets d'un CSRGraph, construit une fois puis conservé sur le graphe."""
+    index = getattr(G, "_grid_index", None)
+    if index is None:
+        if G.x is None or G.y is None:
+            raise ValueError("Le graphe n'a pas de coordonnées x / y")
+        index = G._grid_index = GridIndex(G.x, G.y)
+    return index